@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Exhaustive DES key search over a reduced keyspace, on every core.
+
+The search knows one plaintext/ciphertext pair and all but ``unknown_bits``
+of the 56 key bits; it tries every value of the unknown bits. The keyspace is
+cut into chunks of ``2^CHUNK_BITS`` keys that worker processes take as they
+become free, and each chunk is encrypted as one batch with
+``cipher.des_batch``.
+
+The key schedule only selects and rotates key bits, so it is linear over XOR:
+the subkeys of ``a ^ b`` are the subkeys of ``a`` XOR those of ``b``. Each
+worker computes the subkeys of all ``2^CHUNK_BITS`` values of the low unknown
+bits once; a chunk's subkeys are then that table XORed with the subkeys of the
+chunk's high bits, and the search spends its time encrypting.
+
+``KeySearch`` runs in the background and is polled for progress, so a scene
+can animate while it runs and show the measured rate::
+
+    search = KeySearch(plaintext, ciphertext, known_key, unknown_bits=24)
+    search.start()
+    while not search.done:
+        progress = search.poll()    # keys tested, seconds, keys/s, key found
+    search.close()
+
+Usage:
+    python -m cipher.brute_force --bits 24 -j 8
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cipher.des_batch import FP_TABLES, IP_TABLES, KEY_BITS, MASK_32, apply_tables, feistel, key_schedule
+
+CHUNK_BITS = 16
+# Chunks queued per worker, so no worker waits for the next one
+CHUNKS_IN_FLIGHT = 4
+FULL_KEY_BITS = 56
+
+
+def unknown_positions(unknown_bits: int) -> List[int]:
+    """Key bit positions (0 = least significant) of the lowest ``unknown_bits`` non-parity bits."""
+    return sorted(63 - bit for bit in KEY_BITS)[:unknown_bits]
+
+
+def spread(indices: np.ndarray, positions: Sequence[int]) -> np.ndarray:
+    """Keys with bit ``j`` of each index moved to key bit ``positions[j]``."""
+    indices = np.asarray(indices, dtype=np.uint64)
+    keys = np.zeros(indices.shape, dtype=np.uint64)
+    for j, position in enumerate(positions):
+        keys |= ((indices >> np.uint64(j)) & np.uint64(1)) << np.uint64(position)
+    return keys
+
+
+# State of a worker process, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(plaintext: int, ciphertext: int, base_key: int, positions: Sequence[int], chunk_bits: int) -> None:
+    low = positions[:chunk_bits]
+    _worker.update(
+        permuted=apply_tables(np.array([plaintext], dtype=np.uint64), IP_TABLES, 64)[0],
+        ciphertext=np.uint64(ciphertext),
+        base_key=base_key,
+        positions=positions,
+        chunk_bits=chunk_bits,
+        low_subkeys=key_schedule(spread(np.arange(1 << len(low), dtype=np.uint64), low)),
+    )
+
+
+def search_chunk(chunk: int) -> Tuple[List[int], float]:
+    """Keys of chunk ``chunk`` that encrypt the plaintext to the ciphertext, and the seconds it took."""
+    started = time.perf_counter()
+    w = _worker
+    high_key = w["base_key"] | int(spread(np.array([chunk << w["chunk_bits"]]), w["positions"])[0])
+    subkeys = w["low_subkeys"] ^ key_schedule(np.array([high_key], dtype=np.uint64))
+
+    left = np.full(subkeys.shape[1], w["permuted"] >> np.uint64(32), dtype=np.uint64)
+    right = np.full(subkeys.shape[1], w["permuted"] & MASK_32, dtype=np.uint64)
+    for subkey in subkeys:
+        left, right = right, left ^ feistel(right, subkey)
+    ciphertexts = apply_tables((right << np.uint64(32)) | left, FP_TABLES, 64)
+
+    matches = np.flatnonzero(ciphertexts == w["ciphertext"])
+    low = w["positions"][:w["chunk_bits"]]
+    keys = [high_key | int(key) for key in spread(matches.astype(np.uint64), low)]
+    return keys, time.perf_counter() - started
+
+
+@dataclass(frozen=True)
+class SearchProgress:
+    tested: int
+    total: int
+    seconds: float
+    # Keys per second of work in the workers, times the workers running at once.
+    # Chunks finish in bursts, so a rate over the time between polls jumps
+    # around, and one over the whole run counts process start-up.
+    keys_per_second: float
+    found: Optional[int]
+
+    def seconds_for(self, bits: int = FULL_KEY_BITS) -> float:
+        """Time to try all ``2^bits`` keys at the measured rate."""
+        return 2 ** bits / self.keys_per_second if self.keys_per_second else float("inf")
+
+
+class KeySearch:
+    """Background search of every value of the unknown key bits."""
+
+    def __init__(
+        self,
+        plaintext: int,
+        ciphertext: int,
+        known_key: int,
+        unknown_bits: int,
+        workers: Optional[int] = None,
+        stop_on_match: bool = True,
+    ):
+        """
+        Args:
+            known_key: The key with its unknown bits set to anything (they are cleared)
+            unknown_bits: How many of the 56 key bits to search, from the lowest up
+            workers: Processes to use, every core by default
+            stop_on_match: Stop at the first key that fits instead of trying all
+        """
+        self.positions = unknown_positions(unknown_bits)
+        mask = sum(1 << position for position in self.positions)
+        self.base_key = known_key & ~mask
+        self.plaintext = plaintext
+        self.ciphertext = ciphertext
+        self.chunk_bits = min(CHUNK_BITS, unknown_bits)
+        self.chunks = 1 << (unknown_bits - self.chunk_bits)
+        self.total = 1 << unknown_bits
+        self.workers = workers or os.cpu_count() or 1
+        self.stop_on_match = stop_on_match
+
+        self.tested = 0
+        self.found: Optional[int] = None
+        self._next_chunk = 0
+        self._pending = []
+        self._pool = None
+        self._started = None
+        self._finished = None
+        self._busy_seconds = 0.0
+
+    def start(self) -> None:
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.plaintext, self.ciphertext, self.base_key, self.positions, self.chunk_bits),
+        )
+        self._started = time.perf_counter()
+        self._submit()
+
+    @property
+    def done(self) -> bool:
+        return self._finished is not None
+
+    def poll(self, timeout: Optional[float] = 0) -> SearchProgress:
+        """Collect finished chunks (waiting up to ``timeout`` for one) and queue more."""
+        if self._pending and not self.done:
+            wait(self._pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        finished = [future for future in self._pending if future.done()]
+        self._pending = [future for future in self._pending if not future.done()]
+        for future in finished:
+            keys, seconds = future.result()
+            self.tested += 1 << self.chunk_bits
+            self._busy_seconds += seconds
+            if keys and self.found is None:
+                self.found = keys[0]
+        if (self.found is not None and self.stop_on_match) or (not self._pending and self._next_chunk >= self.chunks):
+            self._finish()
+        else:
+            self._submit()
+        return self.progress()
+
+    def progress(self) -> SearchProgress:
+        end = self._finished if self.done else time.perf_counter()
+        parallel = min(self.workers, self.chunks)
+        rate = self.tested / self._busy_seconds * parallel if self._busy_seconds else 0.0
+        return SearchProgress(self.tested, self.total, end - self._started, rate, self.found)
+
+    def run(self):
+        """Run to the end, yielding progress after every batch of chunks."""
+        self.start()
+        try:
+            while not self.done:
+                yield self.poll(timeout=None)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if not self.done:
+            self._finish()
+
+    def _submit(self) -> None:
+        while len(self._pending) < self.workers * CHUNKS_IN_FLIGHT and self._next_chunk < self.chunks:
+            self._pending.append(self._pool.submit(search_chunk, self._next_chunk))
+            self._next_chunk += 1
+
+    def _finish(self) -> None:
+        self._finished = time.perf_counter()
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+
+def format_duration(seconds: float) -> str:
+    """``seconds`` in the largest sensible unit."""
+    for unit, size in (("years", 365.25 * 86400), ("days", 86400), ("hours", 3600), ("minutes", 60)):
+        if seconds >= size:
+            return f"{seconds / size:,.1f} {unit}"
+    return f"{seconds:.1f} seconds"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search a reduced DES keyspace on every core')
+    parser.add_argument('--bits', type=int, default=24, help='Unknown key bits to search (default: 24)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the secret key and plaintext')
+    args = parser.parse_args()
+
+    from cipher.des_core import encrypt_block
+
+    rng = np.random.default_rng(args.seed)
+    key, plaintext = (int(value) for value in rng.integers(0, 1 << 63, size=2, dtype=np.int64))
+    ciphertext = encrypt_block(plaintext, key)
+
+    search = KeySearch(plaintext, ciphertext, key, args.bits, workers=args.jobs, stop_on_match=False)
+    progress = None
+    for progress in search.run():
+        print(f"\r{progress.tested:,} / {progress.total:,} keys, {progress.keys_per_second:,.0f} keys/s", end="")
+    print()
+    if progress.found is None:
+        print("Key not found")
+        return 1
+    print(f"Found {progress.found:016X} in {progress.seconds:.1f}s with {search.workers} workers")
+    print(f"All 2^56 keys at this rate: {format_duration(progress.seconds_for())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,26 @@
+import time
+
 from manim import *
-from manim_voiceover import VoiceoverScene
 from manim_voiceover.services.gtts import GTTSService
-from manim_voiceover.services.openai import OpenAIService
 
-class DESIntroScene(VoiceoverScene):
+from cipher.brute_force import FULL_KEY_BITS, KeySearch, format_duration
+from cipher.des_batch import AvalancheStats, avalanche
+from cipher.des_core import ROUNDS, encrypt_block, expand_key, permute, to_bits, trace_encryption
+from cipher.des_tables import E, FP, IP, P, PC1, PC2, SBOXES, SHIFTS
+from cipher.modes import DES, cbc_encrypt, ecb_encrypt
+from cipher.sbox_analysis import difference_distribution_tables, linear_approximation_tables
+from utils.permutation_wires import GrowWires, PermutationWires
+from utils.raster_table import RasterTable
+from utils.scene import NarratedScene
+from utils.speech_service import ClientOpenAIService
+
+class DESIntroScene(NarratedScene):
     """Introduction to DES with basic overview"""
 
     def construct(self):
         # self.set_speech_service(GTTSService())
         self.set_speech_service(
-            OpenAIService(
+            ClientOpenAIService(
                 voice="fable",
                 model="tts-1-hd",
             )
@@ -115,12 +126,12 @@ class DESIntroScene(VoiceoverScene):
             )
 
 
-class DESStructureScene(VoiceoverScene):
+class DESStructureScene(NarratedScene):
     """Shows the overall structure of the DES algorithm"""
 
     def construct(self):
         self.set_speech_service(
-            OpenAIService(
+            ClientOpenAIService(
                 voice="fable",
                 model="tts-1-hd",
             )
@@ -270,9 +281,14 @@ class DESStructureScene(VoiceoverScene):
             )
 
 
-class DESKeyScheduleScene(VoiceoverScene):
+class DESKeyScheduleScene(NarratedScene):
     """Illustrates the DES key schedule process with bit-level transformations"""
 
+    # The textbook example key; the sixteen rounds scene uses it too
+    KEY = 0x133457799BBCDFF1
+    # Round 1 is shown step by step, rounds 2 to ROUNDS_SHOWN in place after it
+    ROUNDS_SHOWN = ROUNDS
+
     def keep_and_move_to_top(self, *objects_to_keep, animate_duration=1.0, spacing=0.5):
         """
         Keeps specified objects visible while fading out everything else,
@@ -322,12 +338,15 @@ class DESKeyScheduleScene(VoiceoverScene):
     def construct(self):
         # self.set_speech_service(GTTSService())
         self.set_speech_service(
-            OpenAIService(
+            ClientOpenAIService(
                 voice="fable",
                 model="tts-1-hd",
             )
         )
 
+        # Every C_i, D_i and K_i below comes from this one schedule, computed up front
+        schedule = expand_key(self.KEY)
+
         # Title
         title = Text("DES Key Schedule", font_size=48, color=YELLOW_D).to_edge(UP)
       
@@ -336,9 +355,9 @@ class DESKeyScheduleScene(VoiceoverScene):
             self.wait(0.5)
 
         # Initial 64-bit key visualization
-        initial_key = "0001001100110100010101110111100110011011101111001101111111110001"
+        initial_key = to_bits(schedule.key, 64)
         key_text = Tex(r"\textbf{Original 64-bit Key:}", font_size=24).shift(UP * 2 + LEFT * 5)
-        key_bits = VGroup(*[Text(bit, font_size=20) for bit in initial_key])
+        key_bits = self.mobject_pool.bit_row(initial_key, font_size=20)
         key_bits.arrange_in_grid(rows=2, buff=0.2).next_to(key_text, RIGHT)
         
         with self.voiceover("We start with a 64-bit key. Here's an example key shown in binary."):
@@ -360,8 +379,8 @@ class DESKeyScheduleScene(VoiceoverScene):
             )
 
         # Visualize PC-1 transformation with bit movement
-        pc1_output = "11110000110011001010101011110101010101100110011110001111"
-        pc1_bits = VGroup(*[Text(bit, font_size=20, color=YELLOW) for bit in pc1_output])
+        pc1_output = to_bits(schedule.cd(0), 56)
+        pc1_bits = self.mobject_pool.bit_row(pc1_output, font_size=20, color=YELLOW)
         pc1_bits.arrange_in_grid(rows=2, buff=0.2).shift(DOWN)
         
         # Create separate groups for C0 and D0 for highlighting
@@ -371,10 +390,10 @@ class DESKeyScheduleScene(VoiceoverScene):
         with self.voiceover("Watch as the bits are rearranged according to the PC-1 permutation table.") as track:
             self.play(
                 *[Transform(
-                    key_bits[i].copy(),
+                    key_bits[PC1[j] - 1].copy(),
                     pc1_bits[j],
                     path_arc=PI/2
-                ) for i, j in zip(range(64), range(56))],
+                ) for j in range(56)],
                 run_time=track.duration
             )
 
@@ -386,6 +405,8 @@ class DESKeyScheduleScene(VoiceoverScene):
            c0_bits, d0_bits,
             spacing=0.5
         )
+        # The original key is gone for good; its glyphs can be reused
+        self.recycle(key_bits)
         
         
         with self.voiceover("The 56-bit key is then split into two 28-bit halves, called C-zero and D-zero."):
@@ -426,17 +447,11 @@ class DESKeyScheduleScene(VoiceoverScene):
             self.play(Write(schedule_text))
         
         # Demonstrate the rotation for Round 1 (1-bit shift)
-        # Extract bits for better visualization
-        c0_bit_values = [mob.text for mob in c0_bits]
-        d0_bit_values = [mob.text for mob in d0_bits]
-        
-        # Create rotated versions (1-bit left shift for round 1)
-        c1_bit_values = c0_bit_values[1:] + c0_bit_values[0:1]  # Rotate left by 1
-        d1_bit_values = d0_bit_values[1:] + d0_bit_values[0:1]  # Rotate left by 1
-        
-        # Create C1 and D1 mobjects
-        c1_bits = VGroup(*[Text(bit, font_size=20, color=RED_B) for bit in c1_bit_values])
-        d1_bits = VGroup(*[Text(bit, font_size=20, color=BLUE_B) for bit in d1_bit_values])
+        c1_bits = self.mobject_pool.bit_row(to_bits(schedule.c[1], 28), font_size=20, color=RED_B)
+        d1_bits = self.mobject_pool.bit_row(to_bits(schedule.d[1], 28), font_size=20, color=BLUE_B)
+        # Position in C0 || D0 of every bit of C1 || D1
+        rotation_sources = schedule.rotation_sources(1)
+        cd0_bits = [*c0_bits, *d0_bits]
         
         # Position C1 and D1 below the kept elements
         c1_bits.arrange_in_grid(rows=1, buff=0.2).next_to(rotation_title, DOWN*2, buff=0.7)
@@ -457,8 +472,8 @@ class DESKeyScheduleScene(VoiceoverScene):
             self.play(
                 FadeIn(c1_title),
                 FadeIn(d1_title),
-                *[TransformFromCopy(c0_bits[i], c1_bits[(i-1) % 28]) for i in range(28)],
-                *[TransformFromCopy(d0_bits[i], d1_bits[(i-1) % 28]) for i in range(28)],
+                *[TransformFromCopy(cd0_bits[source], target)
+                  for source, target in zip(rotation_sources, [*c1_bits, *d1_bits])],
                 run_time=2
             )
             
@@ -517,8 +532,8 @@ class DESKeyScheduleScene(VoiceoverScene):
             self.play(Write(k1_subkey))
 
         # Create the final K1 subkey, here we need the animate to show the permutation 2 transformation
-        k1_output = "101011001000110111110011000010101111000001010111"
-        k1_bits = VGroup(*[Text(bit, font_size=20, color=GREEN) for bit in k1_output])
+        k1_output = to_bits(schedule.subkeys[0], 48)
+        k1_bits = self.mobject_pool.bit_row(k1_output, font_size=20, color=GREEN)
         k1_bits.arrange_in_grid(rows=2, buff=0.2).next_to(k1_subkey, DOWN, buff=0.5)
         
         k1_title = MathTex(r"K_1 \text{ (48-bit subkey)}", font_size=28, color=GREEN_D).next_to(k1_bits, LEFT, buff=0.5)
@@ -526,16 +541,10 @@ class DESKeyScheduleScene(VoiceoverScene):
         with self.voiceover("PC-2 selects and permutes 48 bits from the 56-bit combined key to create the round subkey. Watch how the bits are rearranged according to the PC-2 permutation table.") as tracker:
             # First show the PC-2 selection with animated paths from source to destination
             animations = []
-            for i in range(48):
-                # Use a random source bit position for visual effect (in a real implementation, this would follow the actual PC-2 table)
-                source_idx = i % 56
-                source_row = 0 if source_idx < 28 else 1
-                source_col = source_idx % 28
-                
-                # Get the source mobject (either from c1_bits or d1_bits)
-                source_mob = c1_bits[source_col] if source_row == 0 else d1_bits[source_col % 28]
-                
-                # Create a copy and transform it to the destination
+            cd1_bits = [*c1_bits, *d1_bits]
+            for i, source in enumerate(schedule.subkey_sources()):
+                # Each subkey bit flies in from the C1 || D1 position PC-2 takes it from
+                source_mob = cd1_bits[source]
                 animations.append(
                     TransformFromCopy(
                         source_mob,
@@ -557,9 +566,76 @@ class DESKeyScheduleScene(VoiceoverScene):
             Indicate(k1_bits, color=GREEN_D, scale_factor=1.2),
             run_time=2
             )
-        
+
+        if self.ROUNDS_SHOWN > 1:
+            self.play_remaining_rounds(schedule, c1_bits, d1_bits, k1_bits, pc2_formula, k1_title)
+
+    def play_remaining_rounds(self, schedule, c_bits, d_bits, k_bits, formula, k_title):
+        """
+        Rounds 2 to ROUNDS_SHOWN on the rows already on screen.
+
+        The glyphs of C || D are moved to their rotated positions (the same
+        mobjects, reordered), and K_i is built from copies of the glyphs PC-2
+        selects, so a round costs its animation and nothing else.
+        """
+        cd_bits = [*c_bits, *d_bits]
+        cd_slots = [glyph.get_center() for glyph in cd_bits]
+        k_slots = [glyph.get_center() for glyph in k_bits]
+        shift_text = Text("Rotate left by 1", font_size=24, color=YELLOW_D).next_to(k_bits, DOWN, buff=0.5)
+
+        def play_round(number, run_time):
+            nonlocal cd_bits
+            shift = SHIFTS[number - 1]
+            new_formula = MathTex(
+                rf"K_{{{number}}} = \text{{PC}}_2(C_{{{number}}} \parallel D_{{{number}}})", font_size=28
+            ).move_to(formula)
+            new_k_title = MathTex(
+                rf"K_{{{number}}} \text{{ (48-bit subkey)}}", font_size=28, color=GREEN_D
+            ).next_to(k_bits, LEFT, buff=0.5)
+            new_shift_text = Text(f"Rotate left by {shift}", font_size=24, color=YELLOW_D).move_to(shift_text)
+
+            # Bits that wrap around from the front of a half travel over the top
+            rotated = [cd_bits[source] for source in schedule.rotation_sources(number)]
+            self.play(
+                Transform(formula, new_formula),
+                Transform(shift_text, new_shift_text),
+                *[glyph.animate(path_arc=-PI / 2 if (position % 28) >= 28 - shift else 0).move_to(slot)
+                  for position, (glyph, slot) in enumerate(zip(rotated, cd_slots))],
+                run_time=run_time * 0.4,
+            )
+            c_bits.submobjects = rotated[:28]
+            d_bits.submobjects = rotated[28:]
+            cd_bits = rotated
+
+            selected = VGroup(*[cd_bits[source].copy() for source in schedule.subkey_sources()])
+            self.add(selected)
+            self.play(
+                k_bits.animate.set_opacity(0.2),
+                Transform(k_title, new_k_title),
+                LaggedStart(
+                    *[glyph.animate(path_arc=PI / 3).move_to(slot).set_color(GREEN)
+                      for glyph, slot in zip(selected, k_slots)],
+                    lag_ratio=0.02,
+                ),
+                run_time=run_time * 0.6,
+            )
+            # The copies now show K_i exactly; put the real row back under them.
+            self.mobject_pool.set_bits(k_bits, to_bits(schedule.subkeys[number - 1], 48))
+            k_bits.set_opacity(1)
+            self.recycle(selected)
+
+        with self.voiceover("In round two the halves are rotated by one bit again, now starting from C-one and D-one. The bits wrapping around from the front go to the back, and PC-2 picks the same positions as before, giving a different subkey K-two.") as tracker:
+            self.play(FadeIn(shift_text))
+            play_round(2, max(tracker.duration - 1, 3))
+
+        if self.ROUNDS_SHOWN > 2:
+            remaining = range(3, self.ROUNDS_SHOWN + 1)
+            with self.voiceover("The remaining rounds work the same way, rotating by two bits except in rounds nine and sixteen. After sixteen rounds the halves have rotated by twenty-eight bits in total, all the way back to C-zero and D-zero.") as tracker:
+                for number in remaining:
+                    play_round(number, max(tracker.duration / len(remaining), 1))
+
       
-class DESRoundScene(VoiceoverScene):
+class DESRoundScene(NarratedScene):
     """Illustrates a single round of the DES encryption process in detail"""
 
     def keep_and_move_to_top(self, *objects_to_keep, animate_duration=1.0, spacing=0.5):
@@ -611,7 +687,7 @@ class DESRoundScene(VoiceoverScene):
     def construct(self):
         # self.set_speech_service(GTTSService())
         self.set_speech_service(
-            OpenAIService(
+            ClientOpenAIService(
                 voice="fable",
                 model="tts-1-hd",
             )
@@ -816,6 +892,7 @@ class DESRoundScene(VoiceoverScene):
         
         # Keep expanded bits and move to top before continuing
         kept_group = self.keep_and_move_to_top(expansion_label, expanded_bits_group)
+        self.recycle(input_bits_group)
         
         # Arrow from Expansion to XOR
         key_xor_box.next_to(expanded_bits_group, DOWN, buff=0.7)
@@ -846,6 +923,7 @@ class DESRoundScene(VoiceoverScene):
         # 3. S-Boxes
         # Keep XOR result and move to top
         kept_group = self.keep_and_move_to_top(key_xor_label, xor_result_bits)
+        self.recycle(expanded_bits_group)
 
         sbox_box = Rectangle(height=0.8, width=1.8, color=PURPLE).next_to(xor_result_bits, DOWN, buff=2.0)
         sbox_label = Text("S-Boxes (8×)", font_size=20, color=PURPLE).move_to(sbox_box)
@@ -866,10 +944,10 @@ class DESRoundScene(VoiceoverScene):
         # Create visual representation of bit groups
         bit_group_visuals = []
         for i, group in enumerate(bit_groups[:]):
-            group_rect = Rectangle(height=0.4, width=0.8, color=PURPLE_A)
-            group_text = Text(group, font_size=14, color=WHITE)
+            group_rect = self.mobject_pool.box(0.8, 0.4, color=PURPLE_A)
+            group_text = self.mobject_pool.text(group, font_size=14, color=WHITE)
             group_text.move_to(group_rect)
-            group_label = Text(f"Group {i+1}", font_size=12).next_to(group_rect, UP, buff=0.1)
+            group_label = self.mobject_pool.text(f"Group {i+1}", font_size=12).next_to(group_rect, UP, buff=0.1)
             
             group_visual = VGroup(group_rect, group_text, group_label)
             bit_group_visuals.append(group_visual)
@@ -895,6 +973,7 @@ class DESRoundScene(VoiceoverScene):
             sbox_label, bit_group_row,
             spacing=0.5
         )
+        self.recycle(xor_result_bits)
 
         # S-Box outputs (4 bits each)
         sbox_outputs = []
@@ -907,10 +986,10 @@ class DESRoundScene(VoiceoverScene):
         # Create visual representation of S-Box outputs
         output_visuals = []
         for i, output in enumerate(sbox_outputs):
-            output_rect = Rectangle(height=0.4, width=0.6, color=GREEN)
-            output_text = Text(output, font_size=14, color=WHITE)
+            output_rect = self.mobject_pool.box(0.6, 0.4, color=GREEN)
+            output_text = self.mobject_pool.text(output, font_size=14, color=WHITE)
             output_text.move_to(output_rect)
-            output_label = Text(f"Output {i+1}", font_size=12).next_to(output_rect, DOWN, buff=0.1)
+            output_label = self.mobject_pool.text(f"Output {i+1}", font_size=12).next_to(output_rect, DOWN, buff=0.1)
             
             output_visual = VGroup(output_rect, output_text, output_label)
             output_visuals.append(output_visual)
@@ -964,110 +1043,70 @@ class DESRoundScene(VoiceoverScene):
                 run_time=1.5
             )
         
-        # Create S-box table visual using the real S-box 1 values (showing just part of the table for clarity)
+        # Create S-box table visual using the real S-box 1 values
         with self.voiceover("Let's look at the actual S-Box 1 table from the DES standard."):
-            # Real S-Box 1 values (all 16 columns)
-            real_sbox1 = [
-                [14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7],
-                [0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8],
-                [4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0],
-                [15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13]
-            ]
-            
-            # Show first 8 columns only to fit on screen
-            visible_cols = 8
-            sbox_table = VGroup()
-            for i in range(4):  # 4 rows
-                row = VGroup()
-                for j in range(visible_cols):  # First 8 columns
-                    cell = Rectangle(height=0.5, width=0.5, color=WHITE)
-                    value = Text(str(real_sbox1[i][j]), font_size=16)
-                    value.move_to(cell)
-                    cell_group = VGroup(cell, value)
-                    row.add(cell_group)
-                row.arrange(RIGHT, buff=0)
-                sbox_table.add(row)
-            sbox_table.arrange(DOWN, buff=0)
-            
-            # Add table headers
-            row_headers = VGroup()
-            for i in range(4):
-                header = Text(f"{i:02b}", font_size=14, color=YELLOW)  # Binary representation
-                header.next_to(sbox_table[i], LEFT, buff=0.2)
-                row_headers.add(header)
-            
-            col_headers = VGroup()
-            for i in range(visible_cols):
-                header = Text(f"{i:04b}", font_size=14, color=BLUE)  # Binary representation
-                header.next_to(sbox_table[0][i], UP, buff=0.2)
-                col_headers.add(header)
-            
-            # Add table title and "more columns" indicator
-            table_title = Text("S-Box 1 (First 8 columns shown)", font_size=24, color=PURPLE)
-            table_title.next_to(sbox_table, UP, buff=0.4)
-            more_cols = Text("+ 8 more columns →", font_size=16, color=GRAY)
-            more_cols.next_to(sbox_table, RIGHT, buff=0.3)
-            
+            real_sbox1 = SBOXES[0]
+
+            # All 64 entries and their headers are a single image plus a grid of lines
+            sbox_table = RasterTable(
+                real_sbox1,
+                row_labels=[f"{i:02b}" for i in range(4)],  # Binary representation
+                column_labels=[f"{i:04b}" for i in range(16)],
+            )
+            table_title = Text("S-Box 1", font_size=24, color=PURPLE)
+            table_title.next_to(sbox_table, UP, buff=0.2)
+
             # Show the table with a fade-in effect
-            table_group = VGroup(sbox_table, row_headers, col_headers, table_title, more_cols)
+            table_group = Group(sbox_table, table_title)
             table_group.next_to(focused_group, DOWN, buff=1.0)
-            
+
             self.play(
                 FadeIn(table_group),
                 run_time=2.0
             )
-        
+
         # Calculate the row and column from the example bit group
         example_group = bit_groups[0]
         row_value = int(example_group[0] + example_group[5], 2)
         col_value = int(example_group[1:5], 2)  # Middle 4 bits determine column
-        
+
         with self.voiceover(f"For our input value, the first and last bits {example_group[0]} and {example_group[5]} give us row {row_value} in binary."):
-            # Create row indicator
-            row_indicator = Arrow(row_headers[row_value].get_right(), sbox_table[row_value][0].get_left(), buff=0.05, color=YELLOW)
+            row_highlight = sbox_table.highlight_row(row_value, color=YELLOW)
             self.play(
-                GrowArrow(row_indicator),
-                Indicate(row_headers[row_value], color=YELLOW, scale_factor=1.2),
+                FadeIn(row_highlight),
+                Flash(sbox_table.cell_center(row_value, -1), color=YELLOW, line_length=0.1, flash_radius=0.3),
                 run_time=1.5
             )
-        
-        with self.voiceover(f"The middle bits {example_group[1:5]} give us column {col_value} in decimal. But since we're only showing 8 columns, we'll use column {min(col_value, 7)} for our demonstration."):
-            # Use min(col_value, 7) to ensure we stay within our visible columns
-            visible_col = min(col_value, 7)
-            
-            # Create column indicator
-            col_indicator = Arrow(col_headers[visible_col].get_bottom(), sbox_table[0][visible_col].get_top(), buff=0.05, color=BLUE)
+
+        with self.voiceover(f"The middle bits {example_group[1:5]} give us column {col_value} in decimal."):
+            col_highlight = sbox_table.highlight_column(col_value, color=BLUE)
             self.play(
-                GrowArrow(col_indicator),
-                Indicate(col_headers[visible_col], color=BLUE, scale_factor=1.2),
+                FadeIn(col_highlight),
+                Flash(sbox_table.cell_center(-1, col_value), color=BLUE, line_length=0.1, flash_radius=0.3),
                 run_time=1.5
             )
-        
+
         # Get the actual selected cell value from S-box 1
         selected_value = real_sbox1[row_value][col_value]
         binary_value = format(selected_value, '04b')
-        
-        # If the actual column is beyond what we're showing, indicate that
-        if col_value >= visible_cols:
-            pass
-        else:
-            # Highlight the selected cell
-            selected_cell = sbox_table[row_value][visible_col]
-            
-            with self.voiceover(f"We look up the value at the intersection of row {row_value} and column {col_value}, which is {selected_value}."):
-                self.play(
-                    selected_cell.animate.set_fill(YELLOW, opacity=0.3),
-                    Flash(selected_cell, color=YELLOW, line_length=0.1, flash_radius=0.3),
-                    run_time=1.5
-                )
-        
+
+        with self.voiceover(f"We look up the value at the intersection of row {row_value} and column {col_value}, which is {selected_value}."):
+            selected_cell = sbox_table.highlight_cell(row_value, col_value, color=YELLOW, opacity=0.5)
+            self.play(
+                FadeOut(row_highlight),
+                FadeOut(col_highlight),
+                FadeIn(selected_cell),
+                Flash(sbox_table.cell_center(row_value, col_value), color=YELLOW, line_length=0.1, flash_radius=0.3),
+                run_time=1.5
+            )
+
         with self.voiceover(f"This decimal value {selected_value} is converted to a 4-bit binary value {binary_value}."):
             # Show the binary conversion
             value_text = Text(f"{selected_value}", font_size=24, color=GREEN_D)
             binary_text = Text(f"= {binary_value} (binary)", font_size=24, color=GREEN_D)
             
             conversion_group = VGroup(value_text, binary_text).arrange(RIGHT, buff=0.3)
-            conversion_group.next_to(table_group, RIGHT, buff=0.5)
+            conversion_group.next_to(table_group, DOWN, buff=0.4)
             
             self.play(
                 Write(conversion_group),
@@ -1122,6 +1161,7 @@ class DESRoundScene(VoiceoverScene):
             sbox_combined_label, sbox_combined_bits,
             spacing=0.5
         )
+        self.recycle(bit_group_row, output_row)
 
         # Starting from the kept combined S-Box output
         
@@ -1157,42 +1197,29 @@ class DESRoundScene(VoiceoverScene):
         permuted_bits_group.scale(0.8).next_to(perm_box, DOWN, buff=0.3)
         
         with self.voiceover("The permutation spreads the influence of each S-box output across the entire result, strengthening the cipher against differential cryptanalysis."):
-            # Show bit movement with paths to visualize the permutation
-            # Create several sample arrows showing bits moving to new positions
-            bit_arrows = []
-            for i in range(8):  # Show 8 sample bit movements
-                src_idx = i * 4  # Sample source indices spread across the input
-                # In real DES, the destination would be according to the P-table
-                # For visualization, we'll use a simplified formula
-                dest_idx = (src_idx * 7) % 32
-                
-                if src_idx < len(sbox_combined_bits) and dest_idx < len(permuted_bits_group):
-                    start_point = sbox_combined_bits[src_idx].get_center()
-                    end_point = permuted_bits_group[dest_idx].get_center()
-                    
-                    # Create curved path for better visualization
-                    path = CubicBezier(
-                        start_point,
-                        start_point + DOWN * 0.5 + LEFT * (0.3 * (i % 4 - 1.5)),
-                        end_point + UP * 0.5 + RIGHT * (0.3 * (i % 4 - 1.5)),
-                        end_point
-                    )
-                    
-                    bit_arrows.append(
-                        VMobject().set_points_as_corners([path.point_from_proportion(j/20) for j in range(21)])
-                        .set_stroke(color=YELLOW, width=2)
-                    )
-            
+            # One wire per output bit, following the real P table
+            p_wires = PermutationWires(P, sbox_combined_bits, permuted_bits_group, stroke_width=1.5)
+            p_wires.set_stroke(color=YELLOW, opacity=0.8)
+
             # Animate the bit movement paths
             self.play(
-                *[Create(arrow) for arrow in bit_arrows],
+                GrowWires(p_wires),
                 run_time=2.0
             )
             
-            # Fade out the arrows and show the permuted bits
+            # Send a copy of every input bit down its wire, all positions from one call per frame
+            flying_bits = VGroup(*[sbox_combined_bits[i - 1].copy() for i in P])
+
+            def fly(bits, alpha):
+                for bit, point in zip(bits, p_wires.points_at(alpha)):
+                    bit.move_to(point)
+
+            self.play(UpdateFromAlphaFunc(flying_bits, fly), run_time=2.0)
+
+            # Fade out the wires and show the permuted bits
             self.play(
-                *[FadeOut(arrow) for arrow in bit_arrows],
-                Write(permuted_bits_group),
+                FadeOut(p_wires),
+                ReplacementTransform(flying_bits, permuted_bits_group),
                 run_time=1.5
             )
         
@@ -1239,23 +1266,11 @@ class DESRoundScene(VoiceoverScene):
     # Helper methods for bit manipulation 
     def create_bit_group(self, bit_string, font_size=16, color=WHITE):
         """Create a group of mobjects representing individual bits"""
-        bits = VGroup(*[Text(bit, font_size=font_size, color=color) for bit in bit_string])
-        bits.arrange(RIGHT, buff=0.15)
-        return bits
+        return self.mobject_pool.bit_row(bit_string, font_size=font_size, color=color, buff=0.15)
     
     def get_expanded_bits(self, bits):
-        """Simulate the expansion permutation (simplified)"""
-        # In a real implementation, this would use the E-bit selection table
-        # For demonstration, we'll just duplicate some bits to get 48 from 32
-        expanded = ""
-        for i in range(0, len(bits), 4):
-            if i+4 <= len(bits):
-                block = bits[i:i+4]
-                # Duplicate first and last bit of each block
-                expanded += block[3] + block + block[0]
-        
-        # Ensure we have exactly 48 bits
-        return expanded[:48].ljust(48, "0")
+        """Apply the expansion permutation E (32 -> 48 bits)"""
+        return to_bits(permute(int(bits, 2), E, 32), 48)
     
     def perform_xor(self, bits1, bits2):
         """Perform bitwise XOR on two bit strings"""
@@ -1283,22 +1298,686 @@ class DESRoundScene(VoiceoverScene):
         return "0000"  # Default fallback
     
     def get_permuted_bits(self, bits):
-        """Simulate the P permutation (simplified)"""
-        # In a real implementation, this would use the P permutation table
-        # For demonstration, we'll just shuffle the bits in a consistent way
-        if len(bits) >= 32:
-            # Simple shuffle algorithm for demonstration
-            permuted = list(bits[:32])
-            for i in range(32):
-                new_pos = (i * 7) % 32  # A simple permutation formula
-                permuted[new_pos] = bits[i]
-            
-            return "".join(permuted)
-        
-        return bits  # Default fallback
+        """Apply the P permutation (32 -> 32 bits)"""
+        return to_bits(permute(int(bits, 2), P, 32), 32)
+
+
+class DESSixteenRoundsScene(NarratedScene):
+    """Walks through all sixteen rounds of DES on a real plaintext and key"""
+
+    # The worked example from the DES key schedule scene
+    PLAINTEXT = 0x0123456789ABCDEF
+    KEY = 0x133457799BBCDFF1
+
+    # Position of each row of bits; labels end at ROW_X - 5.5
+    ROW_X = 1.0
+    ROW_Y = {"left": 2.0, "right": 1.2, "subkey": 0.1, "f_output": -0.9, "new_right": -2.1}
+
+    def construct(self):
+        # self.set_speech_service(GTTSService())
+        self.set_speech_service(
+            ClientOpenAIService(
+                voice="fable",
+                model="tts-1-hd",
+            )
+        )
+
+        # Every value shown below comes from this one trace, computed up front
+        trace = trace_encryption(self.PLAINTEXT, self.KEY)
+
+        title = Text("DES: All Sixteen Rounds", font_size=40, color=BLUE_D).to_edge(UP)
+        plaintext_text = Text(f"Plaintext  {trace.plaintext:016X}", font_size=24, color=WHITE)
+        key_text = Text(f"Key  {trace.key:016X}", font_size=24, color=YELLOW)
+        inputs = VGroup(plaintext_text, key_text).arrange(DOWN, buff=0.3)
+
+        with self.voiceover("Let's follow one block through all sixteen rounds of DES, using a real plaintext and key."):
+            self.play(Write(title))
+            self.play(FadeIn(inputs))
+
+        # Row labels stay on screen; only the bits change from round to round
+        labels = VGroup(
+            MathTex(r"L_{i-1}", font_size=28, color=RED_D),
+            MathTex(r"R_{i-1}", font_size=28, color=BLUE_D),
+            MathTex(r"K_i", font_size=28, color=YELLOW_D),
+            MathTex(r"F(R_{i-1}, K_i)", font_size=28, color=GREEN_D),
+            MathTex(r"R_i = L_{i-1} \oplus F", font_size=28, color=PURPLE_B),
+        )
+        for label, y in zip(labels, self.ROW_Y.values()):
+            label.next_to(RIGHT * (self.ROW_X - 5.5) + UP * y, LEFT, buff=0)
+
+        left_row = self.create_bit_row(trace.rounds[0].left, 32, RED, "left")
+        right_row = self.create_bit_row(trace.rounds[0].right, 32, BLUE, "right")
+
+        with self.voiceover("After the initial permutation, the block is split into a left half L zero and a right half R zero, thirty-two bits each."):
+            # Morph copies on both sides: a transform aligns the families of its
+            # mobjects, and pooled rows have to keep their structure.
+            halves = [(plaintext_text.copy(), row.copy()) for row in (left_row, right_row)]
+            self.play(
+                FadeOut(inputs),
+                FadeIn(labels[:2]),
+                *[Transform(source, target) for source, target in halves],
+            )
+            self.remove(*[source for source, _ in halves])
+            self.add(left_row, right_row)
+            self.play(FadeIn(labels[2:]))
+
+        round_counter = Text("Round 1 of 16", font_size=28, color=YELLOW).next_to(title, DOWN, buff=0.2)
+        self.play(FadeIn(round_counter))
+
+        # Only the current round's bits exist at any time: each round's rows
+        # are created when the round starts and recycled when it ends, and
+        # its output rows carry over as the next round's inputs.
+        for round_trace, rows in self.materialize_rounds(trace):
+            left_row, right_row = self.play_round(round_trace, rows, left_row, right_row, round_counter)
+
+        ciphertext_text = Text(f"Ciphertext  {trace.ciphertext:016X}", font_size=28, color=GREEN)
+        ciphertext_text.to_edge(DOWN, buff=0.6)
+
+        with self.voiceover("After round sixteen the two halves are swapped one last time and passed through the final permutation, giving the ciphertext."):
+            self.play(
+                left_row.animate.move_to(UP * self.ROW_Y["right"] + RIGHT * self.ROW_X),
+                right_row.animate.move_to(UP * self.ROW_Y["left"] + RIGHT * self.ROW_X),
+                FadeOut(labels),
+                FadeOut(round_counter),
+            )
+            self.play(TransformFromCopy(VGroup(right_row, left_row), ciphertext_text))
+
+        with self.voiceover("Every bit of the ciphertext now depends on every bit of the plaintext and of the key.") as tracker:
+            self.play(Circumscribe(ciphertext_text, color=YELLOW), run_time=tracker.duration)
+
+    def materialize_rounds(self, trace):
+        """Yield each round with its rows of bits, created only when the round starts"""
+        for round_trace in trace.rounds:
+            rows = {
+                "subkey": self.create_bit_row(round_trace.subkey, 48, YELLOW, "subkey"),
+                "f_output": self.create_bit_row(round_trace.f_output, 32, GREEN, "f_output"),
+                "new_right": self.create_bit_row(round_trace.new_right, 32, PURPLE_B, "new_right"),
+            }
+            yield round_trace, rows
+
+    def play_round(self, round_trace, rows, left_row, right_row, round_counter):
+        """Animate one round and return the rows holding L_i and R_i"""
+        number = round_trace.number
+        subkey_row, f_row, new_right_row = rows["subkey"], rows["f_output"], rows["new_right"]
+        # The first rounds are explained; later ones move faster
+        run_time = 1.0 if number <= 2 else 0.6
+
+        if number == 1:
+            text = "In round one, the subkey K one from the key schedule enters the F function together with the right half."
+        elif number == 2:
+            text = "The new right half is the old left half XORed with the output of F, and the old right half becomes the new left half."
+        elif number == ROUNDS:
+            text = "Round sixteen, the last round."
+        else:
+            text = f"Round {number}."
+
+        with self.voiceover(text):
+            self.play(
+                Transform(round_counter, Text(f"Round {number} of 16", font_size=28, color=YELLOW).move_to(round_counter)),
+                FadeIn(subkey_row, shift=DOWN * 0.2),
+                run_time=run_time,
+            )
+            # Bit by bit, so no transform restructures a pooled row: every bit of F
+            # comes out of an S-box, fed by the bit of R that E puts in the middle
+            # of that box's input and the subkey bit it is XORed with.
+            self.play(
+                *[TransformFromCopy(right_row[E[source] - 1], f_row[i]) for i, source in enumerate(self.f_sources())],
+                *[FadeOut(subkey_row[source].copy(), target_position=f_row[i])
+                  for i, source in enumerate(self.f_sources())],
+                run_time=run_time,
+            )
+            # R_i = L_{i-1} xor F, bit by bit
+            self.play(
+                *[TransformFromCopy(left_row[i], new_right_row[i]) for i in range(32)],
+                *[FadeOut(f_row[i].copy(), target_position=new_right_row[i]) for i in range(32)],
+                run_time=run_time,
+            )
+
+            # Swap the halves: R_{i-1} becomes L_i, and the rest of the round goes
+            # back to the pool for the next round's rows
+            self.play(
+                FadeOut(left_row),
+                FadeOut(subkey_row),
+                FadeOut(f_row),
+                right_row.animate.move_to(UP * self.ROW_Y["left"] + RIGHT * self.ROW_X).set_color(RED),
+                new_right_row.animate.move_to(UP * self.ROW_Y["right"] + RIGHT * self.ROW_X).set_color(BLUE),
+                run_time=run_time,
+            )
+            self.recycle(left_row, subkey_row, f_row)
+
+        return right_row, new_right_row
+
+    @staticmethod
+    def f_sources():
+        """For every bit of F, the position in E(R) and in the subkey of an input bit of its S-box"""
+        # Output bit b of S-box g is bit 4g + b before P; the middle four bits
+        # of the box's six input bits select its column.
+        return [6 * ((P[i] - 1) // 4) + (P[i] - 1) % 4 + 1 for i in range(32)]
+
+    def create_bit_row(self, value, width, color, row):
+        """Create a row of bit glyphs showing ``value`` at the position of ``row``"""
+        bits = self.mobject_pool.bit_row(to_bits(value, width), font_size=16, color=color, buff=0.06)
+        # Space the bytes (or 6-bit groups of a subkey) apart for readability
+        group = 6 if width == 48 else 8
+        for i, bit in enumerate(bits):
+            bit.shift(RIGHT * 0.12 * (i // group))
+        bits.move_to(UP * self.ROW_Y[row] + RIGHT * self.ROW_X)
+        return bits
+
+
+class DESAvalancheScene(NarratedScene):
+    """Shows the avalanche effect with statistics over about a million encryptions"""
+
+    # Random plaintext/key pairs; every one of their bits is flipped in turn
+    SAMPLES = 1 << 14
+    SEED = 0
+
+    def construct(self):
+        # self.set_speech_service(GTTSService())
+        self.set_speech_service(
+            ClientOpenAIService(
+                voice="fable",
+                model="tts-1-hd",
+            )
+        )
+
+        started = time.perf_counter()
+        stats = avalanche(self.SAMPLES, seed=self.SEED)
+        logger.info(
+            f"Avalanche statistics: {stats.encryptions:,} encryptions in {time.perf_counter() - started:.1f}s"
+        )
+        # Fraction of pairs at each distance; the axes fit round 1 onwards
+        panels = [
+            ("One plaintext bit flipped", stats.plaintext, BLUE),
+            ("One key bit flipped", stats.key, YELLOW),
+        ]
+        fractions = [histograms / histograms.sum(axis=1, keepdims=True) for _, histograms, _ in panels]
+        y_max = np.ceil(max(f[1:].max() for f in fractions) * 10) / 10
+
+        title = Text("The Avalanche Effect", font_size=40, color=BLUE_D).to_edge(UP)
+        count_text = Text(
+            f"{stats.encryptions:,} encryptions of random blocks", font_size=22, color=GRAY
+        ).next_to(title, DOWN, buff=0.2)
+
+        with self.voiceover("A good cipher changes about half of the output bits when a single input bit changes. This is called the avalanche effect."):
+            self.play(Write(title))
+
+        with self.voiceover(f"To measure it, we take {self.SAMPLES:,} random plaintexts and keys, flip each of their bits in turn, and encrypt everything, about {stats.encryptions / 1e6:.0f} million encryptions."):
+            self.play(FadeIn(count_text))
+
+        axes_group = VGroup()
+        for label, _, color in panels:
+            axes = Axes(
+                x_range=[0, 64, 8],
+                y_range=[0, y_max, 0.1],
+                x_length=5.5,
+                y_length=3.5,
+                tips=False,
+                axis_config={"font_size": 18, "include_numbers": True},
+            )
+            half = axes.get_vertical_line(axes.c2p(32, y_max), color=GRAY, stroke_width=2)
+            half_label = MathTex("32", font_size=20, color=GRAY).next_to(half, UP, buff=0.1)
+            caption = Text(label, font_size=20, color=color).next_to(axes, DOWN, buff=0.3)
+            axes_group.add(VGroup(axes, half, half_label, caption))
+        axes_group.arrange(RIGHT, buff=1.0).next_to(count_text, DOWN, buff=0.4)
+
+        # One bar mobject and one mean per panel, updated in place every round
+        bars_group = VGroup()
+        means = VGroup()
+        for (axes, *_), (_, histograms, color), fraction in zip(axes_group, panels, fractions):
+            bars_group.add(self.create_histogram(axes, fraction[1], color))
+            mean = DecimalNumber(AvalancheStats.means(histograms)[1], num_decimal_places=2, font_size=24)
+            means.add(mean.next_to(axes, UP, buff=0.1).align_to(axes, RIGHT))
+
+        mean_labels = VGroup(*[
+            Text("mean distance", font_size=18, color=GRAY).next_to(mean, LEFT, buff=0.15) for mean in means
+        ])
+        round_counter = Text("After round 1", font_size=28, color=YELLOW).next_to(axes_group, DOWN, buff=0.3)
+
+        with self.voiceover("Each histogram shows how many bits differ between the two encryptions after a round. After the first round, a flipped bit has barely spread."):
+            self.play(FadeIn(axes_group), FadeIn(round_counter))
+            self.play(FadeIn(bars_group), FadeIn(means), FadeIn(mean_labels))
+
+        with self.voiceover("Watch the distributions as the rounds go by. Within five rounds, the difference has spread across the whole block."):
+            for number in range(2, 6):
+                self.play_round(number, panels, axes_group, bars_group, means, round_counter, run_time=1.0)
+
+        with self.voiceover("From then on, the two ciphertexts differ in thirty-two bits on average, exactly half, just like two unrelated random blocks."):
+            for number in range(6, ROUNDS + 1):
+                self.play_round(number, panels, axes_group, bars_group, means, round_counter, run_time=0.4)
+
+        with self.voiceover("This is the diffusion that makes differences in the input impossible to trace through the cipher.") as tracker:
+            self.play(Circumscribe(VGroup(axes_group, means), color=YELLOW), run_time=tracker.duration)
+
+    def play_round(self, number, panels, axes_group, bars_group, means, round_counter, run_time):
+        """Move every histogram and mean to the distances after round ``number``"""
+        animations = [
+            Transform(round_counter, Text(f"After round {number}", font_size=28, color=YELLOW).move_to(round_counter))
+        ]
+        for (axes, *_), bars, mean, (_, histograms, color) in zip(axes_group, bars_group, means, panels):
+            counts = histograms[number]
+            animations.append(Transform(bars, self.create_histogram(axes, counts / counts.sum(), color)))
+            animations.append(ChangeDecimalToValue(mean, AvalancheStats.means(histograms)[number]))
+        self.play(*animations, run_time=run_time)
+
+    def create_histogram(self, axes, fractions, color):
+        """All bars of a histogram as the subpaths of a single VMobject"""
+        bars = VMobject(stroke_width=0).set_fill(color, opacity=0.8)
+        top = axes.y_range[1]
+        # One bar per distance, empty ones included, so histograms transform bar by bar
+        for distance, fraction in enumerate(fractions):
+            corners = [
+                axes.c2p(distance - 0.4, 0),
+                axes.c2p(distance - 0.4, min(fraction, top)),
+                axes.c2p(distance + 0.4, min(fraction, top)),
+                axes.c2p(distance + 0.4, 0),
+            ]
+            bars.start_new_path(corners[0])
+            bars.add_points_as_corners([*corners[1:], corners[0]])
+        return bars
+
+
+class DESSBoxTablesScene(NarratedScene):
+    """Difference distribution and linear approximation tables of all eight S-boxes as heatmaps"""
+
+    # Screen size of each heatmap; tables are drawn input along x, output along y
+    MAP_WIDTH = 10.0
+    MAP_HEIGHT = 2.2
+    # Entries at or beyond these magnitudes get the extreme colors
+    DDT_LIMIT = 16
+    LAT_LIMIT = 20
+
+    def construct(self):
+        # self.set_speech_service(GTTSService())
+        self.set_speech_service(
+            ClientOpenAIService(
+                voice="fable",
+                model="tts-1-hd",
+            )
+        )
+
+        ddts = difference_distribution_tables()
+        lats = linear_approximation_tables()
+        # 256-entry color lookups: counts from black to yellow, biases red to blue
+        ddt_palette = self.create_palette([BLACK, PURPLE_E, RED_D, YELLOW])
+        lat_palette = self.create_palette([RED, BLACK, BLUE])
+
+        title = Text("S-Box Cryptanalysis Tables", font_size=40, color=PURPLE).to_edge(UP)
+        box_counter = Text("S-box 1", font_size=28, color=YELLOW).next_to(title, DOWN, buff=0.2)
+
+        with self.voiceover("To attack DES, cryptanalysts study each S-box on its own, through two tables computed over every possible input."):
+            self.play(Write(title), FadeIn(box_counter))
+
+        # Each table is one image, however many entries it has
+        ddt_image = self.create_heatmap(ddts[0], ddt_palette, 0, self.DDT_LIMIT)
+        ddt_image.next_to(box_counter, DOWN, buff=0.5)
+        lat_image = self.create_heatmap(lats[0], lat_palette, -self.LAT_LIMIT, self.LAT_LIMIT)
+        lat_image.next_to(ddt_image, DOWN, buff=0.8)
+
+        ddt_label = Text("Difference distribution: input difference Δx → output difference Δy", font_size=18)
+        ddt_label.next_to(ddt_image, UP, buff=0.1).align_to(ddt_image, LEFT)
+        lat_label = Text("Linear approximations: input mask a → output mask b", font_size=18)
+        lat_label.next_to(lat_image, UP, buff=0.1).align_to(lat_image, LEFT)
+
+        with self.voiceover("The difference distribution table counts, for every input difference, how often each output difference occurs. Bright cells are differences that survive the S-box unusually often."):
+            self.play(FadeIn(ddt_image), Write(ddt_label))
+
+        with self.voiceover("The linear approximation table measures how well a parity of input bits predicts a parity of output bits. Red and blue cells are the most biased approximations."):
+            self.play(FadeIn(lat_image), Write(lat_label))
+
+        ddt_marker, ddt_value = self.create_peak_marker(ddt_image, ddts[0], YELLOW)
+        lat_marker, lat_value = self.create_peak_marker(lat_image, lats[0], GREEN)
+
+        with self.voiceover("The strongest entry of each table is what an attacker builds on."):
+            self.play(Create(ddt_marker), Create(lat_marker), FadeIn(ddt_value), FadeIn(lat_value))
+
+        with self.voiceover("Every S-box has its own pattern. Here are all eight, one after another."):
+            for box in range(1, 8):
+                self.play_box(
+                    box, ddts, lats, ddt_palette, lat_palette,
+                    (ddt_image, ddt_marker, ddt_value), (lat_image, lat_marker, lat_value), box_counter,
+                )
+
+        with self.voiceover("S-box five holds the most biased approximation of all, the one Matsui used for the first linear attack on full DES.") as tracker:
+            self.play_box(
+                4, ddts, lats, ddt_palette, lat_palette,
+                (ddt_image, ddt_marker, ddt_value), (lat_image, lat_marker, lat_value), box_counter,
+            )
+            self.play(Circumscribe(lat_marker, color=YELLOW), run_time=max(tracker.duration - 1, 1))
+
+    def play_box(self, box, ddts, lats, ddt_palette, lat_palette, ddt_parts, lat_parts, box_counter):
+        """Move both heatmaps and their peak markers to S-box ``box``"""
+        animations = [Transform(box_counter, Text(f"S-box {box + 1}", font_size=28, color=YELLOW).move_to(box_counter))]
+        for (image, marker, value), table, palette, low, high in (
+            (ddt_parts, ddts[box], ddt_palette, 0, self.DDT_LIMIT),
+            (lat_parts, lats[box], lat_palette, -self.LAT_LIMIT, self.LAT_LIMIT),
+        ):
+            target = self.create_heatmap(table, palette, low, high).move_to(image)
+            new_marker, new_value = self.create_peak_marker(target, table, marker.get_color())
+            animations += [Transform(image, target), Transform(marker, new_marker), Transform(value, new_value)]
+        self.play(*animations, run_time=0.8)
+
+    def create_palette(self, colors):
+        """A (256, 4) RGBA lookup table running through ``colors``"""
+        rgb = np.array([color.to_rgb() for color in color_gradient(colors, 256)])
+        return np.concatenate([np.round(rgb * 255), np.full((256, 1), 255)], axis=1).astype(np.uint8)
+
+    def create_heatmap(self, table, palette, low, high):
+        """An image of ``table`` (input x output) with one pixel per entry"""
+        levels = np.clip((table.T - low) / (high - low), 0, 1)
+        # Output 0 at the bottom, like the y axis of a plot
+        pixels = palette[np.round(levels[::-1] * 255).astype(int)]
+        image = ImageMobject(pixels)
+        image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        return image.stretch_to_fit_width(self.MAP_WIDTH).stretch_to_fit_height(self.MAP_HEIGHT)
+
+    def create_peak_marker(self, image, table, color):
+        """Outline the largest entry (by magnitude, trivial row and column excluded) of ``table``"""
+        inputs, outputs = table.shape
+        a, b = np.unravel_index(np.argmax(np.abs(table[1:, 1:])), (inputs - 1, outputs - 1))
+        a, b = a + 1, b + 1
+        cell_width, cell_height = image.width / inputs, image.height / outputs
+        marker = Rectangle(width=cell_width * 1.6, height=cell_height * 1.6, color=color, stroke_width=3)
+        marker.move_to(image.get_corner(DL) + RIGHT * cell_width * (a + 0.5) + UP * cell_height * (b + 0.5))
+        entry = f"{table[a, b]:+d}" if table.min() < 0 else f"{table[a, b]}"
+        value = Text(f"[{a}, {b}] = {entry}", font_size=18, color=color)
+        value.next_to(image, UP, buff=0.1).align_to(image, RIGHT)
+        return marker, value
+
+
+class DESPermutationTablesScene(NarratedScene):
+    """Draws every wire of the DES permutation and expansion tables"""
+
+    # (title, table, input width, narration)
+    TABLES = [
+        ("Initial Permutation (IP)", IP, 64,
+         "The initial permutation reorders all sixty-four bits of the block before the first round."),
+        ("Final Permutation (IP⁻¹)", FP, 64,
+         "The final permutation is its exact inverse, undoing it after the last round."),
+        ("Expansion (E)", E, 32,
+         "The expansion takes thirty-two bits to forty-eight: the edge bits of every group of four are used twice."),
+        ("Permutation (P)", P, 32,
+         "The P permutation spreads the four output bits of every S-box over four different S-boxes of the next round."),
+        ("Permuted Choice 1 (PC-1)", PC1, 64,
+         "Permuted choice one selects fifty-six key bits. The eight parity bits, in gray, are never read."),
+        ("Permuted Choice 2 (PC-2)", PC2, 56,
+         "Permuted choice two picks the forty-eight bits of each round subkey from the fifty-six bit key state."),
+    ]
+    ROW_WIDTH = 12.0
+    INPUT_Y = 1.6
+    OUTPUT_Y = -2.4
+
+    def construct(self):
+        # self.set_speech_service(GTTSService())
+        self.set_speech_service(
+            ClientOpenAIService(
+                voice="fable",
+                model="tts-1-hd",
+            )
+        )
+
+        title = Text("DES Permutation Tables", font_size=40, color=ORANGE).to_edge(UP)
+        with self.voiceover("Besides the S-boxes, DES moves bits around with six fixed tables. Each wire connects an input bit, on top, to the output position it is copied to."):
+            self.play(Write(title))
+
+        shown = None
+        for name, table, width, narration in self.TABLES:
+            inputs = self.create_dot_row(width, self.INPUT_Y, BLUE)
+            outputs = self.create_dot_row(len(table), self.OUTPUT_Y, GREEN)
+            # Every wire of the table is one subpath of a single mobject
+            wires = PermutationWires(table, inputs, outputs, stroke_width=1.2)
+            wires.set_stroke(color=YELLOW, opacity=0.7)
+            for index in wires.unused_inputs(width):
+                inputs[index].set_color(GRAY)
+
+            caption = Text(name, font_size=28, color=ORANGE).next_to(title, DOWN, buff=0.3)
+            sizes = MathTex(rf"{width} \text{{ bits}} \rightarrow {len(table)} \text{{ bits}}", font_size=26)
+            sizes.next_to(outputs, DOWN, buff=0.4)
+            group = VGroup(caption, sizes, inputs, outputs, wires)
+
+            # One dot per wire, moved along all wires together
+            travellers = VGroup(*[Dot(radius=0.04, color=YELLOW) for _ in table])
+
+            def travel(dots, alpha, wires=wires):
+                for dot, point in zip(dots, wires.points_at(alpha)):
+                    dot.move_to(point)
+
+            with self.voiceover(narration):
+                if shown is not None:
+                    self.play(FadeOut(shown), run_time=0.5)
+                self.play(FadeIn(caption), FadeIn(sizes), FadeIn(inputs), FadeIn(outputs), run_time=0.5)
+                self.play(GrowWires(wires), run_time=2.0)
+                self.play(UpdateFromAlphaFunc(travellers, travel), run_time=1.5)
+                self.remove(travellers)
+            shown = group
+
+    def create_dot_row(self, count, y, color):
+        """``count`` evenly spaced dots across ``ROW_WIDTH`` at height ``y``"""
+        xs = np.linspace(-self.ROW_WIDTH / 2, self.ROW_WIDTH / 2, count)
+        return VGroup(*[Dot(RIGHT * x + UP * y, radius=0.05, color=color) for x in xs])
+
+
+class DESBlockModesScene(NarratedScene):
+    """Encrypts an image with DES in ECB and CBC mode to show what ECB leaks"""
+
+    # About as many pixels as the panel covers on a 4K frame; CBC encryption
+    # runs block by block in Python, about 45,000 DES blocks a second
+    IMAGE_SIZE = 512
+    KEY = 0x133457799BBCDFF1
+    IV = 0x0123456789ABCDEF
+
+    def construct(self):
+        # self.set_speech_service(GTTSService())
+        self.set_speech_service(
+            ClientOpenAIService(
+                voice="fable",
+                model="tts-1-hd",
+            )
+        )
+
+        pixels = self.create_penguin(self.IMAGE_SIZE)
+        cipher = DES(self.KEY)
+        # Rows of RGB pixels are a whole number of 8-byte blocks, so no padding is needed
+        started = time.perf_counter()
+        ecb = ecb_encrypt(cipher, pixels).reshape(pixels.shape)
+        ecb_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        cbc = cbc_encrypt(cipher, pixels, self.IV).reshape(pixels.shape)
+        logger.info(
+            f"Encrypted {pixels.nbytes:,} bytes: ECB in {ecb_seconds:.1f}s, CBC in {time.perf_counter() - started:.1f}s"
+        )
+
+        title = Text("Block Cipher Modes", font_size=40, color=BLUE_D).to_edge(UP)
+        with self.voiceover("DES encrypts eight bytes at a time. To encrypt anything longer, we need a mode of operation."):
+            self.play(Write(title))
+
+        panels = Group()
+        for image_pixels, label, color in (
+            (pixels, "Plaintext", WHITE),
+            (ecb, "ECB", RED),
+            (cbc, "CBC", GREEN),
+        ):
+            image = ImageMobject(image_pixels)
+            image.height = 3.6
+            caption = Text(label, font_size=26, color=color).next_to(image, DOWN, buff=0.25)
+            panels.add(Group(image, caption))
+        panels.arrange(RIGHT, buff=0.5).next_to(title, DOWN, buff=0.5)
+        plain_panel, ecb_panel, cbc_panel = panels
+
+        with self.voiceover(f"Take this image: {self.IMAGE_SIZE} by {self.IMAGE_SIZE} pixels, almost eight hundred thousand bytes, or nearly a hundred thousand blocks."):
+            self.play(FadeIn(plain_panel))
+
+        with self.voiceover("The simplest mode, electronic codebook or ECB, encrypts every block on its own with the same key. Identical plaintext blocks give identical ciphertext blocks."):
+            self.play(FadeIn(ecb_panel, shift=RIGHT * 0.3))
+
+        with self.voiceover("So although every block is perfectly encrypted, the picture shows straight through. Large areas of one color become areas of one repeating pattern."):
+            self.play(Circumscribe(ecb_panel[0], color=RED), run_time=2)
+
+        cbc_formula = MathTex(r"C_i = E_K(P_i \oplus C_{i-1}),\quad C_0 = IV", font_size=30)
+        cbc_formula.next_to(panels, DOWN, buff=0.4)
+
+        with self.voiceover("Cipher block chaining, CBC, first XORs each block with the previous ciphertext block, starting from a random initialization vector."):
+            self.play(Write(cbc_formula))
+
+        with self.voiceover("Now identical blocks encrypt differently depending on everything before them, and the image becomes indistinguishable from noise."):
+            self.play(FadeIn(cbc_panel, shift=RIGHT * 0.3))
+            self.play(Circumscribe(cbc_panel[0], color=GREEN), run_time=2)
+
+    def create_penguin(self, size):
+        """A flat-colored penguin, ``(size, size, 3)`` RGB bytes"""
+        y, x = np.mgrid[-1:1:size * 1j, -1:1:size * 1j]
+
+        def ellipse(cx, cy, rx, ry):
+            return ((x - cx) / rx) ** 2 + ((y - cy) / ry) ** 2 <= 1
+
+        pixels = np.empty((size, size, 3), dtype=np.uint8)
+        pixels[:] = (200, 222, 238)
+        orange = (245, 160, 30)
+        # Painted back to front
+        for mask, color in (
+            (ellipse(-0.25, 0.85, 0.2, 0.08) | ellipse(0.25, 0.85, 0.2, 0.08), orange),
+            (ellipse(0, 0.15, 0.55, 0.72), (20, 20, 20)),
+            (ellipse(0, 0.3, 0.38, 0.52), (250, 250, 250)),
+            (ellipse(0, -0.5, 0.34, 0.32), (20, 20, 20)),
+            (ellipse(-0.13, -0.56, 0.08, 0.08) | ellipse(0.13, -0.56, 0.08, 0.08), (250, 250, 250)),
+            (ellipse(-0.12, -0.55, 0.035, 0.035) | ellipse(0.12, -0.55, 0.035, 0.035), (20, 20, 20)),
+            (ellipse(0, -0.4, 0.12, 0.06), orange),
+        ):
+            pixels[mask] = color
+        return pixels
+
+
+class DESBruteForceScene(NarratedScene):
+    """Runs a real exhaustive key search over a reduced keyspace and extrapolates to 56 bits
+
+    The counters show this render's own measurements, so no two renders draw
+    the same progress frames: a second pass over the scene (the stitch pass of
+    utils.parallel_render, an ANIM_SEGMENT run) re-renders the animations from
+    the progress bar on instead of reusing their partial movies. The progress
+    takes PROGRESS_STEPS play() calls however fast the search runs, so every
+    pass still agrees on the animation indices.
+    """
+
+    PLAINTEXT = 0x0123456789ABCDEF
+    KEY = 0x133457799BBCDFF1
+    # Key bits the search has to find; the other 56 - UNKNOWN_BITS are given
+    UNKNOWN_BITS = 24
+    BAR_WIDTH = 8.0
+    PROGRESS_STEPS = 12
+    PROGRESS_STEP_SECONDS = 0.5
+
+    def construct(self):
+        # self.set_speech_service(GTTSService())
+        self.set_speech_service(
+            ClientOpenAIService(
+                voice="fable",
+                model="tts-1-hd",
+            )
+        )
+
+        ciphertext = encrypt_block(self.PLAINTEXT, self.KEY)
+        known = FULL_KEY_BITS - self.UNKNOWN_BITS
+
+        title = Text("Brute Force: Trying Every Key", font_size=40, color=RED_D).to_edge(UP)
+        pair = VGroup(
+            Text(f"Plaintext   {self.PLAINTEXT:016X}", font_size=24),
+            Text(f"Ciphertext  {ciphertext:016X}", font_size=24, color=GREEN),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.2).next_to(title, DOWN, buff=0.5)
+
+        with self.voiceover("DES has no known shortcut that beats trying keys in practice. Given one plaintext and its ciphertext, an attacker simply tries every key until one matches."):
+            self.play(Write(title))
+            self.play(FadeIn(pair))
+
+        setup = Text(
+            f"{known} of 56 key bits known: searching 2^{self.UNKNOWN_BITS} = {2 ** self.UNKNOWN_BITS:,} keys",
+            font_size=24, color=YELLOW,
+        ).next_to(pair, DOWN, buff=0.5)
+
+        with self.voiceover(f"We can't wait for all two to the fifty-six keys, so let's give the search {known} of the key bits and have it find the remaining {self.UNKNOWN_BITS}, on every core of the machine rendering this video."):
+            self.play(Write(setup))
+
+        # Live counters, driven by the search's own measurements
+        tested = ValueTracker(0)
+        rate = ValueTracker(0)
+        outline = Rectangle(width=self.BAR_WIDTH, height=0.4, color=WHITE).next_to(setup, DOWN, buff=0.6)
+        fill = Rectangle(width=self.BAR_WIDTH, height=0.4, stroke_width=0).set_fill(RED, opacity=0.8)
+        total = 2 ** self.UNKNOWN_BITS
+
+        def update_fill(bar):
+            bar.stretch_to_fit_width(max(self.BAR_WIDTH * tested.get_value() / total, 1e-3))
+            bar.align_to(outline, LEFT).align_to(outline, UP)
+
+        fill.add_updater(update_fill)
+        tested_number = DecimalNumber(0, num_decimal_places=0, font_size=30)
+        tested_number.add_updater(lambda number: number.set_value(tested.get_value()))
+        rate_number = DecimalNumber(0, num_decimal_places=0, font_size=30, color=YELLOW)
+        rate_number.add_updater(lambda number: number.set_value(rate.get_value()))
+        counters = VGroup(
+            VGroup(Text("keys tried", font_size=22), tested_number).arrange(RIGHT, buff=0.3),
+            VGroup(Text("keys per second", font_size=22), rate_number).arrange(RIGHT, buff=0.3),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.2).next_to(outline, DOWN, buff=0.4)
+        # Measured numbers only ever appear on screen: the narration has to be
+        # the same on every render to hit the voiceover cache.
+        search = KeySearch(self.PLAINTEXT, ciphertext, self.KEY, self.UNKNOWN_BITS)
+        counters.add(Text(f"{search.workers} worker processes", font_size=22, color=GRAY))
+        counters.arrange(DOWN, aligned_edge=LEFT, buff=0.2).next_to(outline, DOWN, buff=0.4)
+
+        self.play(Create(outline), FadeIn(fill), FadeIn(counters))
+
+        search.start()
+        logger.info(f"Key search over 2^{self.UNKNOWN_BITS} keys started with {search.workers} workers")
+        try:
+            with self.voiceover("Here it goes: one process per core, each testing tens of thousands of keys per batch."):
+                for step in range(self.PROGRESS_STEPS):
+                    # Each step animates from the last poll to this one; the
+                    # last waits for the end of the search, however long
+                    if step == self.PROGRESS_STEPS - 1:
+                        while not search.done:
+                            search.poll(timeout=None)
+                    elif not search.done:
+                        search.poll(timeout=self.PROGRESS_STEP_SECONDS)
+                    progress = search.progress()
+                    self.play(
+                        tested.animate.set_value(progress.tested),
+                        rate.animate.set_value(progress.keys_per_second),
+                        run_time=self.PROGRESS_STEP_SECONDS,
+                    )
+        finally:
+            search.close()
+        progress = search.progress()
+        logger.info(
+            f"Key search tried {progress.tested:,} keys in {progress.seconds:.1f}s, "
+            f"{progress.keys_per_second:,.0f} keys/s"
+        )
+        fill.clear_updaters()
+
+        found_text = Text(
+            f"Key found: {progress.found:016X}" if progress.found is not None else "No key found",
+            font_size=28, color=GREEN,
+        )
+        elapsed_text = Text(f"{progress.tested:,} keys in {progress.seconds:.1f} s", font_size=22, color=GRAY)
+        found_text = VGroup(found_text, elapsed_text).arrange(DOWN, buff=0.15).next_to(counters, DOWN, buff=0.4)
+
+        with self.voiceover("Found it. The counters show how many keys that took, and how long."):
+            self.play(
+                tested.animate.set_value(progress.tested),
+                rate.animate.set_value(progress.keys_per_second),
+                Write(found_text),
+            )
+            self.play(Indicate(found_text, color=GREEN))
+
+        full_time = format_duration(progress.seconds_for())
+        extrapolation = MathTex(
+            rf"2^{{56}} \text{{ keys}} \div \text{{{progress.keys_per_second:,.0f} keys/s}} \approx \text{{{full_time}}}",
+            font_size=32, color=YELLOW,
+        ).next_to(found_text, DOWN, buff=0.4)
+
+        with self.voiceover("At the rate we just measured, all two to the fifty-six keys would take this machine this long. That sounds safe, but the search splits perfectly: in 1998 a purpose-built machine did it in days, and today rented hardware does it in hours."):
+            self.play(Write(extrapolation))
+            self.play(Circumscribe(extrapolation, color=YELLOW))
 
 
-class DESMathScene(VoiceoverScene):
+class DESMathScene(NarratedScene):
     """Presents the mathematical formulation of the DES algorithm with concise blocks"""
 
     def keep_and_move_to_top(self, *objects_to_keep, animate_duration=1.0, spacing=0.5):
@@ -1345,7 +2024,7 @@ class DESMathScene(VoiceoverScene):
     def construct(self):
         # self.set_speech_service(GTTSService())
         self.set_speech_service(
-            OpenAIService(
+            ClientOpenAIService(
                 voice="fable",
                 model="tts-1-hd",
             )
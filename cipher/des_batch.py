@@ -0,0 +1,207 @@
+"""
+DES on NumPy arrays of blocks, for statistics over many encryptions.
+
+Blocks, keys and subkeys are ``uint64`` arrays of any shape. Every
+permutation is applied a byte at a time through 256-entry tables, and the
+S-boxes are merged with the P permutation and looked up in pairs through four
+4096-entry tables, so a round costs eight table lookups per block, done for
+all blocks at once:
+
+    subkeys = key_schedule(keys)          # (16, *keys.shape)
+    ciphertexts = encrypt(blocks, subkeys)
+
+The tables are built from ``cipher.des_core``, which stays the reference.
+``avalanche`` uses this to measure how far single-bit changes spread, round
+by round, over about a million encryptions in a few seconds.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from cipher.des_core import ROUNDS, permute
+from cipher.des_tables import E, FP, IP, P, PC1, PC2, SBOXES, SHIFTS
+
+MASK_28 = np.uint64((1 << 28) - 1)
+MASK_32 = np.uint64((1 << 32) - 1)
+
+# Key bits that are not parity bits (the low bit of every byte), MSB first
+KEY_BITS = tuple(bit for bit in range(64) if bit % 8 != 7)
+
+
+def byte_tables(table: Sequence[int], width: int) -> np.ndarray:
+    """Per-input-byte lookup tables of a permutation of ``width`` (a multiple of 8) bits."""
+    tables = np.zeros((width // 8, 256), dtype=np.uint64)
+    for index in range(width // 8):
+        shift = width - 8 * (index + 1)
+        for byte in range(256):
+            tables[index, byte] = permute(byte << shift, table, width)
+    return tables
+
+
+def _lookup(table: np.ndarray, values: np.ndarray, shift: int, mask: int, out: np.ndarray) -> np.ndarray:
+    # table[(values >> shift) & mask], through a reused buffer and without
+    # converting the uint64 indices to intp
+    np.right_shift(values, np.uint64(shift), out=out)
+    np.bitwise_and(out, np.uint64(mask), out=out)
+    return table.take(out.view(np.int64))
+
+
+def apply_tables(values: np.ndarray, tables: np.ndarray, width: int) -> np.ndarray:
+    """Permute ``values`` with tables from ``byte_tables``."""
+    values = np.asarray(values, dtype=np.uint64)
+    result = np.zeros(values.shape, dtype=np.uint64)
+    scratch = np.empty(values.shape, dtype=np.uint64)
+    for index, table in enumerate(tables):
+        result |= _lookup(table, values, width - 8 * (index + 1), 0xFF, scratch)
+    return result
+
+
+def _sp_tables() -> np.ndarray:
+    # S-box b followed by P, for every 6-bit input of box b
+    tables = np.zeros((8, 64), dtype=np.uint64)
+    for box in range(8):
+        for group in range(64):
+            row = ((group >> 4) & 0b10) | (group & 1)
+            column = (group >> 1) & 0xF
+            tables[box, group] = permute(SBOXES[box][row][column] << (28 - 4 * box), P, 32)
+    return tables
+
+
+def _sp_pair_tables(tables: np.ndarray) -> np.ndarray:
+    # S-boxes 2p and 2p + 1 followed by P, for every 12-bit input of the pair
+    index = np.arange(1 << 12)
+    return np.stack([tables[2 * pair][index >> 6] | tables[2 * pair + 1][index & 0x3F] for pair in range(4)])
+
+
+IP_TABLES = byte_tables(IP, 64)
+FP_TABLES = byte_tables(FP, 64)
+E_TABLES = byte_tables(E, 32)
+PC1_TABLES = byte_tables(PC1, 64)
+PC2_TABLES = byte_tables(PC2, 56)
+SP_TABLES = _sp_tables()
+SP_PAIR_TABLES = _sp_pair_tables(SP_TABLES)
+
+
+def _rotate_left(values: np.ndarray, shift: int) -> np.ndarray:
+    return ((values << np.uint64(shift)) | (values >> np.uint64(28 - shift))) & MASK_28
+
+
+def key_schedule(keys) -> np.ndarray:
+    """The sixteen subkeys of every key, shape ``(16, *keys.shape)``."""
+    keys = np.asarray(keys, dtype=np.uint64)
+    permuted = apply_tables(keys, PC1_TABLES, 64)
+    c, d = permuted >> np.uint64(28), permuted & MASK_28
+    subkeys = np.empty((ROUNDS,) + keys.shape, dtype=np.uint64)
+    for number, shift in enumerate(SHIFTS):
+        c, d = _rotate_left(c, shift), _rotate_left(d, shift)
+        subkeys[number] = apply_tables((c << np.uint64(28)) | d, PC2_TABLES, 56)
+    return subkeys
+
+
+def feistel(right: np.ndarray, subkey: np.ndarray) -> np.ndarray:
+    """F(R, K) of every block."""
+    mixed = apply_tables(right, E_TABLES, 32) ^ subkey
+    result = np.zeros(mixed.shape, dtype=np.uint64)
+    scratch = np.empty(mixed.shape, dtype=np.uint64)
+    for pair, table in enumerate(SP_PAIR_TABLES):
+        result |= _lookup(table, mixed, 36 - 12 * pair, 0xFFF, scratch)
+    return result
+
+
+def iter_rounds(blocks, subkeys: np.ndarray) -> Iterator[np.ndarray]:
+    """
+    The state ``L_i || R_i`` after the initial permutation and after every round.
+
+    ``subkeys`` has one entry per round, each broadcasting against ``blocks``.
+    """
+    permuted = apply_tables(np.asarray(blocks, dtype=np.uint64), IP_TABLES, 64)
+    left, right = permuted >> np.uint64(32), permuted & MASK_32
+    yield permuted
+    for subkey in subkeys:
+        left, right = right, left ^ feistel(right, subkey)
+        yield (left << np.uint64(32)) | right
+
+
+def encrypt(blocks, subkeys: np.ndarray) -> np.ndarray:
+    """Encrypt every block; pass the subkeys reversed to decrypt."""
+    for state in iter_rounds(blocks, subkeys):
+        pass
+    # The last round is not followed by a swap.
+    swapped = (state << np.uint64(32)) | (state >> np.uint64(32))
+    return apply_tables(swapped, FP_TABLES, 64)
+
+
+def decrypt(blocks, subkeys: np.ndarray) -> np.ndarray:
+    return encrypt(blocks, subkeys[::-1])
+
+
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """Number of set bits of every ``uint64``."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(values)
+    counts = _BYTE_POPCOUNT[np.ascontiguousarray(values).view(np.uint8)]
+    return counts.reshape(values.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class AvalancheStats:
+    """
+    Hamming distances between the states of related encryptions.
+
+    ``plaintext[i, d]`` counts the pairs whose state after round ``i`` (0 is
+    the initial permutation) differs in ``d`` bits when one plaintext bit is
+    flipped; ``key`` is the same for one flipped (non-parity) key bit.
+    """
+
+    samples: int
+    plaintext: np.ndarray   # (ROUNDS + 1, 65)
+    key: np.ndarray         # (ROUNDS + 1, 65)
+
+    @property
+    def encryptions(self) -> int:
+        return self.samples * (1 + 64 + len(KEY_BITS))
+
+    @staticmethod
+    def means(histograms: np.ndarray) -> np.ndarray:
+        """Mean distance per round."""
+        return histograms @ np.arange(65) / histograms.sum(axis=1)
+
+
+def _distance_histograms(baseline: Iterator[np.ndarray], flipped: Iterator[np.ndarray]) -> np.ndarray:
+    histograms = np.zeros((ROUNDS + 1, 65), dtype=np.int64)
+    for number, (state, other) in enumerate(zip(baseline, flipped)):
+        histograms[number] = np.bincount(popcount(state ^ other).ravel(), minlength=65)
+    return histograms
+
+
+def avalanche(samples: int = 1 << 14, seed: int = 0) -> AvalancheStats:
+    """
+    Flip every plaintext bit and every key bit of ``samples`` random
+    plaintext/key pairs and histogram the round-by-round differences.
+    """
+    rng = np.random.default_rng(seed)
+    plaintexts = rng.integers(0, 1 << 64, size=samples, dtype=np.uint64)
+    keys = rng.integers(0, 1 << 64, size=samples, dtype=np.uint64)
+    subkeys = key_schedule(keys)
+
+    bits = np.uint64(1) << np.arange(63, -1, -1, dtype=np.uint64)[:, None]
+    plaintext = _distance_histograms(
+        iter_rounds(plaintexts, subkeys),
+        iter_rounds(plaintexts ^ bits, subkeys[:, None, :]),
+    )
+
+    # The key schedule only selects and rotates bits, so it is linear over
+    # XOR: the subkeys of keys ^ bit are the subkeys of keys ^ those of bit.
+    key_bits = bits[list(KEY_BITS)]
+    key = _distance_histograms(
+        iter_rounds(plaintexts, subkeys),
+        # Broadcast the plaintexts too, so the state before round 1 counts every pair
+        iter_rounds(np.broadcast_to(plaintexts, key_bits.shape[:1] + plaintexts.shape),
+                    subkeys[:, None, :] ^ key_schedule(key_bits)),
+    )
+    return AvalancheStats(samples, plaintext, key)
@@ -0,0 +1,175 @@
+"""
+Reference DES on Python integers, with a per-round trace for the scenes.
+
+Blocks, keys and intermediate values are plain ints, most significant bit
+first as in the standard. ``trace_encryption`` records every intermediate
+value of every round once, so a scene can show any round with real numbers
+without recomputing the cipher:
+
+    trace = trace_encryption(0x0123456789ABCDEF, 0x133457799BBCDFF1)
+    trace.rounds[0].subkey      # K1
+    trace.ciphertext            # 0x85E813540F0AB405
+
+``expand_key`` does the same for the key schedule: every ``C_i``, ``D_i``
+and ``K_i``, plus which bit moved where in each round.
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from cipher.des_tables import E, FP, IP, P, PC1, PC2, SBOXES, SHIFTS
+
+ROUNDS = 16
+
+
+def permute(value: int, table: Sequence[int], width: int) -> int:
+    """Apply a DES permutation table to the ``width``-bit ``value``."""
+    result = 0
+    for position in table:
+        result = (result << 1) | ((value >> (width - position)) & 1)
+    return result
+
+
+def rotate_left(value: int, shift: int, width: int = 28) -> int:
+    mask = (1 << width) - 1
+    return ((value << shift) | (value >> (width - shift))) & mask
+
+
+def to_bits(value: int, width: int) -> str:
+    """``value`` as a string of ``width`` binary digits."""
+    return format(value, f"0{width}b")
+
+
+@dataclass(frozen=True)
+class KeySchedule:
+    """
+    Every intermediate value of the key schedule, and where each bit comes from.
+
+    Index ``i`` of ``c`` and ``d`` is ``C_i``/``D_i`` (0 is straight out of
+    PC-1); ``subkeys[i - 1]`` is ``K_i``. Bit positions are 0-based from the
+    most significant bit, in ``C_i || D_i`` (56 bits), ``K_i`` (48 bits) or
+    the key (64 bits).
+    """
+
+    key: int
+    c: Tuple[int, ...]
+    d: Tuple[int, ...]
+    subkeys: Tuple[int, ...]
+
+    def cd(self, number: int) -> int:
+        """``C_i || D_i``."""
+        return (self.c[number] << 28) | self.d[number]
+
+    def rotation_sources(self, number: int) -> Tuple[int, ...]:
+        """For every bit of ``C_i || D_i``, its position in ``C_{i-1} || D_{i-1}``."""
+        shift = SHIFTS[number - 1]
+        return tuple(half + (position + shift) % 28 for half in (0, 28) for position in range(28))
+
+    @staticmethod
+    def subkey_sources() -> Tuple[int, ...]:
+        """For every bit of a subkey, its position in ``C_i || D_i`` (PC-2)."""
+        return tuple(position - 1 for position in PC2)
+
+    def key_sources(self, number: int) -> Tuple[int, ...]:
+        """For every bit of ``K_i``, the key bit it ends up being."""
+        offset = sum(SHIFTS[:number])
+        return tuple(
+            PC1[(position // 28) * 28 + (position % 28 + offset) % 28] - 1 for position in self.subkey_sources()
+        )
+
+    def changed_bits(self, number: int) -> Tuple[int, ...]:
+        """Positions of ``C_i || D_i`` whose value differs from ``C_{i-1} || D_{i-1}``."""
+        changed = self.cd(number) ^ self.cd(number - 1)
+        return tuple(position for position in range(56) if changed >> (55 - position) & 1)
+
+
+def expand_key(key: int) -> KeySchedule:
+    """Run the key schedule of a 64-bit key once, keeping every round."""
+    permuted = permute(key, PC1, 64)
+    c, d = [permuted >> 28], [permuted & 0xFFFFFFF]
+    subkeys = []
+    for shift in SHIFTS:
+        c.append(rotate_left(c[-1], shift))
+        d.append(rotate_left(d[-1], shift))
+        subkeys.append(permute((c[-1] << 28) | d[-1], PC2, 56))
+    return KeySchedule(key, tuple(c), tuple(d), tuple(subkeys))
+
+
+def key_schedule(key: int) -> List[int]:
+    """The sixteen 48-bit round subkeys of a 64-bit key."""
+    return list(expand_key(key).subkeys)
+
+
+def substitute(value: int) -> int:
+    """Run the 48-bit ``value`` through the eight S-boxes (48 -> 32 bits)."""
+    result = 0
+    for box in range(8):
+        group = (value >> (42 - 6 * box)) & 0x3F
+        row = ((group >> 4) & 0b10) | (group & 1)
+        column = (group >> 1) & 0xF
+        result = (result << 4) | SBOXES[box][row][column]
+    return result
+
+
+def feistel(right: int, subkey: int) -> int:
+    """The round function F(R, K) = P(S(E(R) xor K))."""
+    return permute(substitute(permute(right, E, 32) ^ subkey), P, 32)
+
+
+@dataclass(frozen=True)
+class RoundTrace:
+    """Every intermediate value of one round."""
+
+    number: int        # 1-based round number
+    left: int          # L_{i-1}
+    right: int         # R_{i-1}
+    subkey: int        # K_i
+    expanded: int      # E(R_{i-1})
+    mixed: int         # E(R_{i-1}) xor K_i
+    substituted: int   # S(E(R_{i-1}) xor K_i)
+    f_output: int      # F(R_{i-1}, K_i)
+    new_left: int      # L_i = R_{i-1}
+    new_right: int     # R_i = L_{i-1} xor F(R_{i-1}, K_i)
+
+
+@dataclass(frozen=True)
+class DESTrace:
+    """A whole encryption: the initial permutation, 16 rounds and the output."""
+
+    plaintext: int
+    key: int
+    permuted: int              # IP(plaintext) = L_0 || R_0
+    rounds: Tuple[RoundTrace, ...]
+    preoutput: int             # R_16 || L_16
+    ciphertext: int
+
+
+def trace_encryption(plaintext: int, key: int, subkeys: Sequence[int] = None) -> DESTrace:
+    """Encrypt one block, recording every round."""
+    if subkeys is None:
+        subkeys = key_schedule(key)
+    permuted = permute(plaintext, IP, 64)
+    left, right = permuted >> 32, permuted & 0xFFFFFFFF
+
+    rounds = []
+    for number, subkey in enumerate(subkeys, start=1):
+        expanded = permute(right, E, 32)
+        mixed = expanded ^ subkey
+        substituted = substitute(mixed)
+        f_output = permute(substituted, P, 32)
+        new_left, new_right = right, left ^ f_output
+        rounds.append(RoundTrace(
+            number, left, right, subkey, expanded, mixed, substituted, f_output, new_left, new_right,
+        ))
+        left, right = new_left, new_right
+
+    preoutput = (right << 32) | left
+    return DESTrace(plaintext, key, permuted, tuple(rounds), preoutput, permute(preoutput, FP, 64))
+
+
+def encrypt_block(block: int, key: int) -> int:
+    return trace_encryption(block, key).ciphertext
+
+
+def decrypt_block(block: int, key: int) -> int:
+    return trace_encryption(block, key, key_schedule(key)[::-1]).ciphertext
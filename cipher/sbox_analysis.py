@@ -0,0 +1,50 @@
+"""
+Difference distribution and linear approximation tables of the DES S-boxes.
+
+Both are computed for all eight boxes at once over every input (pair) with
+NumPy, indexed the way the cryptanalysis literature prints them:
+
+    ddt = difference_distribution_tables()   # (8, 64, 16)
+    ddt[box, dx, dy]    # inputs x with S(x) ^ S(x ^ dx) == dy
+    lat = linear_approximation_tables()      # (8, 64, 16)
+    lat[box, a, b]      # inputs x with a.x == b.S(x), minus 32
+
+The input of a box is its 6-bit group as it leaves the key XOR, so the outer
+bits pick the row and the middle four the column, as in ``des_core``.
+"""
+
+import numpy as np
+
+from cipher.des_tables import SBOXES
+
+_INPUTS = np.arange(64)
+_PARITY = np.array([bin(value).count("1") & 1 for value in range(64)], dtype=np.uint8)
+
+
+def sbox_arrays() -> np.ndarray:
+    """Output of every box for every 6-bit input, shape ``(8, 64)``."""
+    rows = ((_INPUTS >> 4) & 0b10) | (_INPUTS & 1)
+    columns = (_INPUTS >> 1) & 0xF
+    return np.array(SBOXES, dtype=np.uint8)[:, rows, columns]
+
+
+def difference_distribution_tables(sboxes: np.ndarray = None) -> np.ndarray:
+    """Count of output differences for every input difference, shape ``(8, 64, 16)``."""
+    if sboxes is None:
+        sboxes = sbox_arrays()
+    # out[box, dx, x] = S(x) ^ S(x ^ dx)
+    pairs = _INPUTS[None, :] ^ _INPUTS[:, None]
+    out = sboxes[:, None, :] ^ sboxes[:, pairs]
+    index = (np.arange(len(sboxes))[:, None, None] * 64 + _INPUTS[None, :, None]) * 16 + out
+    return np.bincount(index.ravel(), minlength=len(sboxes) * 64 * 16).reshape(len(sboxes), 64, 16)
+
+
+def linear_approximation_tables(sboxes: np.ndarray = None) -> np.ndarray:
+    """Bias of every linear approximation in inputs out of 64, shape ``(8, 64, 16)``."""
+    if sboxes is None:
+        sboxes = sbox_arrays()
+    # in_parity[a, x] = a.x; out_parity[box, b, x] = b.S(x)
+    in_parity = _PARITY[_INPUTS[:, None] & _INPUTS[None, :]]
+    out_parity = _PARITY[np.arange(16)[None, :, None] & sboxes[:, None, :]]
+    agree = (in_parity[None, :, None, :] == out_parity[:, None, :, :]).sum(axis=-1)
+    return agree - 32
@@ -0,0 +1,138 @@
+"""Header-probed clip durations against the decoded length."""
+
+import wave
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+av = pytest.importorskip("av")
+pytest.importorskip("manim.scene")
+
+from utils.audio_probe import _id3v2_size, _parse_mp3_header, cached_duration, probe_duration  # noqa: E402
+
+SECONDS = 1.7
+
+
+def decoded_duration(path):
+    with av.open(str(path)) as container:
+        stream = container.streams.audio[0]
+        return sum(frame.samples for frame in container.decode(stream)) / stream.rate
+
+
+def write_wav(path, rate=22050, channels=1, seconds=SECONDS, extra_chunk=b""):
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(channels)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(np.zeros(int(seconds * rate) * channels, dtype=np.int16).tobytes())
+    if extra_chunk:
+        # An odd-sized chunk between fmt and data, padded to an even size
+        data = path.read_bytes()
+        chunk = b"LIST" + len(extra_chunk).to_bytes(4, "little") + extra_chunk + b"\0" * (len(extra_chunk) % 2)
+        data = data[:36] + chunk + data[36:]
+        path.write_bytes(data[:4] + (len(data) - 8).to_bytes(4, "little") + data[8:])
+    return path
+
+
+def write_mp3(path, rate=24000, layout="mono", bit_rate=64000, vbr=False, info_tag=True):
+    options = {} if info_tag else {"write_xing": "0"}
+    with av.open(str(path), "w", format="mp3", options=options) as container:
+        stream = container.add_stream("libmp3lame", rate=rate, layout=layout)
+        if vbr:
+            stream.codec_context.qscale = True
+            stream.codec_context.options = {"q": "4"}
+        else:
+            stream.bit_rate = bit_rate
+        samples = int(SECONDS * rate)
+        t = np.arange(samples, dtype=np.float32)
+        signal = (0.3 * np.sin(t * 0.07) * np.sin(t * 0.0003)).astype(np.float32)
+        channels = 1 if layout == "mono" else 2
+        for start in range(0, samples, 1152):
+            chunk = np.ascontiguousarray(np.tile(signal[start:start + 1152], (channels, 1)))
+            frame = av.AudioFrame.from_ndarray(chunk, format="fltp", layout=layout)
+            frame.sample_rate = rate
+            frame.pts = start
+            frame.time_base = Fraction(1, rate)
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return path
+
+
+def audio_frames(path):
+    """The MPEG audio frames of ``path``, after its ID3v2 tag."""
+    data = path.read_bytes()
+    return data[_id3v2_size(data):]
+
+
+def with_vbri_frame(source, path):
+    """``source`` (an MP3 without a Xing tag) behind a VBRI tag frame counting its frames."""
+    data = audio_frames(source)
+    first = _parse_mp3_header(data[:4])
+    frames, position = 0, 0
+    while position + 4 <= len(data):
+        frame = _parse_mp3_header(data[position:position + 4])
+        assert frame is not None
+        frames += 1
+        position += frame["frame_length"]
+    tag = bytearray(first["frame_length"])
+    tag[:4] = data[:4]
+    vbri = b"VBRI" + (1).to_bytes(2, "big") + bytes(4) + len(data).to_bytes(4, "big") + frames.to_bytes(4, "big")
+    tag[36:36 + len(vbri)] = vbri
+    path.write_bytes(bytes(tag) + data)
+    return path
+
+
+@pytest.mark.parametrize("rate, channels, extra_chunk", [
+    (22050, 1, b""),
+    (48000, 2, b""),
+    (44100, 1, b"INFOodd"),
+])
+def test_wav_matches_decoded_length(tmp_path, rate, channels, extra_chunk):
+    path = write_wav(tmp_path / "clip.wav", rate, channels, extra_chunk=extra_chunk)
+    assert probe_duration(path) == pytest.approx(decoded_duration(path), abs=1 / rate)
+
+
+@pytest.mark.parametrize("kwargs", [
+    pytest.param({}, id="info-tag"),
+    pytest.param({"rate": 44100, "layout": "stereo", "bit_rate": 128000}, id="mpeg1-stereo"),
+    pytest.param({"vbr": True}, id="xing-vbr"),
+    pytest.param({"info_tag": False}, id="cbr"),
+    pytest.param({"rate": 16000, "bit_rate": 32000, "info_tag": False}, id="cbr-16k"),
+])
+def test_mp3_matches_decoded_length(tmp_path, kwargs):
+    path = write_mp3(tmp_path / "clip.mp3", **kwargs)
+    frame = _parse_mp3_header(audio_frames(path)[:4])
+    one_frame = frame["samples_per_frame"] / frame["sample_rate"]
+    assert probe_duration(path) == pytest.approx(decoded_duration(path), abs=one_frame)
+
+
+def test_vbri_frame_count(tmp_path):
+    source = write_mp3(tmp_path / "cbr.mp3", info_tag=False)
+    path = with_vbri_frame(source, tmp_path / "clip.mp3")
+    # The CBR fallback would count the tag frame too
+    assert probe_duration(path) == pytest.approx(decoded_duration(path), abs=1 / 24000)
+
+
+@pytest.mark.parametrize("content", [
+    pytest.param(b"RIFF\x10\0\0\0WAVEfmt ", id="truncated-wav"),
+    pytest.param(np.random.default_rng(3).integers(0, 256, 4096, dtype=np.uint8).tobytes(), id="garbage"),
+])
+def test_unreadable_headers_raise(tmp_path, content):
+    path = tmp_path / "clip.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        probe_duration(path)
+
+
+def test_unprobeable_clip_is_decoded(tmp_path):
+    pytest.importorskip("manim_voiceover")
+    # More junk than the probe reads before the first frame
+    clip = write_mp3(tmp_path / "clip.mp3")
+    path = tmp_path / "junk.mp3"
+    path.write_bytes(bytes(70 * 1024) + clip.read_bytes())
+    with pytest.raises(ValueError):
+        probe_duration(path)
+    assert cached_duration(path) == pytest.approx(SECONDS, abs=0.1)
@@ -0,0 +1,92 @@
+"""Batch arc-length sampling and splitting of cubic Beziers."""
+
+import numpy as np
+import pytest
+
+from utils.bezier import ArcLengthTable, arc_length_table, bezier_points, partial_curves
+
+
+def wires():
+    """Three single-cubic paths shaped like permutation wires, and an S-bend."""
+    starts = np.array([[-3.0, 2, 0], [0, 2, 0], [2.5, 2, 0], [-1, 1, 0]])
+    ends = np.array([[1.0, -2, 0], [-2, -2, 0], [2.5, -2, 0], [1, -1, 0]])
+    drop = (starts[:, 1] - ends[:, 1])[:, None] * 0.5 * np.array([0, 1, 0])
+    return np.stack([starts, starts - drop, ends + drop, ends], axis=1)
+
+
+def chain():
+    """One path of two joined cubics, ``(1, 2, 4, 3)``."""
+    first = np.array([[0.0, 0, 0], [1, 2, 0], [2, -1, 0], [3, 0, 0]])
+    second = np.array([[3.0, 0, 0], [3.5, 1, 0], [5, 1, 0], [5, -1, 0]])
+    return np.stack([first, second])[None]
+
+
+def brute_force_point(segments, proportion, samples=200_001):
+    """The point at ``proportion`` of a path's length, from a dense polyline."""
+    points = bezier_points(segments[:, None], np.linspace(0, 1, samples)).reshape(-1, 3)
+    lengths = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+    return np.array([np.interp(proportion * lengths[-1], lengths, points[:, axis]) for axis in range(3)])
+
+
+@pytest.mark.parametrize("curves", [wires(), chain()], ids=["cubics", "chain"])
+def test_points_match_brute_force_arc_length(curves):
+    table = ArcLengthTable(curves, resolution=1024)
+    paths = curves if curves.ndim == 4 else curves[:, None]
+    for proportion in (0, 0.5, 1):
+        expected = np.array([brute_force_point(path, proportion) for path in paths])
+        assert np.allclose(table.points(proportion), expected, atol=1e-6)
+
+
+def test_ends_are_the_anchors():
+    curves = wires()
+    table = ArcLengthTable(curves)
+    assert np.allclose(table.points(0), curves[:, 0])
+    assert np.allclose(table.points(1), curves[:, 3])
+    # Proportions outside [0, 1] stay at the ends.
+    assert np.allclose(table.points(1.5), curves[:, 3])
+
+
+def test_zero_length_path():
+    curves = np.concatenate([wires()[:1], np.full((1, 4, 3), 2.0)])
+    points = ArcLengthTable(curves).points(np.linspace(0, 1, 5))
+    assert np.isfinite(points).all()
+    assert np.allclose(points[1], 2.0)
+
+
+def test_sample_shapes():
+    curves = wires()
+    table = ArcLengthTable(curves)
+    proportions = np.linspace(0, 1, 7)
+    assert table.points(0.3).shape == (4, 3)
+    shared = table.points(proportions)
+    assert shared.shape == (4, 7, 3)
+
+    # (paths, samples): each path its own proportions
+    own = np.random.default_rng(0).random((4, 7))
+    points = table.points(own)
+    assert points.shape == (4, 7, 3)
+    for path in range(4):
+        for sample in range(7):
+            assert np.allclose(points[path, sample], table.points(own[path, sample])[path])
+
+
+def test_tables_are_cached_by_control_points():
+    curves = wires()
+    assert arc_length_table(curves) is arc_length_table(curves.copy())
+    assert arc_length_table(curves) is not arc_length_table(curves + 1)
+
+
+@pytest.mark.parametrize("t", [0.0, 0.3, 1.0])
+def test_partial_curves_follow_the_curve(t):
+    curves = np.concatenate([wires(), chain()[0]])
+    part = partial_curves(curves, t)
+    assert part.shape == curves.shape
+    for s in np.linspace(0, 1, 11):
+        assert np.allclose(bezier_points(part, s), bezier_points(curves, t * s))
+
+
+def test_partial_curves_per_curve_parameters():
+    curves = wires()
+    t = np.array([0.1, 0.5, 0.9, 1.0])
+    part = partial_curves(curves, t)
+    assert np.allclose(bezier_points(part, 0.5), bezier_points(curves, t * 0.5))
@@ -0,0 +1,56 @@
+"""Reduced-keyspace key search against keys encrypted with the reference DES."""
+
+import numpy as np
+import pytest
+
+from cipher import brute_force
+from cipher.brute_force import FULL_KEY_BITS, KeySearch, spread, unknown_positions
+from cipher.des_core import encrypt_block
+
+PLAINTEXT = 0x0123456789ABCDEF
+KEY = 0x133457799BBCDFF1
+CIPHERTEXT = encrypt_block(PLAINTEXT, KEY)
+# The least significant bit of every key byte
+PARITY_BITS = 0x0101010101010101
+
+
+def test_unknown_positions_skip_parity_bits():
+    positions = unknown_positions(FULL_KEY_BITS)
+    assert len(set(positions)) == FULL_KEY_BITS
+    assert not any(PARITY_BITS >> position & 1 for position in positions)
+    # The lowest unknown bits come first.
+    assert unknown_positions(12) == positions[:12] == sorted(positions)[:12]
+
+
+def test_spread_never_sets_parity_bits():
+    positions = unknown_positions(FULL_KEY_BITS)
+    keys = spread(np.array([(1 << FULL_KEY_BITS) - 1, 0x5A5A5A5A5A5A5A, 1], dtype=np.uint64), positions)
+    assert int(keys[0]) == ~PARITY_BITS & (1 << 64) - 1
+    assert all(int(key) & PARITY_BITS == 0 for key in keys)
+    assert int(keys[2]) == 1 << positions[0]
+
+
+def run(search):
+    progress = None
+    for progress in search.run():
+        pass
+    return progress
+
+
+def test_finds_the_key():
+    # Any value of the unknown bits in the known key: they are cleared
+    progress = run(KeySearch(PLAINTEXT, CIPHERTEXT, KEY ^ 0x0E, unknown_bits=12, workers=2))
+    assert progress.found == KEY
+    assert 0 < progress.tested <= progress.total == 1 << 12
+    assert progress.keys_per_second > 0
+
+
+def test_tries_every_key_without_stopping(monkeypatch):
+    # Small chunks, so the two workers share sixteen of them
+    monkeypatch.setattr(brute_force, "CHUNK_BITS", 8)
+    search = KeySearch(PLAINTEXT, CIPHERTEXT, KEY, unknown_bits=12, workers=2, stop_on_match=False)
+    assert search.chunks == 16
+    progress = run(search)
+    assert progress.found == KEY
+    assert progress.tested == progress.total == 1 << 12
+    assert search.done
@@ -0,0 +1,101 @@
+"""Reference and batch DES against published known-answer vectors and each other."""
+
+import numpy as np
+import pytest
+
+from cipher import des_batch
+from cipher.des_core import ROUNDS, decrypt_block, encrypt_block, expand_key, key_schedule, trace_encryption
+
+# (key, plaintext, ciphertext) from FIPS 46 worked examples and NBS SP 500-20
+VECTORS = [
+    (0x133457799BBCDFF1, 0x0123456789ABCDEF, 0x85E813540F0AB405),
+    (0x0E329232EA6D0D73, 0x8787878787878787, 0x0000000000000000),
+    (0x0123456789ABCDEF, 0x4E6F772069732074, 0x3FA40E8A984D4815),
+    # Variable plaintext
+    (0x0101010101010101, 0x8000000000000000, 0x95F8A5E5DD31D900),
+    (0x0101010101010101, 0x4000000000000000, 0xDD7F121CA5015619),
+    # Variable key
+    (0x8001010101010101, 0x0000000000000000, 0x95A8D72813DAA94D),
+    # Permutation operation
+    (0x1046913489980131, 0x0000000000000000, 0x88D55E54F54C97B4),
+]
+
+
+@pytest.fixture(scope="module")
+def random_pairs():
+    rng = np.random.default_rng(1)
+    keys = rng.integers(0, 1 << 64, size=256, dtype=np.uint64)
+    blocks = rng.integers(0, 1 << 64, size=256, dtype=np.uint64)
+    return keys, blocks
+
+
+@pytest.mark.parametrize("key, plaintext, ciphertext", VECTORS)
+def test_reference_known_answers(key, plaintext, ciphertext):
+    assert encrypt_block(plaintext, key) == ciphertext
+    assert decrypt_block(ciphertext, key) == plaintext
+
+
+def test_key_schedule_known_answers():
+    subkeys = key_schedule(0x133457799BBCDFF1)
+    assert subkeys[0] == 0x1B02EFFC7072
+    assert subkeys[15] == 0xCB3D8B0E17F5
+
+    schedule = expand_key(0x133457799BBCDFF1)
+    assert schedule.cd(0) == 0xF0CCAAF556678F
+    # The shifts add up to 28: the halves come back where they started.
+    assert schedule.cd(16) == schedule.cd(0)
+
+
+def test_trace_matches_encryption():
+    key, plaintext, ciphertext = VECTORS[0]
+    trace = trace_encryption(plaintext, key)
+    assert trace.ciphertext == ciphertext
+    assert [round_.subkey for round_ in trace.rounds] == key_schedule(key)
+
+
+@pytest.mark.parametrize("key, plaintext, ciphertext", VECTORS)
+def test_batch_known_answers(key, plaintext, ciphertext):
+    subkeys = des_batch.key_schedule(np.array([key], dtype=np.uint64))
+    blocks = np.array([plaintext], dtype=np.uint64)
+    assert int(des_batch.encrypt(blocks, subkeys)[0]) == ciphertext
+    assert int(des_batch.decrypt(np.array([ciphertext], dtype=np.uint64), subkeys)[0]) == plaintext
+
+
+def test_batch_key_schedule_matches_reference(random_pairs):
+    keys, _ = random_pairs
+    subkeys = des_batch.key_schedule(keys)
+    assert subkeys.shape == (16, len(keys))
+    for index in range(0, len(keys), 17):
+        assert subkeys[:, index].tolist() == key_schedule(int(keys[index]))
+
+
+def test_batch_matches_reference(random_pairs):
+    keys, blocks = random_pairs
+    ciphertexts = des_batch.encrypt(blocks, des_batch.key_schedule(keys))
+    expected = [encrypt_block(int(block), int(key)) for block, key in zip(blocks, keys)]
+    assert ciphertexts.tolist() == expected
+
+
+def test_batch_round_trip(random_pairs):
+    keys, blocks = random_pairs
+    subkeys = des_batch.key_schedule(keys)
+    assert np.array_equal(des_batch.decrypt(des_batch.encrypt(blocks, subkeys), subkeys), blocks)
+
+
+def test_reference_round_trip(random_pairs):
+    keys, blocks = random_pairs
+    for key, block in zip(keys[:32].tolist(), blocks[:32].tolist()):
+        assert decrypt_block(encrypt_block(block, key), key) == block
+
+
+def test_avalanche_settles_at_half_the_bits():
+    stats = des_batch.avalanche(samples=1 << 10, seed=0)
+    assert stats.plaintext.sum(axis=1).tolist() == [stats.samples * 64] * 17
+    assert stats.key.sum(axis=1).tolist() == [stats.samples * 56] * 17
+    for histograms in (stats.plaintext, stats.key):
+        means = des_batch.AvalancheStats.means(histograms)
+        # One round barely spreads a difference; after sixteen, about half the bits differ.
+        assert means[1] < 8
+        assert means[ROUNDS] == pytest.approx(32, abs=0.25)
+    # The initial permutation moves a flipped plaintext bit but doesn't spread it.
+    assert stats.plaintext[0, 1] == stats.samples * 64
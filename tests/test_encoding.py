@@ -0,0 +1,93 @@
+"""Partial movies written with FrameHoldEncoder, muxed with an audio track."""
+
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+av = pytest.importorskip("av")
+
+from utils.encoding import FrameHoldEncoder, decode_time, interleave_packets, open_partial_movie  # noqa: E402
+
+RATE = 30
+SAMPLE_RATE = 48000
+# Longer than the muxer's own interleaving window (max_interleave_delta, 10 s)
+SECONDS = 12
+
+
+@pytest.fixture
+def partial_movie(tmp_path):
+    path = tmp_path / "partial.mp4"
+    settings = {
+        "codec": "libx264", "pix_fmt": "yuv420p", "options": {"crf": "23"},
+        "rate": RATE, "width": 64, "height": 64,
+    }
+    container, stream = open_partial_movie(str(path), settings)
+    encoder = FrameHoldEncoder(container, stream, Fraction(1, RATE))
+    for second in range(SECONDS):
+        for index in range(RATE // 2):
+            frame = np.full((64, 64, 4), 255, dtype=np.uint8)
+            frame[:, :, :3] = (second * 80 + index * 5) % 256
+            encoder.write(frame)
+        # Half a second held, which leaves a gap in the timestamps
+        encoder.repeat(RATE // 2)
+    encoder.flush()
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+    return path
+
+
+def tone(stream):
+    """Encode SECONDS of a sine tone with ``stream``'s encoder."""
+    samples = np.sin(np.arange(SECONDS * SAMPLE_RATE, dtype=np.float32) * 0.05).astype(np.float32)
+    for start in range(0, len(samples), 1024):
+        frame = av.AudioFrame.from_ndarray(samples[None, start:start + 1024], format="flt", layout="mono")
+        frame.sample_rate = SAMPLE_RATE
+        frame.pts = start
+        frame.time_base = Fraction(1, SAMPLE_RATE)
+        yield from stream.encode(frame)
+    yield from stream.encode()
+
+
+def mux_with_tone(partial_movie, output_path):
+    with av.open(str(partial_movie)) as source, av.open(str(output_path), mode="w") as output:
+        video_stream = output.add_stream(template=source.streams.video[0])
+        audio_stream = output.add_stream("aac", rate=SAMPLE_RATE, layout="mono")
+        video_packets = (packet for packet in source.demux(source.streams.video[0]) if packet.dts is not None)
+        muxed = []
+        for packet in interleave_packets(video_packets, tone(audio_stream)):
+            muxed.append((packet.stream.type, decode_time(packet)))
+            if packet.stream.type == "video":
+                packet.stream = video_stream
+            output.mux(packet)
+    return muxed
+
+
+def test_packets_are_merged_in_decode_time_order(partial_movie, tmp_path):
+    muxed = mux_with_tone(partial_movie, tmp_path / "movie.mp4")
+    times = [time for _, time in muxed]
+    assert times == sorted(times)
+    assert {kind for kind, _ in muxed} == {"video", "audio"}
+
+
+def test_movie_file_is_interleaved(partial_movie, tmp_path):
+    output_path = tmp_path / "movie.mp4"
+    mux_with_tone(partial_movie, output_path)
+
+    with av.open(str(output_path)) as movie:
+        order = [
+            (packet.stream.type, decode_time(packet))
+            for packet in movie.demux()
+            if packet.dts is not None
+        ]
+    assert {kind for kind, _ in order} == {"video", "audio"}
+    # Read front to back, neither stream runs far ahead of the other: the
+    # file switches streams many times instead of once.
+    switches = sum(1 for previous, current in zip(order, order[1:]) if previous[0] != current[0])
+    assert switches > 2 * SECONDS
+    latest = {}
+    for kind, time in order:
+        latest[kind] = time
+        if len(latest) == 2:
+            assert abs(latest["video"] - latest["audio"]) < 1
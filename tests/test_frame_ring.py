@@ -0,0 +1,124 @@
+"""The shared-memory frame ring and its encoder processes."""
+
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+av = pytest.importorskip("av")
+
+from utils.frame_ring import FrameRing  # noqa: E402
+
+RATE = 30
+SHAPE = (64, 64, 4)
+
+
+def settings(**overrides):
+    return {
+        "codec": "libx264", "pix_fmt": "yuv420p", "options": {"crf": "23"},
+        "rate": RATE, "width": SHAPE[1], "height": SHAPE[0], "vfr_holds": True,
+        **overrides,
+    }
+
+
+def draw(slot, value):
+    slot[:] = value
+    slot[:, :, 3] = 255
+    return slot
+
+
+def read_movie(path):
+    """(frame index, keyframe) of each packet by presentation time, and the number of decoded frames."""
+    with av.open(str(path)) as movie:
+        stream = movie.streams.video[0]
+        packets = [packet for packet in movie.demux(stream) if packet.pts is not None]
+        presented = sorted((int(packet.pts * stream.time_base * RATE), packet.is_keyframe) for packet in packets)
+    with av.open(str(path)) as movie:
+        frames = sum(1 for _ in movie.decode(video=0))
+    return presented, frames
+
+
+@pytest.fixture
+def ring():
+    rings = []
+
+    def make(**kwargs):
+        kwargs.setdefault("slots", 3)
+        made = FrameRing(SHAPE, **kwargs)
+        rings.append(made)
+        return made
+
+    yield make
+    for made in rings:
+        made.shutdown()
+
+
+def test_frames_and_repeats_are_counted(ring, tmp_path):
+    frame_ring = ring()
+    path = tmp_path / "movie.mp4"
+    frame_ring.open(str(path), settings())
+    for value in range(20):
+        frame = draw(frame_ring.acquire(), value * 10)
+        frame_ring.write(frame)
+        if value == 10:
+            # Hold this frame for ten more frames, then give the encoder time to run dry.
+            frame_ring.write(frame, 4)
+            frame_ring.write(frame, 6)
+            time.sleep(0.5)
+    # A frame drawn outside the ring is copied into a slot.
+    frame_ring.write(draw(np.empty(SHAPE, dtype=np.uint8), 7))
+    frame_ring.close()
+
+    assert frame_ring.frames_sent == 21
+    assert frame_ring.frames_copied == 1
+    assert frame_ring.frames_repeated == 10
+    assert frame_ring.chunks_encoded == 1
+    # The renderer outruns the encoder on three slots, and the encoder idled during the pause.
+    assert frame_ring.producer_waits > 0 and frame_ring.producer_wait_seconds > 0
+    assert frame_ring.consumer_waits > 0 and frame_ring.consumer_wait_seconds > 0
+
+    presented, frames = read_movie(path)
+    # The hold is written as its first and last frame.
+    assert frames == 22
+    assert presented[-1][0] == 21 + 10 - 1
+
+
+def test_dead_encoder_raises_instead_of_blocking(ring, tmp_path):
+    frame_ring = ring()
+    frame_ring.open(str(tmp_path / "movie.mp4"), settings())
+    slots = [frame_ring.acquire() for _ in range(3)]
+    frame_ring.write(draw(slots[0], 0))
+    frame_ring._processes[0].kill()
+    frame_ring._processes[0].join()
+
+    # Every slot is taken and the encoder that would free one is gone.
+    with pytest.raises(RuntimeError, match="frame-ring-encoder-0"):
+        frame_ring.acquire()
+    with pytest.raises(RuntimeError, match="frame-ring-encoder-0"):
+        frame_ring.close()
+
+
+def test_chunks_are_joined_on_keyframes(ring, tmp_path):
+    frame_ring = ring(slots=7, workers=3, chunk_frames=30)
+    path = tmp_path / "movie.mp4"
+    frame_ring.open(str(path), settings())
+    for value in range(100):
+        frame_ring.write(draw(frame_ring.acquire(), value * 2))
+    frame_ring.close()
+
+    assert frame_ring.chunks_encoded == 4
+    assert not list(tmp_path.glob("*.chunk*"))
+    with av.open(str(path)) as movie:
+        stream = movie.streams.video[0]
+        packets = [packet for packet in movie.demux(stream) if packet.pts is not None]
+        to_frame = stream.time_base * RATE
+        decode_times = [packet.dts for packet in packets]
+        frames = {int(packet.pts * to_frame): packet.is_keyframe for packet in packets}
+    with av.open(str(path)) as movie:
+        assert sum(1 for _ in movie.decode(video=0)) == 100
+
+    assert all(earlier < later for earlier, later in zip(decode_times, decode_times[1:]))
+    # The chunk lead is taken off again: the movie starts at frame 0, with every frame once.
+    assert sorted(frames) == list(range(100))
+    assert all(frames[start] for start in range(0, 100, 30))
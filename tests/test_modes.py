@@ -0,0 +1,88 @@
+"""Block modes against block-by-block reference DES and the FIPS 81 examples."""
+
+import numpy as np
+import pytest
+
+from cipher.des_core import decrypt_block, encrypt_block
+from cipher.modes import (
+    DES, TripleDES, cbc_decrypt, cbc_encrypt, ctr_crypt, ecb_decrypt, ecb_encrypt, from_blocks, pad, to_blocks, unpad,
+)
+
+KEY = 0x0123456789ABCDEF
+IV = 0x1234567890ABCDEF
+# FIPS 81, appendix B
+FIPS81_PLAINTEXT = b"Now is the time for all "
+FIPS81_ECB = bytes.fromhex("3fa40e8a984d4815 6a271787ab8883f9 893d51ec4b563b53")
+FIPS81_CBC = bytes.fromhex("e5c7cdde872bf27c 43e934008c389c0f 683788499a7c05f6")
+
+TRIPLE_KEYS = (0x0123456789ABCDEF, 0x23456789ABCDEF01, 0x456789ABCDEF0123)
+
+
+def reference_encrypt(block, keys):
+    """E(k3, D(k2, E(k1, block))) for three keys, plain DES for one."""
+    if len(keys) == 1:
+        return encrypt_block(block, keys[0])
+    return encrypt_block(decrypt_block(encrypt_block(block, keys[0]), keys[1]), keys[2])
+
+
+CIPHERS = [
+    pytest.param(DES(KEY), (KEY,), id="des"),
+    pytest.param(TripleDES(*TRIPLE_KEYS), TRIPLE_KEYS, id="3des"),
+]
+
+
+@pytest.fixture(scope="module")
+def data():
+    return np.random.default_rng(2).integers(0, 256, size=8 * 12, dtype=np.uint8)
+
+
+def blocks_of(data):
+    return [int(block) for block in to_blocks(data)]
+
+
+def test_fips81_examples():
+    cipher = DES(KEY)
+    assert ecb_encrypt(cipher, FIPS81_PLAINTEXT).tobytes() == FIPS81_ECB
+    assert cbc_encrypt(cipher, FIPS81_PLAINTEXT, IV).tobytes() == FIPS81_CBC
+    assert cbc_decrypt(cipher, FIPS81_CBC, IV).tobytes() == FIPS81_PLAINTEXT
+
+
+@pytest.mark.parametrize("cipher, keys", CIPHERS)
+def test_ecb_matches_reference(cipher, keys, data):
+    expected = [reference_encrypt(block, keys) for block in blocks_of(data)]
+    assert blocks_of(ecb_encrypt(cipher, data)) == expected
+    assert np.array_equal(ecb_decrypt(cipher, ecb_encrypt(cipher, data)), data)
+
+
+@pytest.mark.parametrize("cipher, keys", CIPHERS)
+def test_cbc_matches_reference(cipher, keys, data):
+    expected, previous = [], IV
+    for block in blocks_of(data):
+        previous = reference_encrypt(block ^ previous, keys)
+        expected.append(previous)
+    assert blocks_of(cbc_encrypt(cipher, data, IV)) == expected
+
+
+@pytest.mark.parametrize("cipher, keys", CIPHERS)
+def test_cbc_decrypt_inverts_encrypt(cipher, keys, data):
+    assert np.array_equal(cbc_decrypt(cipher, cbc_encrypt(cipher, data, IV), IV), data)
+
+
+@pytest.mark.parametrize("cipher, keys", CIPHERS)
+def test_ctr_matches_reference(cipher, keys, data):
+    # Not a whole number of blocks: CTR needs no padding
+    message = data[:8 * 5 + 3]
+    nonce = 0xFEDCBA9800000000
+    keystream = from_blocks(np.array([reference_encrypt(nonce + index, keys) for index in range(6)], dtype=np.uint64))
+    assert np.array_equal(ctr_crypt(cipher, message, nonce), message ^ keystream[:message.size])
+    assert np.array_equal(ctr_crypt(cipher, ctr_crypt(cipher, message, nonce), nonce), message)
+
+
+def test_padding_round_trip():
+    for length in range(17):
+        message = np.arange(length, dtype=np.uint8)
+        padded = pad(message)
+        assert padded.size % 8 == 0 and padded.size > length
+        assert np.array_equal(unpad(padded), message)
+    with pytest.raises(ValueError):
+        unpad(np.array([1, 2, 3, 4, 5, 6, 7, 9], dtype=np.uint8))
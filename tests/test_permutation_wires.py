@@ -0,0 +1,64 @@
+"""PermutationWires construction and the GrowWires animation."""
+
+import numpy as np
+import pytest
+
+# The repo's manim/ examples directory shadows a missing install as a namespace package.
+pytest.importorskip("manim.scene")
+
+from cipher.des_tables import P, PC1  # noqa: E402
+from utils.bezier import partial_curves  # noqa: E402
+from utils.permutation_wires import GrowWires, PermutationWires  # noqa: E402
+
+
+def row(count, y):
+    return np.stack([np.linspace(-4, 4, count), np.full(count, y), np.zeros(count)], axis=1)
+
+
+@pytest.fixture
+def wires():
+    return PermutationWires(P, row(32, 1.0), row(32, -1.0))
+
+
+def test_wires_run_from_source_to_target(wires):
+    sources, targets = row(32, 1.0), row(32, -1.0)
+    curves = wires.curves
+    assert curves.shape == (32, 4, 3)
+    assert np.allclose(curves[:, 0], sources[np.array(P) - 1])
+    assert np.allclose(curves[:, 3], targets)
+    # The handles leave and enter vertically.
+    assert np.allclose(curves[:, 1, 0], curves[:, 0, 0])
+    assert np.allclose(curves[:, 2, 0], curves[:, 3, 0])
+
+
+def test_table_must_match_the_anchors():
+    with pytest.raises(ValueError, match="3 table entries but 2 targets"):
+        PermutationWires([2, 1, 3], row(3, 1), row(2, -1))
+    with pytest.raises(ValueError, match=r"outside 1\.\.3"):
+        PermutationWires([0, 1, 2], row(3, 1), row(3, -1))
+    with pytest.raises(ValueError, match=r"outside 1\.\.3"):
+        PermutationWires([1, 2, 4], row(3, 1), row(3, -1))
+
+
+def test_pc1_leaves_out_the_parity_bits():
+    wires = PermutationWires(PC1, row(64, 1), row(56, -1))
+    assert wires.unused_inputs(64).tolist() == [7, 15, 23, 31, 39, 47, 55, 63]
+
+
+def test_points_at_the_ends(wires):
+    assert np.allclose(wires.points_at(0), wires.curves[:, 0])
+    assert np.allclose(wires.points_at(1), wires.curves[:, 3])
+
+
+def test_grow_wires(wires):
+    original = wires.curves.copy()
+    animation = GrowWires(wires)
+    animation.begin()
+    # Every wire starts as a point at its input.
+    assert np.allclose(wires.curves, original[:, :1])
+
+    animation.interpolate(0.5)
+    assert np.allclose(wires.curves, partial_curves(original, animation.rate_func(0.5)))
+
+    animation.interpolate(1)
+    assert np.allclose(wires.curves, original)
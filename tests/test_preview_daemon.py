@@ -0,0 +1,61 @@
+"""The preview client against a stand-in for the daemon's socket."""
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from utils.preview_daemon import STATUS_PREFIX, send_render_request
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Serve one request by sending ``chunks`` one at a time; returns the request it got."""
+    path = str(tmp_path / "preview.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    received = []
+
+    def start(*chunks):
+        def serve():
+            conn, _ = server.accept()
+            with conn, conn.makefile("r", encoding="utf-8") as reader:
+                received.append(json.loads(reader.readline()))
+                for chunk in chunks:
+                    conn.sendall(chunk)
+                    # Arrive as separate reads
+                    time.sleep(0.02)
+
+        threading.Thread(target=serve, daemon=True).start()
+        return path, received
+
+    yield start
+    server.close()
+
+
+def test_exit_code_is_returned_and_stripped(daemon, capfd):
+    path, received = daemon(b"Rendering...\n", b"Error: scene failed\n", STATUS_PREFIX + b"2\n")
+    assert send_render_request(path, ["-pql", "cipher/des.py", "DESRoundScene"]) == 2
+    assert received[0]["argv"] == ["-pql", "cipher/des.py", "DESRoundScene"]
+    assert capfd.readouterr().out == "Rendering...\nError: scene failed\n"
+
+
+def test_status_line_split_across_reads(daemon, capfd):
+    path, _ = daemon(b"done\n" + STATUS_PREFIX[:5], STATUS_PREFIX[5:] + b"0", b"\n")
+    assert send_render_request(path, ["scene.py"]) == 0
+    assert capfd.readouterr().out == "done\n"
+
+
+def test_missing_status_is_a_failure(daemon, capfd):
+    path, _ = daemon(b"partial output\n")
+    assert send_render_request(path, ["scene.py"]) == 1
+    captured = capfd.readouterr()
+    assert captured.out == "partial output\n"
+    assert "without an exit status" in captured.err
+
+
+def test_no_daemon_listening(tmp_path):
+    assert send_render_request(str(tmp_path / "missing.sock"), ["scene.py"]) is None
@@ -0,0 +1,84 @@
+"""RasterTable geometry: grid points, cell centers, overlays and the border mesh."""
+
+import numpy as np
+import pytest
+
+# The repo's manim/ examples directory shadows a missing install as a namespace package.
+pytest.importorskip("manim.scene")
+
+from manim import RIGHT, UL, UP  # noqa: E402
+
+from utils.raster_table import RasterTable  # noqa: E402
+
+VALUES = [[1, 2, 3], [4, 5, 6]]
+
+
+@pytest.fixture
+def table():
+    # 2 x 3 values plus a label row and column: a 3 x 4 grid of 0.5 x 0.4 cells, centered
+    return RasterTable(VALUES, cell_width=0.5, cell_height=0.4, row_labels=["a", "b"], column_labels=["x", "y", "z"])
+
+
+def test_size_and_image(table):
+    assert (table.rows, table.columns) == (2, 3)
+    assert (table.grid_rows, table.grid_columns) == (3, 4)
+    assert table.image.width == pytest.approx(2.0)
+    assert table.image.height == pytest.approx(1.2)
+    # 160 pixels per unit: 80 x 64 pixels per cell
+    assert table.image.pixel_array.shape == (3 * 64, 4 * 80, 4)
+
+
+def test_grid_points(table):
+    assert np.allclose(table.grid_point(0, 0), [-0.5, 0.2, 0])
+    assert np.allclose(table.grid_point(2, 3), [1.0, -0.6, 0])
+    assert np.allclose(table.grid_point(-1, -1), table.image.get_corner(UL))
+    assert np.allclose(table.grid_point(0.5, 1.5), [0.25, 0.0, 0])
+
+
+def test_cell_centers_and_label_cells(table):
+    assert np.allclose(table.cell_center(0, 0), [-0.25, 0.0, 0])
+    assert np.allclose(table.cell_center(1, 2), [0.75, -0.4, 0])
+    # Column labels sit in row -1, row labels in column -1.
+    assert np.allclose(table.cell_center(-1, 0), [-0.25, 0.4, 0])
+    assert np.allclose(table.cell_center(1, -1), [-0.75, -0.4, 0])
+
+
+def test_geometry_follows_the_table(table):
+    before = table.cell_center(1, 1)
+    table.shift(2 * RIGHT + UP)
+    assert np.allclose(table.cell_center(1, 1), before + [2, 1, 0])
+
+
+def test_without_labels():
+    table = RasterTable(VALUES, cell_width=0.5, cell_height=0.4)
+    assert (table.grid_rows, table.grid_columns) == (2, 3)
+    assert np.allclose(table.grid_point(0, 0), table.image.get_corner(UL))
+    assert np.allclose(table.cell_center(0, 0), [-0.5, 0.2, 0])
+
+
+def test_overlays(table):
+    cell = table.highlight_cell(1, 2)
+    assert (cell.width, cell.height) == (pytest.approx(0.5), pytest.approx(0.4))
+    assert np.allclose(cell.get_center(), table.cell_center(1, 2))
+
+    row = table.highlight_row(0)
+    assert row.width == pytest.approx(2.0)
+    assert np.allclose(row.get_center(), [0, 0, 0])
+    row = table.highlight_row(0, include_label=False)
+    assert row.width == pytest.approx(1.5)
+    assert np.allclose(row.get_center(), [0.25, 0, 0])
+
+    column = table.highlight_column(2)
+    assert column.height == pytest.approx(1.2)
+    assert np.allclose(column.get_center(), [0.75, 0, 0])
+    column = table.highlight_column(2, include_label=False)
+    assert column.height == pytest.approx(0.8)
+    assert np.allclose(column.get_center(), [0.75, -0.2, 0])
+
+
+def test_mesh_borders_the_value_cells(table):
+    # One subpath per horizontal and vertical line
+    assert len(table.mesh.get_subpaths()) == (2 + 1) + (3 + 1)
+    assert np.allclose(table.mesh.get_corner(UL), table.grid_point(0, 0))
+    assert table.mesh.width == pytest.approx(1.5)
+    assert table.mesh.height == pytest.approx(0.8)
@@ -0,0 +1,195 @@
+"""TTSClient against a local stand-in for the /audio/speech endpoint."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.tts_client import TTSClient, TTSRequestError
+
+AUDIO = b"ID3" + bytes(range(256)) * 4
+BACKOFF = 0.02
+
+
+class StandIn:
+    """Answers each request with the next scripted response; the last one repeats."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.requests.append((self.path, json.loads(body)))
+                status, headers, payload, truncate = stand_in.next_response()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload[:len(payload) // 2] if truncate else payload)
+                if truncate:
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def next_response(self):
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+
+def ok(payload=AUDIO, truncate=False):
+    return 200, {"Content-Type": "audio/mpeg"}, payload, truncate
+
+
+def error(status, **headers):
+    return status, headers, json.dumps({"error": {"message": f"status {status}"}}).encode(), False
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(*responses):
+        server = StandIn(responses)
+        server.thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.server.shutdown()
+        server.server.server_close()
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+
+    def read():
+        return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+    read.path = str(path)
+    return read
+
+
+def make_client(server, metrics, **kwargs):
+    kwargs.setdefault("max_retries", 3)
+    return TTSClient(base_url=server.base_url, api_key="test", backoff=BACKOFF, timeout=5,
+                     metrics_path=metrics.path, **kwargs)
+
+
+def events(entries, kind):
+    return [entry for entry in entries if entry["event"] == kind]
+
+
+def test_success_records_metrics(stand_in, metrics):
+    server = stand_in(ok())
+    client = make_client(server, metrics)
+    try:
+        assert client.synthesize("Hello there", voice="fable", model="tts-1-hd") == AUDIO
+    finally:
+        client.close()
+
+    path, payload = server.requests[0]
+    assert path == "/v1/audio/speech"
+    assert payload["input"] == "Hello there" and payload["voice"] == "fable"
+    [request] = metrics()
+    assert request["event"] == "request"
+    assert request["status"] == 200
+    assert request["attempts"] == 1
+    assert request["chars"] == len("Hello there")
+    assert request["bytes"] == len(AUDIO)
+    assert request["latency"] >= 0
+
+
+def test_retries_429_and_503_with_exponential_backoff(stand_in, metrics):
+    server = stand_in(error(429), error(503), error(503), ok())
+    client = make_client(server, metrics)
+    try:
+        assert client.synthesize("retry me", voice="fable", model="tts-1-hd") == AUDIO
+    finally:
+        client.close()
+
+    assert len(server.requests) == 4
+    entries = metrics()
+    retries = events(entries, "retry")
+    assert [retry["status"] for retry in retries] == [429, 503, 503]
+    assert [retry["attempt"] for retry in retries] == [1, 2, 3]
+    for retry in retries:
+        # backoff * 2^(attempt - 1), plus up to 50% jitter
+        base = BACKOFF * 2 ** (retry["attempt"] - 1)
+        assert base <= retry["delay"] <= base * 1.5 + 1e-3
+    [request] = events(entries, "request")
+    assert request["attempts"] == 4
+    assert request["latency"] >= sum(retry["delay"] for retry in retries) - 1e-3
+
+
+def test_retry_after_is_honoured(stand_in, metrics):
+    server = stand_in(error(429, **{"Retry-After": "0.3"}), ok())
+    client = make_client(server, metrics)
+    try:
+        client.synthesize("slow down", voice="fable", model="tts-1-hd")
+    finally:
+        client.close()
+
+    [retry] = events(metrics(), "retry")
+    assert retry["delay"] >= 0.3
+
+
+def test_truncated_body_is_retried(stand_in, metrics):
+    server = stand_in(ok(truncate=True), ok())
+    client = make_client(server, metrics)
+    try:
+        assert client.synthesize("cut short", voice="fable", model="tts-1-hd") == AUDIO
+    finally:
+        client.close()
+
+    entries = metrics()
+    [retry] = events(entries, "retry")
+    assert retry["status"] is None
+    [request] = events(entries, "request")
+    assert request["attempts"] == 2
+    assert request["bytes"] == len(AUDIO)
+
+
+def test_gives_up_after_max_retries(stand_in, metrics):
+    server = stand_in(error(503))
+    client = make_client(server, metrics, max_retries=2)
+    try:
+        with pytest.raises(TTSRequestError) as raised:
+            client.synthesize("never works", voice="fable", model="tts-1-hd")
+    finally:
+        client.close()
+
+    assert raised.value.status == 503
+    assert len(server.requests) == 3
+    entries = metrics()
+    assert len(events(entries, "retry")) == 2
+    [failed] = events(entries, "failed")
+    assert failed["attempts"] == 3
+    assert failed["status"] == 503
+
+
+def test_client_errors_are_not_retried(stand_in, metrics):
+    server = stand_in(error(400))
+    client = make_client(server, metrics)
+    try:
+        with pytest.raises(TTSRequestError) as raised:
+            client.synthesize("bad request", voice="fable", model="tts-1-hd")
+    finally:
+        client.close()
+
+    assert raised.value.status == 400
+    assert len(server.requests) == 1
+    assert events(metrics(), "retry") == []
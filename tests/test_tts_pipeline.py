@@ -0,0 +1,79 @@
+"""Static scan of the voiceover texts a scene will narrate."""
+
+import pytest
+
+# The repo's manim/ examples directory shadows a missing install as a namespace package.
+pytest.importorskip("manim.scene")
+
+from utils.tts_pipeline import scan_voiceover_texts  # noqa: E402
+
+
+class Narrated:
+    """Stands in for the scene base class, which defines ``voiceover``."""
+
+    def voiceover(self, text=None):
+        raise NotImplementedError
+
+    def construct(self):
+        self.voiceover("Never scanned: defined next to voiceover.")
+
+
+class HelperScene(Narrated):
+    def construct(self):
+        with self.voiceover("Introduction."):
+            pass
+        self.show_rounds(3)
+        with self.voiceover(text="Conclusion."):
+            pass
+
+    def show_rounds(self, count):
+        for number in range(1, count + 1):
+            if number == 1:
+                text = "The first round."
+            else:
+                text = f"Round {number}."
+            with self.voiceover(text):
+                self.show_detail()
+
+    def show_detail(self):
+        with self.voiceover("A detail."):
+            pass
+
+    def unused(self):
+        with self.voiceover("Narrated outside construct."):
+            pass
+
+
+class DerivedScene(HelperScene):
+    def show_detail(self):
+        with self.voiceover("An overridden detail."):
+            pass
+
+
+class SilentScene(Narrated):
+    def construct(self):
+        with self.voiceover(f"{1 + 1} computed."):
+            pass
+
+
+def test_helpers_are_followed_in_call_order():
+    assert scan_voiceover_texts(HelperScene) == [
+        "Introduction.",
+        "The first round.",
+        "A detail.",
+        "Conclusion.",
+        "Narrated outside construct.",
+    ]
+
+
+def test_overrides_replace_base_methods():
+    assert scan_voiceover_texts(DerivedScene)[:4] == [
+        "Introduction.",
+        "The first round.",
+        "An overridden detail.",
+        "Conclusion.",
+    ]
+
+
+def test_computed_texts_are_not_prefetchable():
+    assert scan_voiceover_texts(SilentScene) == []
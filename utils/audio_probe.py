@@ -0,0 +1,240 @@
+"""
+Header-based duration probe for voiceover clips.
+
+Every voiceover block needs the length of its clip. Instead of handing each
+file to an audio library, this module reads only the headers: the RIFF
+``fmt``/``data`` chunks of a WAV file, or the first MPEG audio frame of an MP3
+file together with its Xing/Info or VBRI frame count (or, for constant bit
+rate files, the bit rate and the size of the audio data). The encoder delay
+and padding recorded in a LAME tag are left out, as decoders drop them too.
+
+Probed durations are remembered in a ``durations.json`` index next to the
+speech service's ``cache.json``, keyed by file name and validated against the
+file's size and modification time, so looking up a whole scene's narration
+costs one ``stat`` per clip after the first render.
+"""
+
+import os
+import json
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from manim import logger
+
+DURATION_INDEX_FILENAME = "durations.json"
+
+# How much of the file start is read to find the first MPEG frame.
+HEADER_READ_SIZE = 64 * 1024
+
+# Bit rates in kbit/s by (MPEG version 1 or 2, layer); MPEG 2.5 uses version 2.
+MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+# Version bits of the frame header -> MPEG version (1 is reserved).
+MP3_VERSIONS = {0: 2.5, 2: 2, 3: 1}
+# Encoder strings of LAME tags whose delay and padding decoders trust
+LAME_ENCODERS = (b"LAME", b"Lavf", b"Lavc")
+
+
+def _parse_mp3_header(header: bytes) -> Optional[dict]:
+    """Decode a 4-byte MPEG audio frame header, or return None if it is not one."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = MP3_VERSIONS.get((header[1] >> 3) & 0x03)
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version is None or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    table_version = 1 if version == 1 else 2
+    bitrate = MP3_BITRATES[(table_version, layer)][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (header[2] >> 1) & 0x01
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if layer == 2 or version == 1 else 576
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples_per_frame": samples_per_frame,
+        "frame_length": frame_length,
+        "mono": (header[3] >> 6) == 0x03,
+    }
+
+
+def _id3v2_size(data: bytes) -> int:
+    """Size of a leading ID3v2 tag, including its header and footer."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _xing_trimmed_samples(data: bytes, xing: int, flags: int) -> int:
+    """Encoder delay plus padding from the LAME tag after a Xing/Info tag, or 0."""
+    # The optional fields present by the flags: frames, bytes, TOC, quality
+    lame = xing + 8 + sum(size for bit, size in ((1, 4), (2, 4), (4, 100), (8, 4)) if flags & bit)
+    if data[lame:lame + 4] not in LAME_ENCODERS or len(data) < lame + 24:
+        return 0
+    delays = int.from_bytes(data[lame + 21:lame + 24], "big")
+    return (delays >> 12) + (delays & 0xFFF)
+
+
+def mp3_duration(path: Union[str, Path]) -> float:
+    """Duration of an MP3 file from its frame headers, without decoding."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        audio_start = _id3v2_size(file.read(10))
+        file.seek(audio_start)
+        data = file.read(HEADER_READ_SIZE)
+        file.seek(max(file_size - 128, 0))
+        has_id3v1 = file.read(3) == b"TAG"
+
+    # Find the first frame whose successor also starts with a frame header.
+    position = 0
+    frame = None
+    while position + 4 <= len(data):
+        frame = _parse_mp3_header(data[position:position + 4])
+        if frame is not None:
+            following = position + frame["frame_length"]
+            if following + 4 > len(data) or _parse_mp3_header(data[following:following + 4]) is not None:
+                break
+        frame = None
+        position += 1
+    if frame is None:
+        raise ValueError(f"No MPEG audio frame found in {path}")
+
+    # A Xing/Info tag sits after the side information of the first frame,
+    # a VBRI tag at a fixed offset of 32 bytes after the header.
+    if frame["version"] == 1:
+        side_info = 17 if frame["mono"] else 32
+    else:
+        side_info = 9 if frame["mono"] else 17
+    xing = position + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+            samples = frames * frame["samples_per_frame"] - _xing_trimmed_samples(data, xing, flags)
+            return max(samples, 0) / frame["sample_rate"]
+    vbri = position + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+        return frames * frame["samples_per_frame"] / frame["sample_rate"]
+
+    # Constant bit rate: the audio data size gives the duration.
+    audio_bytes = file_size - audio_start - position - (128 if has_id3v1 else 0)
+    return audio_bytes * 8 / frame["bitrate"]
+
+
+def wav_duration(path: Union[str, Path]) -> float:
+    """Duration of a WAV file from its RIFF chunks, without reading samples."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        riff = file.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {path}")
+
+        byte_rate = None
+        while True:
+            chunk = file.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"No data chunk found in {path}")
+            chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"fmt ":
+                fmt = file.read(chunk_size)
+                byte_rate = struct.unpack("<I", fmt[8:12])[0]
+                file.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if not byte_rate:
+                    raise ValueError(f"Data chunk before fmt chunk in {path}")
+                # Streamed WAV files may leave the size unset.
+                available = file_size - file.tell()
+                return min(chunk_size, available) / byte_rate
+            else:
+                file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+def probe_duration(path: Union[str, Path]) -> float:
+    """Duration of a WAV or MP3 file in seconds, read from its headers."""
+    with open(path, "rb") as file:
+        magic = file.read(4)
+    if magic == b"RIFF":
+        return wav_duration(path)
+    return mp3_duration(path)
+
+
+class DurationIndex:
+    """Probed durations of the clips in one speech service cache directory."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.index_path = Path(cache_dir) / DURATION_INDEX_FILENAME
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                self.entries: Dict[str, dict] = json.load(file)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def duration(self, audio_path: Union[str, Path]) -> float:
+        audio_path = Path(audio_path)
+        stat = audio_path.stat()
+        entry = self.entries.get(audio_path.name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["duration"]
+
+        duration = probe_duration(audio_path)
+        with self._lock:
+            self.entries[audio_path.name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "duration": duration,
+            }
+            try:
+                with open(self.index_path, "w", encoding="utf-8") as file:
+                    json.dump(self.entries, file, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not write duration index {self.index_path}: {e}")
+        return duration
+
+
+_indexes: Dict[Path, DurationIndex] = {}
+
+
+def cached_duration(audio_path: Union[str, Path]) -> float:
+    """
+    Duration of a cached voiceover clip, probed once and then remembered.
+
+    Falls back to mutagen for files the header probe does not understand.
+    """
+    audio_path = Path(audio_path)
+    directory = audio_path.parent.resolve()
+    if directory not in _indexes:
+        _indexes[directory] = DurationIndex(directory)
+    try:
+        return _indexes[directory].duration(audio_path)
+    except (ValueError, struct.error) as e:
+        from manim_voiceover.modify_audio import get_duration
+
+        logger.warning(f"Could not probe {audio_path.name} ({e}), decoding it instead")
+        return get_duration(audio_path)
@@ -0,0 +1,124 @@
+"""
+Arc-length sampling of many cubic Bezier curves at once.
+
+``VMobject.point_from_proportion`` measures the length of the whole path on
+every call, so sampling ``n`` points is O(n^2) and moving ``m`` mobjects
+along ``m`` paths repeats that for every frame. ``ArcLengthTable`` measures
+a batch of paths once and then answers any number of proportions for all of
+them in one NumPy evaluation:
+
+    table = arc_length_table(wires.curves)      # (paths, 4, 3) control points
+    table.points(0.25)                          # (paths, 3): a quarter along each
+    sample_path(arrow, np.linspace(0, 1, 21))   # (21, 3) along one VMobject
+
+A path is one cubic or a chain of cubics, shaped ``(paths, 4, 3)`` or
+``(paths, segments, 4, 3)``, in manim's anchor, handle, handle, anchor order.
+Tables are cached by control points, so redrawing the same geometry does not
+re-measure it. This module does not import manim.
+"""
+
+from collections import OrderedDict
+from typing import Union
+
+import numpy as np
+
+DEFAULT_RESOLUTION = 32
+CACHE_SIZE = 128
+
+_cache: "OrderedDict[tuple, ArcLengthTable]" = OrderedDict()
+
+
+def bezier_points(curves: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Points of cubic Beziers ``(..., 4, 3)`` at parameters ``t``.
+
+    ``t`` broadcasts against ``curves[..., 0, 0]``: add an axis to the curves
+    to evaluate every curve at the same samples.
+    """
+    t = np.asarray(t, dtype=float)
+    s = 1 - t
+    basis = np.stack([s ** 3, 3 * s * s * t, 3 * s * t * t, t ** 3], axis=-1)
+    return np.einsum("...k,...kd->...d", basis, curves)
+
+
+def partial_curves(curves: np.ndarray, t) -> np.ndarray:
+    """
+    The part of cubic Beziers ``(..., 4, 3)`` from their start to parameter ``t``.
+
+    De Casteljau's split, as cubics of the same shape; ``t`` broadcasts like
+    in ``bezier_points``.
+    """
+    curves = np.asarray(curves, dtype=float)
+    t = np.asarray(t, dtype=float)[..., None]
+    p0, p1, p2 = curves[..., 0, :], curves[..., 1, :], curves[..., 2, :]
+    q1 = p0 + t * (p1 - p0)
+    q2 = q1 + t * (p1 + t * (p2 - p1) - q1)
+    return np.stack([np.broadcast_to(p0, q1.shape), q1, q2, bezier_points(curves, t[..., 0])], axis=-2)
+
+
+class ArcLengthTable:
+    """Cumulative arc lengths of a batch of paths, sampled ``resolution`` times per segment."""
+
+    def __init__(self, curves: np.ndarray, resolution: int = DEFAULT_RESOLUTION):
+        curves = np.asarray(curves, dtype=float)
+        if curves.ndim == 3:
+            curves = curves[:, None]
+        self.curves = curves
+        self.resolution = resolution
+        paths, segments = curves.shape[:2]
+
+        samples = bezier_points(curves[:, :, None], np.linspace(0, 1, resolution + 1))
+        steps = np.linalg.norm(np.diff(samples, axis=2), axis=-1).reshape(paths, segments * resolution)
+        self.cumulative = np.concatenate([np.zeros((paths, 1)), np.cumsum(steps, axis=1)], axis=1)
+        self.lengths = self.cumulative[:, -1]
+
+    def points(self, proportions: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Points at ``proportions`` of each path's length.
+
+        A scalar gives ``(paths, 3)``; ``(samples,)`` gives every path at
+        every proportion, ``(paths, samples, 3)``; ``(paths, samples)`` gives
+        each path its own proportions.
+        """
+        proportions = np.asarray(proportions, dtype=float)
+        scalar = proportions.ndim == 0
+        if scalar:
+            proportions = proportions.reshape(1)
+        paths, steps = self.cumulative.shape[0], self.cumulative.shape[1] - 1
+        targets = np.broadcast_to(np.clip(proportions, 0, 1), (paths, proportions.shape[-1])) * self.lengths[:, None]
+
+        # One searchsorted for all paths: shift each row past the one before it.
+        offsets = (np.arange(paths) * (self.lengths.max() + 1))[:, None]
+        flat = (self.cumulative + offsets).ravel()
+        index = np.searchsorted(flat, (targets + offsets).ravel(), side="right").reshape(targets.shape) - 1
+        index = np.clip(index - np.arange(paths)[:, None] * (steps + 1), 0, steps - 1)
+
+        rows = np.arange(paths)[:, None]
+        start = self.cumulative[rows, index]
+        step = self.cumulative[rows, index + 1] - start
+        fraction = np.divide(targets - start, step, out=np.zeros_like(targets), where=step > 0)
+
+        segment, sample = np.divmod(index, self.resolution)
+        t = (sample + fraction) / self.resolution
+        points = bezier_points(self.curves[rows, segment], t)
+        return points[:, 0] if scalar else points
+
+
+def arc_length_table(curves: np.ndarray, resolution: int = DEFAULT_RESOLUTION) -> ArcLengthTable:
+    """An ``ArcLengthTable`` of ``curves``, reused while the same control points come back."""
+    curves = np.ascontiguousarray(curves, dtype=float)
+    key = (curves.shape, resolution, curves.tobytes())
+    table = _cache.get(key)
+    if table is None:
+        table = _cache[key] = ArcLengthTable(curves, resolution)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return table
+
+
+def sample_path(vmobject, proportions, resolution: int = DEFAULT_RESOLUTION) -> np.ndarray:
+    """Points at ``proportions`` of the length of ``vmobject``'s path, ``(samples, 3)``."""
+    curves = vmobject.points.reshape(1, -1, 4, 3)
+    return arc_length_table(curves, resolution).points(np.atleast_1d(proportions))[0]
@@ -0,0 +1,128 @@
+"""
+Partial movie encoding shared by the in-process and out-of-process writers.
+
+This module only depends on PyAV and NumPy so that the frame ring's encoder
+process can import it without loading manim.
+"""
+
+import heapq
+from fractions import Fraction
+from typing import Iterable, Iterator, List
+
+import av
+import numpy as np
+
+
+def open_partial_movie(path: str, settings: dict):
+    """Open a partial movie container with the stream manim would create."""
+    container = av.open(path, mode="w")
+    stream = container.add_stream(settings["codec"], rate=settings["rate"], options=settings["options"])
+    stream.pix_fmt = settings["pix_fmt"]
+    stream.width = settings["width"]
+    stream.height = settings["height"]
+    return container, stream
+
+
+class FrameHoldEncoder:
+    """
+    Encodes frames with explicit timestamps.
+
+    With ``vfr_holds`` a run of identical frames is encoded as its first and
+    last frame only, and the timestamps of the frames in between are skipped,
+    which makes the hold a variable frame rate segment of the same duration.
+    ``start_pts`` places the first frame later on the timeline, for movies
+    that are encoded in chunks.
+    """
+
+    def __init__(self, container, stream, time_base: Fraction, vfr_holds: bool = True, start_pts: int = 0):
+        self.container = container
+        self.stream = stream
+        self.time_base = time_base
+        self.vfr_holds = vfr_holds
+        self._next_pts = start_pts
+        self._last_frame = None
+        self._held_count = 0
+
+    def write(self, frame: np.ndarray, num_frames: int = 1) -> None:
+        """Encode a new frame, shown for ``num_frames`` frames."""
+        self.flush()
+        self._encode(frame)
+        self._last_frame = frame
+        self.repeat(num_frames - 1)
+
+    def repeat(self, num_frames: int) -> None:
+        """Show the last written frame for ``num_frames`` more frames."""
+        if not self.vfr_holds:
+            for _ in range(num_frames):
+                self._encode(self._last_frame)
+            return
+        self._held_count += num_frames
+
+    def flush(self) -> None:
+        """Close the current hold, if any."""
+        if self._held_count > 0:
+            # Skip the timestamps of the repeated frames and close the hold
+            # with its last frame, so the hold keeps its full duration.
+            self._next_pts += self._held_count - 1
+            self._encode(self._last_frame)
+        self._held_count = 0
+
+    def _encode(self, frame: np.ndarray) -> None:
+        av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+        av_frame.pts = self._next_pts
+        av_frame.time_base = self.time_base
+        self._next_pts += 1
+        for packet in self.stream.encode(av_frame):
+            self.container.mux(packet)
+
+
+def concat_movies(paths: List[str], output_path: str, shift: Fraction = Fraction(0)) -> None:
+    """
+    Join movies of one video stream each with a stream copy.
+
+    The movies must share their encoding settings and format, and carry the
+    timestamps they should have in the joined movie, plus ``shift`` seconds.
+    """
+    with av.open(output_path, mode="w") as output:
+        output_stream = None
+        last_dts = None
+        for path in paths:
+            with av.open(path) as source:
+                stream = source.streams.video[0]
+                if output_stream is None:
+                    output_stream = output.add_stream(template=stream)
+                offset = int(shift / stream.time_base)
+                for packet in source.demux(stream):
+                    if packet.dts is None:
+                        continue
+                    packet.pts -= offset
+                    packet.dts -= offset
+                    if last_dts is not None and packet.dts <= last_dts:
+                        # The encoder derives the first decode timestamps of a
+                        # movie from the gaps between its frames, so after a
+                        # hold they can reach back into the movie before.
+                        # Only the order matters: move them just past it.
+                        packet.dts = last_dts + 1
+                        if packet.dts > packet.pts:
+                            raise ValueError(f"{path} overlaps the movie before it")
+                    last_dts = packet.dts
+                    packet.stream = output_stream
+                    output.mux(packet)
+
+
+def decode_time(packet) -> Fraction:
+    """When ``packet`` is decoded, in seconds."""
+    return packet.dts * packet.time_base
+
+
+def interleave_packets(*streams: Iterable) -> Iterator:
+    """
+    Merge packet streams, each in decode order, into one in decode time order.
+
+    Players read a file front to back. Written one stream after the other, a
+    movie's audio starts where its video ends: the muxer interleaves on its
+    own only within ``max_interleave_delta`` (10 s) and flushes what it holds
+    beyond that. The merge takes the next packet of each stream as it goes,
+    so no stream is read ahead.
+    """
+    return heapq.merge(*streams, key=decode_time)
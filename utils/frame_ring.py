@@ -0,0 +1,371 @@
+"""
+Shared-memory frame ring between the rasterizer and encoder processes.
+
+With ``ANIM_FRAME_RING=<slots>`` partial movies are encoded in a separate
+process instead of manim's writer thread. Frames live in a ring of
+``<slots>`` frame buffers in shared memory: the renderer points the Cairo
+camera at a free slot, Cairo rasterizes straight into it, and only the slot
+index crosses the process boundary. No frame is copied on its way to the
+encoder, and encoding no longer competes with rasterizing for the GIL.
+
+The ring applies backpressure: when every slot is waiting to be encoded the
+renderer blocks until an encoder releases one. An encoder keeps the slot of
+the last frame it received until the next one arrives, so it can still close
+a hold of that frame. ``producer_waits`` counts how often the renderer had to
+wait for the encoders, ``consumer_waits`` how often an encoder sat idle.
+While it waits, the renderer checks on the encoders every
+``ENCODER_CHECK_SECONDS`` and raises ``RuntimeError`` if one has died, rather
+than waiting for a slot or a movie that will never come.
+
+With ``ANIM_ENCODE_WORKERS=<n>`` (n > 1) the ring feeds ``n`` encoder
+processes. Each partial movie is cut into chunks of about
+``ANIM_ENCODE_CHUNK`` seconds (default 2), which the encoders take in turn.
+A chunk starts with a keyframe and keyframes repeat every chunk length, so
+chunk boundaries fall on keyframes; the chunks keep their timestamps and are
+joined into the partial movie with a stream copy, without re-encoding. A
+chunk only ends at a new frame, so a hold that runs past the chunk length
+stays in its chunk. Chunked encoding applies to H.264 partial movies (the
+default); webm and transparent movies are still encoded by one process. The
+ring is enabled with enough slots for the encoders when only
+``ANIM_ENCODE_WORKERS`` is set.
+
+This module does not import manim, so the encoder processes start quickly.
+"""
+
+import os
+import time
+import queue
+import atexit
+from fractions import Fraction
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.encoding import FrameHoldEncoder, concat_movies, open_partial_movie
+
+FRAME_RING_ENV_VAR = "ANIM_FRAME_RING"
+WORKERS_ENV_VAR = "ANIM_ENCODE_WORKERS"
+CHUNK_ENV_VAR = "ANIM_ENCODE_CHUNK"
+
+DEFAULT_CHUNK_SECONDS = 2.0
+
+# How often a waiting renderer checks that the encoders are still running
+ENCODER_CHECK_SECONDS = 1.0
+
+# MPEG-TS keeps the exact timestamps of every packet, decode timestamps
+# included, as long as none is negative. Chunks are therefore encoded this
+# many frames late (H.264 reorders at most 16 frames) and moved back when
+# they are joined.
+CHUNK_FORMAT = ".ts"
+CHUNK_LEAD_FRAMES = 16
+
+
+def encode_workers(value: Optional[str] = None) -> int:
+    """Number of encoder processes from ``ANIM_ENCODE_WORKERS`` (default 1)."""
+    if value is None:
+        value = os.environ.get(WORKERS_ENV_VAR, "")
+    return max(int(value.strip() or 1), 1)
+
+
+def chunk_frames(frame_rate: float, value: Optional[str] = None) -> int:
+    """Chunk length in frames from ``ANIM_ENCODE_CHUNK`` seconds."""
+    if value is None:
+        value = os.environ.get(CHUNK_ENV_VAR, "")
+    seconds = float(value.strip() or DEFAULT_CHUNK_SECONDS)
+    return max(int(round(seconds * frame_rate)), 1)
+
+
+def ring_slots(value: Optional[str] = None, workers: int = 1) -> int:
+    """Number of ring slots from ``ANIM_FRAME_RING``; 0 means encode in-process."""
+    # Every encoder holds one slot and the renderer fills another; one more
+    # lets them work at the same time.
+    min_slots = workers + 2
+    if value is None:
+        value = os.environ.get(FRAME_RING_ENV_VAR, "")
+    value = value.strip()
+    if not value or value == "0":
+        # Chunked encoding needs the ring; size it for the encoders.
+        return 0 if workers <= 1 else 2 * workers + 1
+    return max(int(value), min_slots)
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        # The creating process owns the segment; don't let this one unlink it.
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return SharedMemory(name=name)
+
+
+def _slot_views(buffer, shape: Tuple[int, ...], slots: int):
+    frame_bytes = int(np.prod(shape))
+    return [np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=i * frame_bytes) for i in range(slots)]
+
+
+class FrameRing:
+    """Frame slots in shared memory, drained by encoder processes."""
+
+    def __init__(self, shape: Tuple[int, int, int], slots: int, workers: int = 1, chunk_frames: int = 0):
+        """
+        Args:
+            shape: Frame shape as ``(height, width, 4)`` RGBA bytes
+            slots: Number of frames in the ring
+            workers: Number of encoder processes
+            chunk_frames: Frames per chunk when ``workers`` > 1
+        """
+        context = get_context("spawn")
+        self.shape = shape
+        self.chunk_frames = chunk_frames if workers > 1 else 0
+        self._shm = SharedMemory(create=True, size=int(np.prod(shape)) * slots)
+        # Persistent views: the camera caches its Cairo context per array id.
+        self.slots = _slot_views(self._shm.buf, shape, slots)
+        self._slot_index = {id(slot): index for index, slot in enumerate(self.slots)}
+        self._last_sent = None
+
+        # Several encoders release slots out of order, so free slots are
+        # handed out from a queue rather than in ring order.
+        self._free = context.Queue()
+        for index in range(slots):
+            self._free.put(index)
+
+        self._conns = []
+        self._processes = []
+        for worker in range(workers):
+            conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=encoder_main,
+                args=(child_conn, self._shm.name, shape, slots, self._free),
+                name=f"frame-ring-encoder-{worker}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+        self._closed = False
+        atexit.register(self.shutdown)
+
+        self._path = None
+        self._settings = None
+        self._chunks: List[str] = []
+        self._current = None
+        self._position = 0
+        self._chunk_start = 0
+        self._pending_closes = [0] * workers
+
+        self.frames_sent = 0
+        self.frames_copied = 0
+        self.frames_repeated = 0
+        self.chunks_encoded = 0
+        self.producer_waits = 0
+        self.producer_wait_seconds = 0.0
+        self.consumer_waits = 0
+        self.consumer_wait_seconds = 0.0
+
+    def acquire(self) -> np.ndarray:
+        """A free slot to draw a frame into; blocks while the ring is full."""
+        try:
+            index = self._free.get_nowait()
+        except queue.Empty:
+            started = time.perf_counter()
+            self.producer_waits += 1
+            while True:
+                try:
+                    index = self._free.get(timeout=ENCODER_CHECK_SECONDS)
+                    break
+                except queue.Empty:
+                    self._check_encoders()
+            self.producer_wait_seconds += time.perf_counter() - started
+        return self.slots[index]
+
+    def open(self, path: str, settings: dict) -> None:
+        """Start a partial movie; ``settings`` as taken by ``open_partial_movie``."""
+        self._path = path
+        self._settings = settings
+        self._chunks = []
+        self._current = None
+        self._position = 0
+        self._last_sent = None
+
+    def write(self, frame: np.ndarray, num_frames: int = 1) -> None:
+        """Queue ``frame`` for ``num_frames`` frames of the open movie."""
+        if frame is self._last_sent:
+            self._send(("repeat", num_frames))
+            self._position += num_frames
+            self.frames_repeated += num_frames
+            return
+
+        index = self._slot_index.get(id(frame))
+        if index is None or frame is not self.slots[index]:
+            # Frames drawn outside the ring (frozen frames) are copied in.
+            slot = self.acquire()
+            np.copyto(slot, frame)
+            index = self._slot_index[id(slot)]
+            frame = slot
+            self.frames_copied += 1
+
+        if self._current is None or (
+            self.chunk_frames and self._position - self._chunk_start >= self.chunk_frames
+        ):
+            self._start_chunk()
+        self._send(("frame", index, num_frames))
+        self._position += num_frames
+        self._last_sent = frame
+        self.frames_sent += 1
+        self.frames_repeated += num_frames - 1
+
+    def close(self) -> None:
+        """Finish the open movie; returns once it has been written."""
+        if self._current is None:
+            # An animation without frames still gets its (empty) movie.
+            self._start_chunk()
+        self._close_chunk()
+        for worker, conn in enumerate(self._conns):
+            for _ in range(self._pending_closes[worker]):
+                while not conn.poll(ENCODER_CHECK_SECONDS):
+                    self._check_encoders()
+                try:
+                    waits, seconds = conn.recv()
+                except EOFError:
+                    self._check_encoders(wait=True)
+                    raise
+                self.consumer_waits += waits
+                self.consumer_wait_seconds += seconds
+            self._pending_closes[worker] = 0
+
+        if self.chunk_frames:
+            concat_movies(self._chunks, self._path, shift=Fraction(CHUNK_LEAD_FRAMES) / self._settings["rate"])
+            for chunk in self._chunks:
+                os.remove(chunk)
+        self.chunks_encoded += len(self._chunks)
+        self._last_sent = None
+
+    def _send(self, message: tuple) -> None:
+        try:
+            self._conns[self._current].send(message)
+        except BrokenPipeError:
+            self._check_encoders(wait=True)
+            raise
+
+    def _check_encoders(self, wait: bool = False) -> None:
+        """Raise ``RuntimeError`` if an encoder process has exited."""
+        for process in self._processes:
+            if wait:
+                # A pipe to it is closed; give the process a moment to be reaped.
+                process.join(timeout=ENCODER_CHECK_SECONDS)
+            if not process.is_alive():
+                raise RuntimeError(f"Encoder process {process.name} exited with code {process.exitcode}")
+
+    def _start_chunk(self) -> None:
+        if self._current is not None:
+            self._close_chunk()
+        number = len(self._chunks)
+        path = f"{self._path}.chunk{number:04d}{CHUNK_FORMAT}" if self.chunk_frames else self._path
+        settings = self._settings
+        start_pts = self._position
+        if self.chunk_frames:
+            # Regular keyframes at the chunk length line up with chunk starts.
+            settings = {**settings, "options": {**settings["options"], "g": str(self.chunk_frames)}}
+            start_pts += CHUNK_LEAD_FRAMES
+        self._current = number % len(self._conns)
+        self._chunks.append(path)
+        self._chunk_start = self._position
+        self._send(("open", path, settings, start_pts))
+
+    def _close_chunk(self) -> None:
+        # Don't wait for the encoder; its reply is collected in close().
+        self._send(("close",))
+        self._pending_closes[self._current] += 1
+        self._current = None
+        # The next chunk's encoder has not seen the last frame.
+        self._last_sent = None
+
+    def shutdown(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.shutdown)
+        for conn in self._conns:
+            try:
+                conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        # Drop our views before the buffer they point into goes away.
+        self.slots = []
+        self._slot_index = {}
+        self._last_sent = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A renderer still references its last frame; the mapping goes with the process.
+            pass
+        self._shm.unlink()
+
+
+def encoder_main(conn, shm_name: str, shape: Tuple[int, int, int], slots: int, free) -> None:
+    """Encoder process: turns slot indices from ``conn`` into movies."""
+    shm = _attach(shm_name)
+    frames = _slot_views(shm.buf, shape, slots)
+    container = stream = encoder = None
+    held_slot = None
+    waits = 0
+    wait_seconds = 0.0
+    try:
+        while True:
+            if not conn.poll():
+                started = time.perf_counter()
+                waits += 1
+                conn.poll(None)
+                wait_seconds += time.perf_counter() - started
+            message = conn.recv()
+            kind = message[0]
+
+            if kind == "frame":
+                _, index, num_frames = message
+                encoder.write(frames[index], num_frames)
+                # The previous frame can no longer be part of a hold.
+                if held_slot is not None:
+                    free.put(held_slot)
+                held_slot = index
+            elif kind == "repeat":
+                encoder.repeat(message[1])
+            elif kind == "open":
+                _, path, settings, start_pts = message
+                container, stream = open_partial_movie(path, settings)
+                encoder = FrameHoldEncoder(
+                    container,
+                    stream,
+                    Fraction(1) / settings["rate"],
+                    settings["vfr_holds"],
+                    start_pts=start_pts,
+                )
+            elif kind == "close":
+                encoder.flush()
+                for packet in stream.encode():
+                    container.mux(packet)
+                container.close()
+                container = stream = encoder = None
+                if held_slot is not None:
+                    free.put(held_slot)
+                    held_slot = None
+                conn.send((waits, wait_seconds))
+                waits = 0
+                wait_seconds = 0.0
+            elif kind == "stop":
+                break
+    except EOFError:
+        # The renderer went away without stopping us.
+        pass
+    finally:
+        if container is not None:
+            container.close()
+        encoder = frames = None
+        shm.close()
@@ -0,0 +1,108 @@
+"""
+Opt-in mobject budget monitor for narrated scenes.
+
+Bit-level scenes build thousands of sub-mobjects, and leftovers that are never
+removed make every later frame slower. With ``ANIM_BUDGET`` set, ``NarratedScene``
+samples the scene at the end of every voiceover block, warns when a budget is
+exceeded and prints a per-section table when the render finishes::
+
+    ANIM_BUDGET=1 manim -ql cipher/des.py DESRoundScene
+    ANIM_BUDGET="mobjects=3000,points=250000,memory_mb=64" manim -ql ...
+
+Each sample records the mobjects in the scene (all family members), their
+total Bezier/anchor points, an approximation of the memory held by their
+arrays, and the number of mobjects still alive in the process, which catches
+objects that were removed from the scene but are still referenced.
+"""
+
+import gc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from manim import logger
+from manim.mobject.mobject import Mobject
+from manim.utils.family import extract_mobject_family_members
+
+BUDGET_ENV_VAR = "ANIM_BUDGET"
+
+DEFAULT_BUDGETS = {
+    "mobjects": 5000,
+    "points": 500000,
+    "memory_mb": 128.0,
+}
+
+# Per-mobject arrays that make up most of a mobject's memory.
+ARRAY_ATTRIBUTES = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array")
+
+
+def parse_budgets(spec: str) -> Dict[str, float]:
+    """Parse ``name=value,...``; any other non-empty value enables the defaults."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in spec.split(","):
+        name, separator, value = item.partition("=")
+        name = name.strip()
+        if not separator:
+            continue
+        if name not in budgets:
+            logger.warning(f"{BUDGET_ENV_VAR}: unknown budget '{name}', expected one of {', '.join(budgets)}")
+            continue
+        budgets[name] = float(value)
+    return budgets
+
+
+@dataclass
+class BudgetSample:
+    section: str
+    mobjects: int
+    points: int
+    memory_mb: float
+    alive: int
+
+
+class MobjectBudgetMonitor:
+    """Samples a scene's mobjects at section boundaries and reports growth."""
+
+    def __init__(self, budgets: Dict[str, float]):
+        self.budgets = budgets
+        self.samples: List[BudgetSample] = []
+
+    def sample(self, scene, section: str) -> BudgetSample:
+        family = extract_mobject_family_members(scene.mobjects)
+        points = sum(len(mob.points) for mob in family)
+        memory = 0
+        for mob in family:
+            for attribute in ARRAY_ATTRIBUTES:
+                value = getattr(mob, attribute, None)
+                if isinstance(value, np.ndarray):
+                    memory += value.nbytes
+        alive = sum(1 for obj in gc.get_objects() if isinstance(obj, Mobject))
+
+        sample = BudgetSample(section, len(family), points, memory / 2**20, alive)
+        self.samples.append(sample)
+        self._check(sample)
+        return sample
+
+    def _check(self, sample: BudgetSample) -> None:
+        for name, budget in self.budgets.items():
+            value = getattr(sample, name)
+            if value > budget:
+                logger.warning(f"Mobject budget exceeded after {sample.section}: {name} = {value:,.0f} > {budget:,.0f}")
+
+    def report(self, scene_name: str) -> Optional[str]:
+        """Format the per-section table, or return None if nothing was sampled."""
+        if not self.samples:
+            return None
+
+        header = f"{'section':<48} {'mobjects':>9} {'+/-':>7} {'points':>10} {'memory MB':>10} {'alive':>8}"
+        lines = [f"Mobject budget for {scene_name}:", header, "-" * len(header)]
+        previous = 0
+        for sample in self.samples:
+            marker = " *" if any(getattr(sample, name) > budget for name, budget in self.budgets.items()) else ""
+            lines.append(
+                f"{sample.section[:48]:<48} {sample.mobjects:>9,} {sample.mobjects - previous:>+7,} "
+                f"{sample.points:>10,} {sample.memory_mb:>10.1f} {sample.alive:>8,}{marker}"
+            )
+            previous = sample.mobjects
+        lines.append("(* over budget: " + ", ".join(f"{name} {value:,.0f}" for name, value in self.budgets.items()) + ")")
+        return "\n".join(lines)
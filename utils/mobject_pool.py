@@ -0,0 +1,120 @@
+"""
+Pool of reusable bit glyphs, labels and boxes.
+
+Bit-level scenes show the same few strings over and over: thousands of "0"
+and "1" glyphs, "Group 3" labels, S-box cell values. Every ``Text`` lays its
+string out with Pango and parses the resulting SVG. ``MobjectPool`` builds
+each distinct text (and box size) once as a template, hands out copies, and
+takes mobjects back when a scene is done with them, so the next row of bits
+reuses the glyphs of an old one instead of allocating new ones::
+
+    row = self.mobject_pool.bit_row("0110", color=RED)   # VGroup of Text glyphs
+    self.mobject_pool.set_bits(row, "1010")              # in place, same layout
+    box = self.mobject_pool.box(0.8, 0.4, color=PURPLE_A)
+    ...
+    self.recycle(row, box)                               # remove, return to the pool
+
+A checked-out mobject looks exactly like a new one: position, scale, color
+and opacity are reset from the template. Only recycle mobjects that nothing
+still on screen refers to, or they will show up in two places at once.
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List
+
+from manim import RIGHT, WHITE, Rectangle, Text, VGroup
+from manim.mobject.mobject import Mobject
+
+# Attribute marking pooled mobjects with the key of their template
+POOL_KEY = "_pool_key"
+
+
+class MobjectPool:
+    """Templates and free lists of reusable mobjects."""
+
+    def __init__(self):
+        self._templates: Dict[Hashable, Mobject] = {}
+        self._free: Dict[Hashable, List[Mobject]] = defaultdict(list)
+        self.created = 0
+        self.reused = 0
+
+    def text(self, text: str, font_size: float = 16, color=WHITE, **kwargs) -> Text:
+        """A ``Text`` of ``text``; extra keyword arguments go to ``Text``."""
+        key = ("text", text, font_size, tuple(sorted(kwargs.items())))
+        glyph = self._checkout(key, lambda: Text(text, font_size=font_size, **kwargs))
+        return glyph.set_color(color)
+
+    def bit_row(self, bits: str, font_size: float = 16, color=WHITE, buff: float = 0.15) -> VGroup:
+        """A row of one glyph per bit, arranged left to right."""
+        row = VGroup(*[self.text(bit, font_size=font_size, color=color) for bit in bits])
+        return row.arrange(RIGHT, buff=buff)
+
+    def set_bits(self, row: VGroup, bits: str) -> VGroup:
+        """Show ``bits`` in ``row`` in place, swapping only the glyphs that change."""
+        for index, (glyph, bit) in enumerate(zip(row.submobjects, bits)):
+            if glyph.text == bit:
+                continue
+            key = getattr(glyph, POOL_KEY)
+            template = self._templates[key]
+            replacement = self.text(bit, font_size=key[2], color=glyph.get_color(), **dict(key[3]))
+            # Keep any scaling the row went through.
+            replacement.scale(glyph.height / template.height).move_to(glyph)
+            row.submobjects[index] = replacement
+            self.release(glyph)
+        return row
+
+    def box(self, width: float, height: float, color=WHITE, fill_color=None, fill_opacity: float = 0.0) -> Rectangle:
+        """A ``Rectangle`` of the given size and style."""
+        key = ("box", width, height)
+        box = self._checkout(key, lambda: Rectangle(width=width, height=height))
+        box.set_stroke(color=color)
+        return box.set_fill(fill_color if fill_color is not None else color, opacity=fill_opacity)
+
+    def release(self, *mobjects: Mobject) -> None:
+        """Take back every pooled mobject in the families of ``mobjects``."""
+        for mobject in mobjects:
+            for member in mobject.get_family():
+                key = getattr(member, POOL_KEY, None)
+                if key is None or getattr(member, "_pool_free", False):
+                    continue
+                member.clear_updaters()
+                member._pool_free = True
+                self._free[key].append(member)
+
+    def _checkout(self, key: Hashable, factory: Callable[[], Mobject]) -> Mobject:
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = factory()
+        free = self._free[key]
+        while free:
+            mobject = free.pop()
+            # An animation that aligned it with another mobject changed its
+            # structure; such a mobject can't be reset, so let it go.
+            if len(mobject.get_family()) != len(template.get_family()):
+                continue
+            mobject._pool_free = False
+            reset_to(mobject, template)
+            self.reused += 1
+            return mobject
+
+        mobject = template.copy()
+        setattr(mobject, POOL_KEY, key)
+        mobject._pool_free = False
+        self.created += 1
+        return mobject
+
+    def summary(self) -> str:
+        total = self.created + self.reused
+        return (
+            f"Mobject pool: {total} checkouts from {len(self._templates)} templates, "
+            f"{self.created} created and {self.reused} reused"
+        )
+
+
+def reset_to(mobject: Mobject, template: Mobject) -> Mobject:
+    """Give ``mobject`` the geometry and style of ``template``, which has the same structure."""
+    # Like Mobject.become, without copying the template first.
+    for member, source in zip(mobject.get_family(), template.get_family()):
+        member.points = source.points.copy()
+        member.interpolate_color(member, source, 1)
+    return mobject
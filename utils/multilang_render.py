@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Multi-language Scene Renderer
+
+Renders one scene once per narration language, producing
+``<Scene>_<lang>.mp4`` for each. The visuals are defined once in the scene
+file and the voiceover texts come from the per-language scripts described in
+``utils.narration_script``.
+
+All languages share the scene's partial movie cache. manim keys each cached
+animation by the mobjects and animations of its ``play()`` call, so every
+animation whose timing does not depend on the narration is rasterized for the
+first language only; later languages re-render just the animations and waits
+whose run time follows the length of their (different) audio. Languages are
+rendered one after the other so they never write the same cache file at once.
+
+Usage:
+    python -m utils.multilang_render cipher/des.py DESRoundScene -l en,vi -q h
+    python -m utils.multilang_render cipher/des.py DESRoundScene --template vi
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict
+
+from utils.parallel_render import QUALITY_FLAGS, configure, load_scene_class
+
+# Keep every language's animations; manim's default limit is 100 files.
+MAX_FILES_CACHED = 100000
+
+
+def render_language(scene_file: str, scene_name: str, overrides: Dict, lang: str, preview: bool) -> float:
+    """Render ``scene_name`` narrated in ``lang`` (runs in a fresh process)."""
+    from utils.narration_script import LANG_ENV_VAR
+
+    started = time.perf_counter()
+    os.environ[LANG_ENV_VAR] = lang
+    configure(overrides)
+    scene = load_scene_class(scene_file, scene_name)()
+    scene.render(preview=preview)
+    return time.perf_counter() - started
+
+
+def write_template(scene_file: str, scene_name: str, lang: str) -> str:
+    """Add the scene's untranslated voiceover texts to the ``lang`` script."""
+    from utils.narration_script import script_path
+    from utils.tts_pipeline import scan_voiceover_texts
+    from utils.voiceover_cache import normalize_text
+
+    path = script_path(scene_file, lang)
+    data = {"service": {}, "texts": {}}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+    texts = data.setdefault("texts", {})
+    added = 0
+    for text in scan_voiceover_texts(load_scene_class(scene_file, scene_name)):
+        text = normalize_text(text)
+        if text not in texts:
+            texts[text] = ""
+            added += 1
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+        file.write("\n")
+    print(f"Added {added} texts to translate to {path}")
+    return str(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render one scene once per narration language')
+    parser.add_argument('file', help='Python file containing the scene')
+    parser.add_argument('scene', help='Name of the scene class to render')
+    parser.add_argument('-l', '--langs', default='en',
+                        help='Comma-separated languages, e.g. en,vi (default: en)')
+    parser.add_argument('-q', '--quality', choices=sorted(QUALITY_FLAGS), default='h',
+                        help='Render quality, as in manim -q (default: h)')
+    parser.add_argument('--media_dir', help='Media directory, as in manim --media_dir')
+    parser.add_argument('-p', '--preview', action='store_true',
+                        help='Open each movie when it is done')
+    parser.add_argument('--template', metavar='LANG',
+                        help='Write the script template for LANG instead of rendering')
+
+    args = parser.parse_args()
+
+    if args.template:
+        write_template(args.file, args.scene, args.template)
+        return 0
+
+    overrides = {
+        "input_file": args.file,
+        "quality": QUALITY_FLAGS[args.quality],
+        "disable_caching": False,
+        "max_files_cached": MAX_FILES_CACHED,
+    }
+    if args.media_dir:
+        overrides["media_dir"] = args.media_dir
+
+    langs = [lang.strip() for lang in args.langs.split(',') if lang.strip()]
+    started = time.perf_counter()
+    # One fresh process per language: manim's config and the scene module are global state.
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1)
+    with pool:
+        for lang in langs:
+            print(f"Rendering {args.scene} in '{lang}'...")
+            elapsed = pool.submit(render_language, args.file, args.scene, overrides, lang, args.preview).result()
+            print(f"  '{lang}' rendered in {elapsed:.1f}s")
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
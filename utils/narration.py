@@ -0,0 +1,166 @@
+"""
+Pre-mixed narration track for narrated scenes.
+
+manim converts every added sound to a temporary WAV, overlays it onto a pydub
+segment (which copies the whole track each time), exports the result, converts
+it to AAC and finally remuxes the movie. With dozens of voiceover blocks this
+dominates the end of a render.
+
+``NarrationFileWriter`` instead records where each clip starts, decodes every
+clip once into a NumPy buffer at a fixed sample rate, sums the clips at their
+sample offsets, and encodes the finished track into the movie container while
+the partial movies are being concatenated, so the movie is written in a
+single pass. Video and audio packets are interleaved by decode time.
+
+The narration track is mono at 48 kHz; sounds added with pydub-only options
+(``gain_to_background``) make the writer fall back to manim's mixing.
+"""
+
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import av
+import numpy as np
+from manim import config, logger
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.sounds import get_full_sound_file_path
+
+from utils.encoding import interleave_packets
+from utils.renderer import FrameHoldFileWriter
+
+SAMPLE_RATE = 48000
+CHANNEL_LAYOUT = "mono"
+FRAME_SAMPLES = 1024
+
+# Audio codec to encode the narration with, per movie container.
+NARRATION_CODECS = {
+    ".mp4": "aac",
+    ".mov": "pcm_s16le",
+    ".webm": "libvorbis",
+}
+
+
+def decode_audio(path: Path) -> np.ndarray:
+    """Decode an audio file to mono float32 samples at ``SAMPLE_RATE``."""
+    resampler = av.AudioResampler(format="flt", layout=CHANNEL_LAYOUT, rate=SAMPLE_RATE)
+    chunks = []
+    with av.open(str(path)) as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+    for resampled in resampler.resample(None):
+        chunks.append(resampled.to_ndarray().reshape(-1))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+
+class NarrationTrack:
+    """Clips placed at sample offsets, mixed into one buffer on demand."""
+
+    def __init__(self):
+        # (sample offset, path, linear gain)
+        self.clips: List[Tuple[int, Path, float]] = []
+        self._samples: Dict[Path, np.ndarray] = {}
+
+    def add(self, path: Path, time: float, gain_db: Optional[float] = None) -> None:
+        if path not in self._samples:
+            self._samples[path] = decode_audio(path)
+        gain = 10 ** (gain_db / 20) if gain_db else 1.0
+        self.clips.append((int(round(time * SAMPLE_RATE)), path, gain))
+
+    @property
+    def duration(self) -> float:
+        """End of the last clip, in seconds."""
+        end = max((offset + len(self._samples[path]) for offset, path, _ in self.clips), default=0)
+        return end / SAMPLE_RATE
+
+    def mix(self, num_samples: int) -> np.ndarray:
+        """Sum all clips into a buffer of exactly ``num_samples`` samples."""
+        length = max(num_samples, int(round(self.duration * SAMPLE_RATE)))
+        track = np.zeros(length, dtype=np.float32)
+        for offset, path, gain in self.clips:
+            samples = self._samples[path]
+            if gain == 1.0:
+                track[offset:offset + len(samples)] += samples
+            else:
+                track[offset:offset + len(samples)] += samples * gain
+        np.clip(track, -1.0, 1.0, out=track)
+        return track[:num_samples]
+
+    def encode(self, stream, duration: float) -> Iterator[av.Packet]:
+        """Encode ``duration`` seconds of the mixed track with ``stream``'s encoder."""
+        track = self.mix(int(round(duration * SAMPLE_RATE)))
+        time_base = Fraction(1, SAMPLE_RATE)
+        for start in range(0, len(track), FRAME_SAMPLES):
+            chunk = track[start:start + FRAME_SAMPLES]
+            frame = av.AudioFrame.from_ndarray(chunk.reshape(1, -1), format="flt", layout=CHANNEL_LAYOUT)
+            frame.sample_rate = SAMPLE_RATE
+            frame.pts = start
+            frame.time_base = time_base
+            yield from stream.encode(frame)
+        yield from stream.encode()
+
+
+class NarrationFileWriter(FrameHoldFileWriter):
+    """Scene file writer that mixes added sounds into one narration track."""
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.narration = NarrationTrack()
+
+    def add_sound(self, sound_file, time=None, gain=None, **kwargs):
+        if kwargs:
+            super().add_sound(sound_file, time, gain, **kwargs)
+            return
+        if time is None:
+            time = self.narration.duration
+        self.narration.add(get_full_sound_file_path(sound_file), time, gain)
+
+    def combine_to_movie(self):
+        if self.narration.clips and self.includes_sound:
+            # Some sound went through pydub directly; mix everything there.
+            for offset, path, gain in self.narration.clips:
+                gain_db = 20 * np.log10(gain) if gain != 1.0 else None
+                SceneFileWriter.add_sound(self, str(path), offset / SAMPLE_RATE, gain_db)
+            self.narration = NarrationTrack()
+        super().combine_to_movie()
+
+    def combine_files(self, input_files, output_file, create_gif=False, includes_sound=False):
+        codec = NARRATION_CODECS.get(config.movie_file_extension)
+        if create_gif or codec is None or not self.narration.clips or Path(output_file) != Path(self.movie_file_path):
+            super().combine_files(input_files, output_file, create_gif, includes_sound)
+            return
+
+        file_list = self.partial_movie_directory / "partial_movie_file_list.txt"
+        with file_list.open("w", encoding="utf-8") as fp:
+            fp.write("# This file is used internally by FFMPEG.\n")
+            for pf_path in input_files:
+                fp.write(f"file 'file:{Path(pf_path).as_posix()}'\n")
+
+        logger.info(f"Mixing {len(self.narration.clips)} narration clips into the movie")
+        # The narration is cut to the length of the video, so read it once
+        # for its duration before the packets are interleaved.
+        with self._open_partial_movies(file_list) as partial_movies_input:
+            duration = 0.0
+            for packet in partial_movies_input.demux(partial_movies_input.streams.video[0]):
+                if packet.pts is not None:
+                    end = packet.pts + (packet.duration or 0)
+                    duration = max(duration, float(end * packet.time_base))
+
+        with self._open_partial_movies(file_list) as partial_movies_input:
+            partial_movies_stream = partial_movies_input.streams.video[0]
+            with av.open(str(output_file), mode="w", options={"shortest": "1"}) as output_container:
+                video_stream = output_container.add_stream(template=partial_movies_stream)
+                audio_stream = output_container.add_stream(codec, rate=SAMPLE_RATE, layout=CHANNEL_LAYOUT)
+                video_packets = (
+                    packet for packet in partial_movies_input.demux(partial_movies_stream) if packet.dts is not None
+                )
+                for packet in interleave_packets(video_packets, self.narration.encode(audio_stream, duration)):
+                    if packet.stream.type == "video":
+                        packet.dts = None
+                        packet.stream = video_stream
+                    output_container.mux(packet)
+
+    @staticmethod
+    def _open_partial_movies(file_list: Path):
+        return av.open(str(file_list), options={"safe": "0", "an": "1"}, format="concat")
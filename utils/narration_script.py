@@ -0,0 +1,72 @@
+"""
+Per-language narration scripts.
+
+A scene's visuals and its source-language voiceover texts live in the scene
+file. Other languages are provided as JSON scripts next to it, one per scene
+file and language, e.g. ``cipher/narration/des.vi.json``::
+
+    {
+      "service": {"lang": "vi"},
+      "texts": {
+        "Welcome to this explanation of the Data Encryption Standard, or DES.":
+          "Chào mừng bạn đến với phần giải thích về Tiêu chuẩn Mã hóa Dữ liệu (DES)."
+      }
+    }
+
+``texts`` maps each source text (whitespace-normalized) to its translation;
+``service`` holds attributes to set on the speech service for this language,
+such as the gTTS ``lang``. Set ``ANIM_LANG`` to render a scene in a language;
+see ``utils.multilang_render`` to render every language in one run.
+"""
+
+import os
+import json
+import inspect
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.voiceover_cache import normalize_text
+
+LANG_ENV_VAR = "ANIM_LANG"
+NARRATION_DIRECTORY = "narration"
+
+
+def script_path(scene_file: str, lang: str) -> Path:
+    """Location of the ``lang`` script for the scenes in ``scene_file``."""
+    scene_file = Path(scene_file)
+    return scene_file.parent / NARRATION_DIRECTORY / f"{scene_file.stem}.{lang}.json"
+
+
+class NarrationScript:
+    """Translations of a scene file's voiceover texts into one language."""
+
+    def __init__(self, lang: str, texts: Optional[Dict[str, str]] = None, service: Optional[Dict] = None):
+        self.lang = lang
+        self.texts = {normalize_text(source): text for source, text in (texts or {}).items() if text}
+        self.service = service or {}
+
+    @classmethod
+    def for_scene(cls, scene_class, lang: str) -> "NarrationScript":
+        """Load the script for ``scene_class``'s file, or an empty one if it has none."""
+        path = script_path(inspect.getfile(scene_class), lang)
+        if not path.exists():
+            return cls(lang)
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(lang, data.get("texts"), data.get("service"))
+
+    def has_translation(self, text: str) -> bool:
+        return normalize_text(text) in self.texts
+
+    def translate(self, text: str) -> str:
+        """Return the translation of ``text``, or ``text`` itself if there is none."""
+        return self.texts.get(normalize_text(text), text)
+
+    def configure_service(self, speech_service) -> None:
+        for attribute, value in self.service.items():
+            setattr(speech_service, attribute, value)
+
+
+def current_lang() -> Optional[str]:
+    lang = os.environ.get(LANG_ENV_VAR, "").strip()
+    return lang or None
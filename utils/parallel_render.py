@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Parallel Scene Renderer
+
+Renders a single long scene on several cores by splitting it into ranges of
+animations:
+
+1. A timeline pass runs ``construct()`` with every animation skipped, so
+   nothing is rasterized, and records the run time of each ``play()`` call.
+   This pass also warms the voiceover cache, so the workers never synthesize
+   the same clip concurrently.
+2. Worker processes replay ``construct()`` and rasterize only their share of
+   the animations (manim's ``-n`` range). Ranges are balanced by run time, not
+   by animation count, and each worker writes its partial movie files into
+   the shared cache directory.
+3. A final pass renders the scene normally. Every animation is now found in
+   the partial movie cache, so this pass only stitches the partial movies in
+   order and mixes the audio.
+
+The unit of work is one ``play()`` call, so a single animation that is longer
+than the others cannot be split further.
+
+Usage:
+    python -m utils.parallel_render cipher/des.py DESRoundScene -q h -j 8 -p
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+QUALITY_FLAGS = {
+    'l': 'low_quality',
+    'm': 'medium_quality',
+    'h': 'high_quality',
+    'p': 'production_quality',
+    'k': 'fourk_quality',
+}
+
+
+def configure(overrides: Dict) -> None:
+    """Apply config overrides in a worker process (each task gets a fresh one)."""
+    from manim import config
+
+    # config.update, unlike tempconfig, also accepts derived options such as quality.
+    config.update(overrides)
+
+
+def load_scene_class(scene_file: str, scene_name: str):
+    """Import ``scene_file`` the way manim does and return the scene class."""
+    from manim.utils.module_ops import get_module
+
+    module = get_module(Path(scene_file))
+    return getattr(module, scene_name)
+
+
+def record_timeline(scene_file: str, scene_name: str, overrides: Dict) -> List[float]:
+    """Run the scene without rasterizing and return the run time of each play()."""
+    configure({**overrides, "dry_run": True})
+    scene = load_scene_class(scene_file, scene_name)(skip_animations=True)
+    renderer = scene.renderer
+    durations = []
+    play = renderer.play
+
+    def timed_play(scene, *args, **kwargs):
+        start = renderer.time
+        play(scene, *args, **kwargs)
+        durations.append(renderer.time - start)
+
+    renderer.play = timed_play
+    scene.render()
+    return durations
+
+
+def render_range(scene_file: str, scene_name: str, overrides: Dict, first: int, last: int) -> float:
+    """Rasterize animations ``first``..``last`` into the partial movie cache."""
+    started = time.perf_counter()
+    configure({
+        **overrides,
+        "from_animation_number": first,
+        "upto_animation_number": last,
+    })
+    scene = load_scene_class(scene_file, scene_name)()
+    # Only the partial movie files are wanted here: combining them (and
+    # cleaning the cache) is left to the final pass, so that workers do
+    # not race on the shared output files.
+    scene.renderer.file_writer.finish = lambda: None
+    scene.render()
+    return time.perf_counter() - started
+
+
+def render_combined(scene_file: str, scene_name: str, overrides: Dict, preview: bool) -> None:
+    """Render the whole scene from the partial movie cache and mix its audio."""
+    configure(overrides)
+    scene = load_scene_class(scene_file, scene_name)()
+    scene.render(preview=preview)
+
+
+def split_timeline(durations: List[float], jobs: int) -> List[Tuple[int, int]]:
+    """
+    Split the animations into at most ``jobs`` contiguous ranges of similar run time.
+
+    Returns:
+        Inclusive (first, last) animation indices for each range
+    """
+    if not durations:
+        return []
+    jobs = max(1, min(jobs, len(durations)))
+    target = sum(durations) / jobs
+
+    ranges = []
+    first = 0
+    elapsed = 0.0
+    for index, duration in enumerate(durations):
+        elapsed += duration
+        remaining_ranges = jobs - len(ranges) - 1
+        remaining_animations = len(durations) - index - 1
+        if remaining_ranges == 0:
+            break
+        if elapsed >= target * (len(ranges) + 1) or remaining_animations == remaining_ranges:
+            ranges.append((first, index))
+            first = index + 1
+    ranges.append((first, len(durations) - 1))
+    return ranges
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render one scene in parallel ranges of animations')
+    parser.add_argument('file', help='Python file containing the scene')
+    parser.add_argument('scene', help='Name of the scene class to render')
+    parser.add_argument('-q', '--quality', choices=sorted(QUALITY_FLAGS), default='h',
+                        help='Render quality, as in manim -q (default: h)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: number of cores)')
+    parser.add_argument('--media_dir', help='Media directory, as in manim --media_dir')
+    parser.add_argument('-p', '--preview', action='store_true',
+                        help='Open the combined movie when done')
+
+    args = parser.parse_args()
+
+    overrides = {
+        "input_file": args.file,
+        "quality": QUALITY_FLAGS[args.quality],
+        "disable_caching": False,
+    }
+    if args.media_dir:
+        overrides["media_dir"] = args.media_dir
+
+    started = time.perf_counter()
+    # One fresh process per task: manim's config and the scene module are global state.
+    pool = ProcessPoolExecutor(max_workers=args.jobs, mp_context=get_context("spawn"),
+                               max_tasks_per_child=1)
+    with pool:
+        print(f"Recording timeline of {args.scene}...")
+        durations = pool.submit(record_timeline, args.file, args.scene, overrides).result()
+        ranges = split_timeline(durations, args.jobs)
+        print(f"{len(durations)} animations, {sum(durations):.1f}s of video, "
+              f"split into {len(ranges)} ranges")
+
+        futures = []
+        for first, last in ranges:
+            futures.append(pool.submit(render_range, args.file, args.scene, overrides, first, last))
+
+        for (first, last), future in zip(ranges, futures):
+            elapsed = future.result()
+            share = sum(durations[first:last + 1])
+            print(f"  animations {first}-{last} ({share:.1f}s of video) rendered in {elapsed:.1f}s")
+
+    print("Combining partial movies...")
+    render_combined(args.file, args.scene, overrides, args.preview)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
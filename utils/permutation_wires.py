@@ -0,0 +1,88 @@
+"""
+Wires of a permutation or expansion table, drawn as one mobject.
+
+DES-style tables list, for every output position, the 1-based input position
+it is taken from. ``PermutationWires`` draws one curve per output, from its
+input (above) to its output (below), for a whole table at once::
+
+    wires = PermutationWires(P, input_bits, output_bits, color=YELLOW)
+    self.play(GrowWires(wires))
+
+Every wire is a single cubic Bezier whose control points are computed for all
+wires in one NumPy expression and stored as the subpaths of one
+``VMobject``, so the 64 wires of IP cost one mobject and no sampling.
+``points_at`` places something on every wire at once, for bits that travel
+along them (see ``utils.bezier``). ``Create`` would draw the subpaths one
+after another; ``GrowWires`` draws them all at the same time, like a group of
+separate arrows.
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+from manim import DOWN, UP, Animation, Mobject, VMobject
+
+from utils.bezier import arc_length_table, partial_curves
+
+Anchors = Union[Sequence[Mobject], np.ndarray]
+
+
+def _anchor_points(anchors: Anchors, edge: np.ndarray) -> np.ndarray:
+    if isinstance(anchors, np.ndarray):
+        return anchors.reshape(-1, 3).astype(float)
+    return np.array([mobject.get_edge_center(edge) for mobject in anchors], dtype=float)
+
+
+class PermutationWires(VMobject):
+    """One curve per table entry, from ``sources[table[i] - 1]`` to ``targets[i]``."""
+
+    def __init__(self, table: Sequence[int], sources: Anchors, targets: Anchors, bend: float = 0.5, **kwargs):
+        """
+        Args:
+            table: 1-based input position of every output, as printed in the standard
+            sources: Input mobjects (wires leave their bottom edge) or an ``(n, 3)`` array of points
+            targets: Output mobjects (wires enter their top edge) or points, one per table entry
+            bend: How far the curves leave and enter vertically, as a fraction of the height they cross
+        """
+        super().__init__(**kwargs)
+        self.table = np.asarray(table, dtype=int)
+        starts = _anchor_points(sources, DOWN)
+        ends = _anchor_points(targets, UP)
+        if len(ends) != len(self.table):
+            raise ValueError(f"{len(self.table)} table entries but {len(ends)} targets")
+        if self.table.min() < 1 or self.table.max() > len(starts):
+            raise ValueError(f"Table refers to inputs outside 1..{len(starts)}")
+
+        # Control points of every wire at once: (wires, 4, 3)
+        starts = starts[self.table - 1]
+        drop = (starts[:, 1] - ends[:, 1])[:, None] * bend * UP
+        curves = np.stack([starts, starts - drop, ends + drop, ends], axis=1)
+        # Wires don't share endpoints, so each cubic becomes its own subpath.
+        self.set_points(curves.reshape(-1, 3))
+
+    @property
+    def curves(self) -> np.ndarray:
+        """Control points of every wire where it is now, shape ``(wires, 4, 3)``."""
+        return self.points.reshape(-1, 4, 3)
+
+    def points_at(self, proportion: float) -> np.ndarray:
+        """Where every wire is ``proportion`` of its length along, ``(wires, 3)``."""
+        return arc_length_table(self.curves).points(proportion)
+
+    def unused_inputs(self, width: int) -> np.ndarray:
+        """0-based inputs of a ``width``-bit input that no wire reads (the parity bits of PC-1)."""
+        return np.setdiff1d(np.arange(width), self.table - 1)
+
+
+class GrowWires(Animation):
+    """Draw every wire of ``PermutationWires`` from its input to its output, all at once."""
+
+    def __init__(self, wires: PermutationWires, **kwargs):
+        super().__init__(wires, introducer=True, **kwargs)
+
+    def begin(self) -> None:
+        self.curves = self.mobject.curves.copy()
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        self.mobject.set_points(partial_curves(self.curves, self.rate_func(alpha)).reshape(-1, 3))
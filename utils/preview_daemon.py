@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Manim Preview Daemon
+
+A long-lived process that imports manim and manim_voiceover once, watches the
+project's scene files and forks a render worker from the warm parent for every
+preview request or file change. The forked worker only has to execute the
+scene module itself, so a save re-renders without paying the interpreter and
+library start-up cost again.
+
+Editor tasks talk to the daemon over a local Unix socket:
+
+    python -m utils.preview_daemon serve
+    python -m utils.preview_daemon render -pql cipher/des.py DESRoundScene
+
+When no daemon is listening, ``render`` falls back to a regular
+``python -m manim`` run so the editor tasks keep working either way. Either
+way ``render`` exits with manim's exit code: the worker ends its output with
+a status line that the client strips and exits with.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import subprocess
+from typing import Dict, List, Optional
+
+
+DEFAULT_SOCKET_NAME = ".manim-preview.sock"
+IGNORED_DIRECTORIES = {".git", ".venv", "venv", "media", "__pycache__", ".github"}
+POLL_INTERVAL = 0.25
+# Starts the worker's last line on the socket; the exit code follows.
+STATUS_PREFIX = b"\0preview-exit-status "
+
+
+def default_socket_path(root: str) -> str:
+    """Return the socket path used for the project rooted at ``root``."""
+    return os.path.join(os.path.abspath(root), DEFAULT_SOCKET_NAME)
+
+
+def warm_up() -> None:
+    """Import the heavy modules every render needs, once, in the parent."""
+    import manim  # noqa: F401
+    import manim.__main__  # noqa: F401
+
+    for module in (
+        "manim_voiceover",
+        "manim_voiceover.services.gtts",
+        "manim_voiceover.services.openai",
+    ):
+        try:
+            __import__(module)
+        except Exception as e:
+            print(f"Warning: could not pre-import {module}: {e}")
+
+
+def scan_scene_files(root: str) -> Dict[str, float]:
+    """Map every Python file below ``root`` to its modification time."""
+    mtimes = {}
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if d not in IGNORED_DIRECTORIES]
+        for name in files:
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                continue
+    return mtimes
+
+
+def find_scene_file(argv: List[str], cwd: str) -> Optional[str]:
+    """Return the absolute path of the first ``.py`` argument of a manim command."""
+    for arg in argv:
+        if arg.endswith(".py"):
+            return os.path.abspath(os.path.join(cwd, arg))
+    return None
+
+
+class PreviewDaemon:
+    """Accepts render requests on a Unix socket and re-renders on file changes."""
+
+    def __init__(self, root: str, socket_path: str):
+        self.root = os.path.abspath(root)
+        self.socket_path = socket_path
+        # scene file -> (argv, cwd) of the last request that rendered it
+        self.requests: Dict[str, tuple] = {}
+        self.last_request: Optional[tuple] = None
+        # scene file -> pid of the worker currently rendering it
+        self.workers: Dict[str, int] = {}
+        self.mtimes = scan_scene_files(self.root)
+
+    def imported_files(self) -> set:
+        """Files of project modules that live in the warm parent."""
+        files = set()
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None)
+            if path and os.path.abspath(path).startswith(self.root + os.sep):
+                files.add(os.path.abspath(path))
+        return files
+
+    def serve(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        server.settimeout(POLL_INTERVAL)
+        print(f"Preview daemon listening on {self.socket_path}")
+        print(f"Watching {len(self.mtimes)} Python files under {self.root}")
+
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    conn = None
+
+                if conn is not None:
+                    self.handle_connection(conn)
+
+                self.reap_workers()
+                self.check_for_changes(server)
+        except KeyboardInterrupt:
+            print("Preview daemon stopped.")
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def handle_connection(self, conn: socket.socket) -> None:
+        conn.settimeout(5)
+        try:
+            with conn.makefile("r", encoding="utf-8") as reader:
+                request = json.loads(reader.readline())
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring malformed request: {e}")
+            conn.close()
+            return
+
+        argv = request["argv"]
+        cwd = request.get("cwd", self.root)
+        scene_file = find_scene_file(argv, cwd)
+        if scene_file is not None:
+            self.requests[scene_file] = (argv, cwd)
+        self.last_request = (argv, cwd)
+        self.fork_worker(scene_file, argv, cwd, conn)
+
+    def fork_worker(self, scene_file: Optional[str], argv: List[str], cwd: str,
+                    conn: Optional[socket.socket] = None) -> None:
+        """Fork a render worker; its output goes to ``conn`` when given."""
+        previous = self.workers.pop(scene_file, None)
+        if previous is not None:
+            # A newer save supersedes a render that is still running.
+            try:
+                os.kill(previous, signal.SIGTERM)
+                os.waitpid(previous, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            self.run_worker(argv, cwd, conn, started)
+
+        if conn is not None:
+            conn.close()
+        self.workers[scene_file] = pid
+        print(f"[{pid}] manim {' '.join(argv)}")
+
+    def run_worker(self, argv: List[str], cwd: str, conn: Optional[socket.socket],
+                   started: float) -> None:
+        """Body of the forked worker. Never returns."""
+        code = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if conn is not None:
+                conn.settimeout(None)
+                os.dup2(conn.fileno(), 1)
+                os.dup2(conn.fileno(), 2)
+            os.chdir(cwd)
+            if cwd not in sys.path:
+                sys.path.insert(0, cwd)
+
+            from manim.__main__ import main as manim_main
+
+            print(f"Forked from warm daemon in {time.perf_counter() - started:.3f}s", flush=True)
+            result = manim_main(argv, standalone_mode=False)
+            code = result if isinstance(result, int) else 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException as e:
+            print(f"Error: {e}", file=sys.stderr)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if conn is not None:
+                os.write(1, STATUS_PREFIX + f"{code}\n".encode("ascii"))
+            os._exit(code)
+
+    def reap_workers(self) -> None:
+        for scene_file, pid in list(self.workers.items()):
+            try:
+                finished, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished, status = pid, 0
+            if finished:
+                del self.workers[scene_file]
+                print(f"[{pid}] finished with status {os.waitstatus_to_exitcode(status)}")
+
+    def check_for_changes(self, server: socket.socket) -> None:
+        mtimes = scan_scene_files(self.root)
+        changed = [path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime]
+        self.mtimes = mtimes
+        if not changed:
+            return
+
+        if self.imported_files().intersection(changed):
+            # The daemon itself imported one of the changed modules, so a
+            # forked worker would see the stale version: restart in place.
+            print("A module loaded by the daemon changed, restarting...")
+            server.close()
+            os.unlink(self.socket_path)
+            os.execv(sys.executable, [sys.executable, "-m", "utils.preview_daemon", *sys.argv[1:]])
+
+        for path in changed:
+            request = self.requests.get(path, self.last_request)
+            if request is None:
+                continue
+            print(f"Changed: {os.path.relpath(path, self.root)}")
+            argv, cwd = request
+            self.fork_worker(find_scene_file(argv, cwd), argv, cwd)
+            break
+
+
+def send_render_request(socket_path: str, argv: List[str]) -> Optional[int]:
+    """Forward a manim command line to the daemon and stream its output.
+
+    Returns the render's exit code, 1 if the worker ended without reporting
+    one (e.g. a newer save superseded it), or None when no daemon is
+    listening on ``socket_path``.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+
+    with client:
+        request = {"argv": argv, "cwd": os.getcwd()}
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        # Output from the last NUL byte on may be the status line; it is
+        # held back until more output or the end of the stream shows.
+        pending = b""
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            pending += chunk
+            held = pending.rfind(b"\0")
+            if held < 0:
+                held = len(pending)
+            sys.stdout.buffer.write(pending[:held])
+            sys.stdout.flush()
+            pending = pending[held:]
+
+    code = None
+    if pending.startswith(STATUS_PREFIX) and pending.endswith(b"\n"):
+        status = pending[len(STATUS_PREFIX):-1]
+        if status.lstrip(b"-").isdigit():
+            code = int(status)
+            pending = b""
+    sys.stdout.buffer.write(pending)
+    sys.stdout.flush()
+    if code is None:
+        print("Preview worker ended without an exit status.", file=sys.stderr)
+        return 1
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm manim preview daemon and its editor client',
+                                     allow_abbrev=False)
+    parser.add_argument('--socket', help='Socket path (defaults to <root>/.manim-preview.sock)')
+    parser.add_argument('--root', default='.', help='Project root to watch')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('serve', help='Start the daemon in the foreground')
+    subparsers.add_parser('render', allow_abbrev=False,
+                          help='Render through the daemon; remaining arguments go to manim')
+
+    args, manim_args = parser.parse_known_args()
+    socket_path = args.socket or default_socket_path(args.root)
+
+    if args.command == 'serve' and manim_args:
+        parser.error(f"unrecognized arguments: {' '.join(manim_args)}")
+
+    if args.command == 'serve':
+        if not hasattr(os, 'fork'):
+            print("Error: the preview daemon needs os.fork()", file=sys.stderr)
+            return 1
+        warm_up()
+        PreviewDaemon(args.root, socket_path).serve()
+        return 0
+
+    code = send_render_request(socket_path, manim_args)
+    if code is not None:
+        return code
+
+    print("Preview daemon not running, falling back to a fresh manim process.")
+    return subprocess.call([sys.executable, '-m', 'manim', *manim_args])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Table mobject drawn as one raster image plus one mesh of cell borders.
+
+A table built from ``VGroup(Rectangle, Text)`` cells costs a Pango layout per
+entry to construct and a path per glyph every frame; a full S-box or
+permutation table runs into thousands of mobjects. ``RasterTable`` draws every
+entry (and optional row and column labels) into a single image with Pillow,
+and every border into a single ``VMobject``, so a table of any size costs
+about as much as one image::
+
+    table = RasterTable(SBOXES[0], row_labels=[f"{r:02b}" for r in range(4)],
+                        column_labels=[f"{c:04b}" for c in range(16)])
+    self.play(FadeIn(table))
+    self.play(FadeIn(table.highlight_row(2)), FadeIn(table.highlight_column(5)))
+    self.play(Flash(table.cell_center(2, 5)))
+
+Highlights are separate, lightweight overlay rectangles: the caller adds,
+animates and removes them, and the table itself never changes. Labels sit at
+row or column ``-1``.
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+from manim import BLUE, DOWN, LEFT, RIGHT, UL, UP, WHITE, YELLOW, Group, ImageMobject, Rectangle, VMobject
+from manim.utils.color import ManimColor
+from PIL import Image, ImageDraw, ImageFont
+
+# Fonts tried in order before Pillow's built-in one
+FONT_NAMES = ("DejaVuSansMono.ttf", "DejaVuSans.ttf", "Arial.ttf")
+
+
+@lru_cache(maxsize=None)
+def _load_font(size: int):
+    for name in FONT_NAMES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 has only the bitmap font
+        return ImageFont.load_default()
+
+
+def _fit_font(draw: ImageDraw.ImageDraw, texts: Sequence[str], width: int, height: int):
+    """The largest font at which every one of ``texts`` fits a ``width`` x ``height`` box."""
+    size = height
+    while size > 6:
+        font = _load_font(size)
+        boxes = [draw.textbbox((0, 0), text, font=font) for text in texts]
+        if all(right - left <= width and bottom - top <= height for left, top, right, bottom in boxes):
+            return font
+        size -= 1
+    return _load_font(size)
+
+
+def _rgba(color) -> tuple:
+    return tuple(int(round(channel * 255)) for channel in ManimColor(color).to_rgba())
+
+
+class RasterTable(Group):
+    """A grid of values rasterized into one image, with one mesh for the borders."""
+
+    def __init__(
+        self,
+        values: Sequence[Sequence],
+        cell_width: float = 0.5,
+        cell_height: float = 0.5,
+        color=WHITE,
+        row_labels: Optional[Sequence[str]] = None,
+        column_labels: Optional[Sequence[str]] = None,
+        row_label_color=YELLOW,
+        column_label_color=BLUE,
+        line_color=WHITE,
+        line_width: float = 2,
+        text_fill: float = 0.6,
+        pixels_per_unit: int = 160,
+        **kwargs,
+    ):
+        """
+        Args:
+            values: Rows of entries; anything ``str`` accepts
+            cell_width, cell_height: Size of one cell in scene units
+            row_labels, column_labels: Optional labels drawn left of and above the grid
+            text_fill: Fraction of the cell height the tallest entry may take
+            pixels_per_unit: Resolution of the image; 160 is sharp at 1080p
+        """
+        super().__init__(**kwargs)
+        self.values = [[str(value) for value in row] for row in values]
+        self.rows = len(self.values)
+        self.columns = len(self.values[0]) if self.rows else 0
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        # Grid offsets of the first value cell: labels take one cell each
+        self.row_offset = 1 if column_labels is not None else 0
+        self.column_offset = 1 if row_labels is not None else 0
+
+        self.image = ImageMobject(self._rasterize(
+            row_labels, column_labels, color, row_label_color, column_label_color, text_fill, pixels_per_unit
+        ))
+        self.image.stretch_to_fit_width(self.grid_columns * cell_width)
+        self.image.stretch_to_fit_height(self.grid_rows * cell_height)
+        self.mesh = self._create_mesh(line_color, line_width)
+        self.add(self.image, self.mesh)
+
+    @property
+    def grid_rows(self) -> int:
+        return self.rows + self.row_offset
+
+    @property
+    def grid_columns(self) -> int:
+        return self.columns + self.column_offset
+
+    def _rasterize(self, row_labels, column_labels, color, row_label_color, column_label_color, text_fill, pixels_per_unit):
+        cell_px = (max(int(self.cell_width * pixels_per_unit), 1), max(int(self.cell_height * pixels_per_unit), 1))
+        image = Image.new("RGBA", (cell_px[0] * self.grid_columns, cell_px[1] * self.grid_rows), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        box = (int(cell_px[0] * 0.9), int(cell_px[1] * text_fill))
+
+        # (texts, color, grid cells) per kind of entry; each kind gets one font size
+        kinds = [(
+            [value for row in self.values for value in row],
+            color,
+            [(r + self.row_offset, c + self.column_offset) for r in range(self.rows) for c in range(self.columns)],
+        )]
+        if row_labels is not None:
+            kinds.append((list(row_labels), row_label_color, [(r + self.row_offset, 0) for r in range(self.rows)]))
+        if column_labels is not None:
+            kinds.append((list(column_labels), column_label_color, [(0, c + self.column_offset) for c in range(self.columns)]))
+
+        for texts, text_color, cells in kinds:
+            if not texts:
+                continue
+            font = _fit_font(draw, texts, *box)
+            fill = _rgba(text_color)
+            for text, (row, column) in zip(texts, cells):
+                left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+                x = column * cell_px[0] + (cell_px[0] - (right - left)) / 2 - left
+                y = row * cell_px[1] + (cell_px[1] - (bottom - top)) / 2 - top
+                draw.text((x, y), text, font=font, fill=fill)
+        return np.array(image)
+
+    def _create_mesh(self, line_color, line_width) -> VMobject:
+        # Borders around the value cells only, one subpath per line
+        mesh = VMobject(stroke_color=line_color, stroke_width=line_width)
+        for row in range(self.rows + 1):
+            mesh.start_new_path(self.grid_point(row, 0))
+            mesh.add_line_to(self.grid_point(row, self.columns))
+        for column in range(self.columns + 1):
+            mesh.start_new_path(self.grid_point(0, column))
+            mesh.add_line_to(self.grid_point(self.rows, column))
+        return mesh
+
+    def grid_point(self, row: float, column: float) -> np.ndarray:
+        """Scene point at the top-left corner of value cell ``(row, column)``; fractions allowed."""
+        unit_x = self.image.width / self.grid_columns
+        unit_y = self.image.height / self.grid_rows
+        return (
+            self.image.get_corner(UL)
+            + RIGHT * unit_x * (column + self.column_offset)
+            + DOWN * unit_y * (row + self.row_offset)
+        )
+
+    def cell_center(self, row: int, column: int) -> np.ndarray:
+        """Center of cell ``(row, column)``; ``-1`` is the label row or column."""
+        return self.grid_point(row + 0.5, column + 0.5)
+
+    def highlight_cell(self, row: int, column: int, color=YELLOW, opacity: float = 0.3) -> Rectangle:
+        """An overlay over one cell."""
+        return self._overlay(row, column, row + 1, column + 1, color, opacity)
+
+    def highlight_row(self, row: int, color=YELLOW, opacity: float = 0.3, include_label: bool = True) -> Rectangle:
+        """An overlay over a row, with its label unless ``include_label`` is False."""
+        start = -self.column_offset if include_label else 0
+        return self._overlay(row, start, row + 1, self.columns, color, opacity)
+
+    def highlight_column(self, column: int, color=BLUE, opacity: float = 0.3, include_label: bool = True) -> Rectangle:
+        """An overlay over a column, with its label unless ``include_label`` is False."""
+        start = -self.row_offset if include_label else 0
+        return self._overlay(start, column, self.rows, column + 1, color, opacity)
+
+    def _overlay(self, top: int, left: int, bottom: int, right: int, color, opacity: float) -> Rectangle:
+        top_left = self.grid_point(top, left)
+        bottom_right = self.grid_point(bottom, right)
+        size = bottom_right - top_left
+        overlay = Rectangle(width=abs(size[0]), height=abs(size[1]), color=color, stroke_width=2)
+        overlay.set_fill(color, opacity=opacity)
+        return overlay.move_to((top_left + bottom_right) / 2)
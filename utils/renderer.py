@@ -0,0 +1,302 @@
+"""
+Cairo renderer and scene file writer with frame-level caching.
+
+Narrated scenes spend most of their run time on held poses: voiceover blocks
+wait for the narration to finish and ``self.wait`` keeps the frame still. The
+stock renderer still rasterizes every one of those frames with Cairo and
+encodes every copy. ``CachingCairoRenderer`` fingerprints the state of the
+moving mobjects before each frame and only rasterizes when it changed;
+``FrameHoldFileWriter`` encodes a run of identical frames as a variable frame
+rate hold (the first and the last frame of the run), so a long narrated hold
+costs two encoded frames regardless of its length.
+
+Manim rasterizes the mobjects that do not move during a ``play()`` into a
+static background once per call. Titles, boxes and tables usually stay put for
+many calls in a row, so the renderer also keeps the last few of these
+background layers, keyed by the state of the mobjects in them, and reuses a
+layer as long as nothing in it changed.
+
+Set ``ANIM_FRAME_HOLDS=repeat`` to write every repeated frame instead of a
+variable frame rate hold, e.g. for editors that only accept constant frame
+rate footage.
+
+Set ``ANIM_FRAME_RING=<slots>`` to encode in a separate process that reads
+frames from a shared-memory ring the camera rasterizes into, and
+``ANIM_ENCODE_WORKERS=<n>`` to encode chunks of each partial movie in ``n``
+processes at once (see ``utils.frame_ring``).
+"""
+
+import os
+import hashlib
+from collections import OrderedDict
+from fractions import Fraction
+from typing import Iterable, Optional
+
+import numpy as np
+from manim import config, logger
+from manim.mobject.mobject import Mobject
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate, write_to_movie
+
+from utils.encoding import FrameHoldEncoder
+from utils.frame_ring import FrameRing, chunk_frames, encode_workers, ring_slots
+
+FRAME_HOLDS_ENV_VAR = "ANIM_FRAME_HOLDS"
+
+# Background layers kept around; a few cover scenes that alternate layouts.
+STATIC_LAYER_CACHE_SIZE = 4
+
+# Camera settings that change how the background layer is rasterized.
+CAMERA_ATTRIBUTES = (
+    "pixel_width",
+    "pixel_height",
+    "frame_width",
+    "frame_height",
+    "frame_center",
+    "background_color",
+    "background_opacity",
+)
+
+# Everything the Cairo camera reads when drawing a mobject.
+STATE_ATTRIBUTES = (
+    "points",
+    "fill_rgbas",
+    "stroke_rgbas",
+    "stroke_width",
+    "background_stroke_rgbas",
+    "background_stroke_width",
+    "sheen_factor",
+    "sheen_direction",
+    "z_index",
+    "pixel_array",
+)
+
+
+def partial_movie_settings() -> dict:
+    """The partial movie stream manim would open for the current config."""
+    settings = {
+        "codec": "libx264",
+        "pix_fmt": "yuv420p",
+        "options": {"an": "1", "crf": "23"},
+        "rate": to_av_frame_rate(config.frame_rate),
+        "width": config.pixel_width,
+        "height": config.pixel_height,
+    }
+    if config.movie_file_extension == ".webm":
+        settings["codec"] = "libvpx-vp9"
+        settings["options"]["-auto-alt-ref"] = "1"
+        if config.transparent:
+            settings["pix_fmt"] = "yuva420p"
+    elif config.transparent:
+        settings["codec"] = "qtrle"
+        settings["pix_fmt"] = "argb"
+    return settings
+
+
+def mobject_state_key(mobjects: Iterable[Mobject]) -> bytes:
+    """
+    Fingerprint what the camera would draw for ``mobjects``.
+
+    Two calls return the same key only if the mobjects are the same objects,
+    in the same order, with identical geometry and style.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in mobjects:
+        digest.update(id(mob).to_bytes(8, "little", signed=False))
+        for attribute in STATE_ATTRIBUTES:
+            value = getattr(mob, attribute, None)
+            if value is None:
+                continue
+            if isinstance(value, np.ndarray):
+                digest.update(np.ascontiguousarray(value))
+            else:
+                digest.update(repr(value).encode())
+    return digest.digest()
+
+
+class FrameHoldFileWriter(SceneFileWriter):
+    """Scene file writer that encodes runs of identical frames as holds."""
+
+    frame_ring: Optional[FrameRing] = None
+
+    def open_partial_movie_stream(self, file_path=None) -> None:
+        vfr_holds = os.environ.get(FRAME_HOLDS_ENV_VAR, "vfr").lower() != "repeat"
+        workers = encode_workers()
+        slots = ring_slots(workers=workers)
+        if not slots:
+            super().open_partial_movie_stream(file_path=file_path)
+            time_base = Fraction(1) / to_av_frame_rate(config.frame_rate)
+            # Frames are only queued once this returns, so the writer thread
+            # never sees the stream without its encoder.
+            self._hold_encoder = FrameHoldEncoder(self.video_container, self.video_stream, time_base, vfr_holds)
+            self._last_frame = None
+            return
+
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        settings = {**partial_movie_settings(), "vfr_holds": vfr_holds}
+        if self.frame_ring is None:
+            self.frame_ring = FrameRing(
+                (config.pixel_height, config.pixel_width, 4),
+                slots,
+                workers=workers,
+                # Chunks are joined through MPEG-TS, which carries H.264 only.
+                chunk_frames=chunk_frames(config.frame_rate) if settings["codec"] == "libx264" else 0,
+            )
+        self.frame_ring.open(file_path, settings)
+
+    def write_frame(self, frame_or_renderer, num_frames: int = 1):
+        if self.frame_ring is not None and write_to_movie():
+            self.frame_ring.write(frame_or_renderer, num_frames)
+            return
+        super().write_frame(frame_or_renderer, num_frames)
+
+    def close_partial_movie_stream(self) -> None:
+        if self.frame_ring is None:
+            return super().close_partial_movie_stream()
+        self.frame_ring.close()
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
+
+    def listen_and_write(self):
+        super().listen_and_write()
+        # The stream is about to be flushed: close the last open hold.
+        self._hold_encoder.flush()
+
+    def encode_and_write_frame(self, frame: np.ndarray, num_frames: int) -> None:
+        # The renderer hands over the very same array for a frame it did not
+        # have to rasterize again, so identity is enough to detect a hold.
+        if frame is self._last_frame:
+            self._hold_encoder.repeat(num_frames)
+            return
+        self._hold_encoder.write(frame, num_frames)
+        self._last_frame = frame
+
+    def finish(self) -> None:
+        super().finish()
+        self.close_frame_ring()
+
+    def close_frame_ring(self) -> None:
+        ring = self.frame_ring
+        if ring is None:
+            return
+        ring.shutdown()
+        if ring.frames_sent:
+            logger.info(
+                f"Frame ring: {ring.frames_sent} frames through {ring.shape[1]}x{ring.shape[0]} shared slots "
+                f"({ring.frames_copied} copied in, {ring.frames_repeated} repeats) "
+                f"in {ring.chunks_encoded} chunks; "
+                f"renderer waited on the encoder {ring.producer_waits} times "
+                f"({ring.producer_wait_seconds:.2f}s), encoder idle {ring.consumer_waits} times "
+                f"({ring.consumer_wait_seconds:.2f}s)"
+            )
+
+
+class CachingCairoRenderer(CairoRenderer):
+    """Cairo renderer that only rasterizes frames and layers whose content changed."""
+
+    def __init__(self, file_writer_class=FrameHoldFileWriter, **kwargs):
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+        self.frames_rasterized = 0
+        self.frames_reused = 0
+        self.static_layers_rasterized = 0
+        self.static_layers_reused = 0
+        self._static_layers: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._last_frame: Optional[np.ndarray] = None
+        self._last_frame_key: Optional[bytes] = None
+
+    def render(self, scene, time, moving_mobjects):
+        key = self._frame_key(moving_mobjects)
+        if key == self._last_frame_key:
+            self.frames_reused += 1
+            self.add_frame(self._last_frame)
+            return
+
+        ring = self.file_writer.frame_ring
+        if ring is not None and not self.skip_animations:
+            # Rasterize straight into shared memory; the encoder reads it from there.
+            own_pixel_array = self.camera.pixel_array
+            self.camera.pixel_array = ring.acquire()
+            try:
+                self.update_frame(scene, moving_mobjects)
+            finally:
+                self._last_frame = self.camera.pixel_array
+                # Static layers and frozen frames are drawn into the camera's own array.
+                self.camera.pixel_array = own_pixel_array
+        else:
+            self.update_frame(scene, moving_mobjects)
+            self._last_frame = self.get_frame()
+        self._last_frame_key = key
+        self.frames_rasterized += 1
+        self.add_frame(self._last_frame)
+
+    def _frame_key(self, moving_mobjects) -> bytes:
+        # Background layers are only ever replaced, never drawn into, so the
+        # layer's identity stands in for the state of all non-moving mobjects.
+        static_id = id(self.static_image) if self.static_image is not None else 0
+        return static_id.to_bytes(8, "little") + mobject_state_key(moving_mobjects)
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+        if not static_mobjects or self.skip_animations:
+            # No frame of a skipped animation is written, so it needs no background.
+            return None
+
+        key = self._camera_key() + mobject_state_key(static_mobjects)
+        layer = self._static_layers.pop(key, None)
+        if layer is None:
+            # Tell a culling camera this capture is a layer, not a frame
+            self.camera.capturing_background = True
+            try:
+                layer = super().save_static_frame_data(scene, static_mobjects)
+            finally:
+                self.camera.capturing_background = False
+            self.static_layers_rasterized += 1
+        else:
+            self.static_layers_reused += 1
+        self.static_image = layer
+
+        self._static_layers[key] = layer
+        while len(self._static_layers) > STATIC_LAYER_CACHE_SIZE:
+            self._static_layers.popitem(last=False)
+        return layer
+
+    def _camera_key(self) -> bytes:
+        camera = self.camera
+        state = [getattr(camera, attribute, None) for attribute in CAMERA_ATTRIBUTES]
+        state.append(id(getattr(camera, "background", None)))
+        return repr(state).encode()
+
+    def play(self, scene, *args, **kwargs):
+        # A new play() may change the camera or background; start afresh.
+        self._last_frame = None
+        self._last_frame_key = None
+        super().play(scene, *args, **kwargs)
+
+    def scene_finished(self, scene):
+        total = self.frames_rasterized + self.frames_reused
+        if total:
+            logger.info(
+                f"Rasterized {self.frames_rasterized} of {total} frames "
+                f"({self.frames_reused} reused unchanged)"
+            )
+        layers = self.static_layers_rasterized + self.static_layers_reused
+        if layers:
+            logger.info(
+                f"Rasterized {self.static_layers_rasterized} of {layers} background layers "
+                f"({self.static_layers_reused} reused from earlier animations)"
+            )
+        captured = getattr(self.camera, "frames_captured", 0)
+        if captured:
+            camera = self.camera
+            captures = captured + camera.layers_captured
+            logger.info(
+                f"Culled {camera.mobjects_culled / captured:.1f} mobjects per rasterized frame "
+                f"on average (at most {camera.most_culled_in_frame}), "
+                f"{camera.mobjects_culled_in_layers} in {camera.layers_captured} background layers; "
+                f"culling took {1000 * camera.cull_seconds / captures:.2f} ms per capture"
+            )
+        super().scene_finished(scene)
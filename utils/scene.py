@@ -0,0 +1,346 @@
+"""
+Project-wide base class for narrated scenes.
+
+``NarratedScene`` is a drop-in replacement for manim_voiceover's
+``VoiceoverScene`` that numbers voiceover blocks as they are entered and can
+render only a selected range of them. With the Cairo renderer it also renders
+through ``utils.renderer.CachingCairoRenderer``, which rasterizes held poses
+once and writes them as frame holds, mixes the voiceover clips into one
+narration track (``utils.narration``), and draws with
+``utils.camera.CullingCamera``, which skips invisible and off-frame mobjects.
+
+Selecting a range
+-----------------
+Set ``ANIM_SEGMENT`` to ``<start>..<end>`` before rendering. Each bound is
+either a voiceover block index (0-based, in the order the blocks are entered)
+or a case-insensitive piece of the block's text; an empty bound means the
+beginning or the end of the scene, and a single bound selects one block::
+
+    ANIM_SEGMENT="Let's look at the actual S-Box 1..converted to a 4-bit" \\
+        manim -pql cipher/des.py DESRoundScene
+
+Blocks before the range are fast-forwarded: every animation still runs to its
+end state, but no frames are rendered and no audio is synthesized. The clip is
+written next to the full scene with a ``_segment`` suffix, together with a JSON
+report of where it sits in the full scene.
+
+Set ``ANIM_LANG`` to narrate the scene in another language from a per-language
+script (see ``utils.narration_script``); the movie gets a ``_<lang>`` suffix.
+
+Set ``ANIM_STREAM=hls`` to publish every finished animation to a live HLS
+playlist while the scene renders (see ``utils.streaming``).
+
+Set ``ANIM_BUDGET`` to sample the scene's mobjects at the end of every
+voiceover block (see ``utils.mobject_budget``), and ``ANIM_TTS_PREFETCH`` to
+synthesize upcoming blocks in the background while frames render (see
+``utils.tts_pipeline``).
+
+Bit rows, labels and boxes that a scene builds over and over can come from
+``self.mobject_pool`` and go back with ``self.recycle(...)`` once they are
+off screen (see ``utils.mobject_pool``).
+"""
+
+import os
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from manim import config, logger
+from manim.constants import RendererType
+from manim.utils.exceptions import EndSceneEarlyException
+from manim_voiceover import VoiceoverScene
+from manim_voiceover.helper import remove_bookmarks
+from manim_voiceover.tracker import VoiceoverTracker
+
+from utils.audio_probe import cached_duration
+from utils.camera import CullingCamera
+from utils.mobject_budget import BUDGET_ENV_VAR, MobjectBudgetMonitor, parse_budgets
+from utils.mobject_pool import MobjectPool
+from utils.narration import NarrationFileWriter
+from utils.narration_script import LANG_ENV_VAR, NarrationScript, current_lang
+from utils.renderer import CachingCairoRenderer
+from utils.streaming import StreamingFileWriter, streaming_enabled
+from utils.tts_pipeline import PREFETCH_ENV_VAR, TTSPrefetcher, prefetch_workers, scan_voiceover_texts
+from utils.voiceover_cache import (
+    estimate_speech_duration,
+    find_cached_audio,
+    load_cache_index,
+)
+
+SEGMENT_ENV_VAR = "ANIM_SEGMENT"
+
+SegmentBound = Optional[Union[int, str]]
+
+
+def parse_segment_spec(spec: str) -> Tuple[SegmentBound, SegmentBound]:
+    """Parse ``<start>..<end>`` into a pair of block indices or text fragments."""
+    start, separator, end = spec.partition("..")
+    if not separator:
+        end = start
+
+    def parse_bound(bound: str) -> SegmentBound:
+        bound = bound.strip()
+        if not bound:
+            return None
+        return int(bound) if bound.isdigit() else bound.lower()
+
+    return parse_bound(start), parse_bound(end)
+
+
+def bound_matches(bound: SegmentBound, index: int, text: str) -> bool:
+    if isinstance(bound, int):
+        return index == bound
+    return bound in text.lower()
+
+
+class FastForwardTracker:
+    """Stand-in for ``VoiceoverTracker`` used by blocks that are not rendered."""
+
+    def __init__(self, scene, duration: float):
+        self.scene = scene
+        self.duration = duration
+        self.start_t = scene.renderer.time
+        self.end_t = self.start_t + duration
+
+    def get_remaining_duration(self, buff: float = 0.0) -> float:
+        return max(self.end_t - float(self.scene.renderer.time) + buff, 0.0)
+
+    def time_until_bookmark(self, mark: str, buff: float = 0.0, limit: Optional[float] = None) -> float:
+        # Bookmark timings come from the audio, which is not synthesized here.
+        return 0.0
+
+
+class ProbedVoiceoverTracker(VoiceoverTracker):
+    """``VoiceoverTracker`` that reads the clip length from the file headers."""
+
+    def __init__(self, scene, data, cache_dir):
+        self.scene = scene
+        self.data = data
+        self.cache_dir = cache_dir
+        self.duration = cached_duration(Path(cache_dir) / self.data["final_audio"])
+        last_t = scene.renderer.time or 0
+        self.start_t = last_t
+        self.end_t = last_t + self.duration
+
+        if "word_boundaries" in self.data:
+            self._process_bookmarks()
+
+
+class NarratedScene(VoiceoverScene):
+    """VoiceoverScene with numbered voiceover blocks and segment rendering."""
+
+    def __init__(self, renderer=None, camera_class=CullingCamera, **kwargs):
+        if renderer is None and config.renderer == RendererType.CAIRO:
+            # Rasterize held poses once, write them as frame holds and mix
+            # the voiceover clips into a single narration track.
+            renderer = CachingCairoRenderer(
+                file_writer_class=StreamingFileWriter if streaming_enabled() else NarrationFileWriter,
+                camera_class=camera_class,
+                skip_animations=kwargs.get("skip_animations", False),
+            )
+        super().__init__(renderer=renderer, camera_class=camera_class, **kwargs)
+
+    def setup(self):
+        super().setup()
+        self.voiceover_index = -1
+        self.segment = None
+        self.tts_prefetcher = None
+        self.mobject_pool = MobjectPool()
+        self._setup_language()
+        budget_spec = os.environ.get(BUDGET_ENV_VAR, "").strip()
+        self.budget_monitor = MobjectBudgetMonitor(parse_budgets(budget_spec)) if budget_spec else None
+
+        spec = os.environ.get(SEGMENT_ENV_VAR, "").strip()
+        if not spec:
+            return
+
+        self.segment = parse_segment_spec(spec)
+        self.segment_state = "before"
+        self.segment_blocks = [None, None]
+        self.segment_offset = 0.0
+        self.segment_estimated = False
+        self._cache_entries = None
+
+        # Fast-forward until the first selected block is entered.
+        self._saved_skipping_status = self.renderer._original_skipping_status
+        self.renderer._original_skipping_status = True
+        self.renderer.skip_animations = True
+
+    def _setup_language(self) -> None:
+        self.narration_script = None
+        self.untranslated_blocks = []
+        lang = current_lang()
+        if lang is None:
+            return
+
+        self.narration_script = NarrationScript.for_scene(type(self), lang)
+        file_writer = self.renderer.file_writer
+        if hasattr(file_writer, "movie_file_path"):
+            movie_path = file_writer.movie_file_path
+            file_writer.movie_file_path = movie_path.with_name(f"{movie_path.stem}_{lang}{movie_path.suffix}")
+
+    def _spoken_text(self, text):
+        """The text to synthesize for a block whose source text is ``text``."""
+        if text is None or self.narration_script is None:
+            return text
+        if not self.narration_script.has_translation(text):
+            self.untranslated_blocks.append(self.voiceover_index)
+        return self.narration_script.translate(text)
+
+    def set_speech_service(self, speech_service, **kwargs):
+        if self.narration_script is not None:
+            self.narration_script.configure_service(speech_service)
+        super().set_speech_service(speech_service, **kwargs)
+        workers = prefetch_workers(os.environ.get(PREFETCH_ENV_VAR, ""))
+        if not workers:
+            return
+
+        if self.tts_prefetcher is not None:
+            self.tts_prefetcher.shutdown()
+        texts = scan_voiceover_texts(type(self))
+        if not texts:
+            logger.warning(
+                f"TTS prefetch: {type(self).__name__} has no literal voiceover texts to prefetch; "
+                f"every block is synthesized when it is entered"
+            )
+        if self.segment is not None:
+            # Blocks before the segment are fast-forwarded, never synthesized.
+            start = self.segment[0]
+            first = next((i for i, text in enumerate(texts) if start is None or bound_matches(start, i, text)), len(texts))
+            texts = texts[first:]
+        if self.narration_script is not None:
+            texts = [self.narration_script.translate(text) for text in texts]
+        self.tts_prefetcher = TTSPrefetcher(speech_service, workers)
+        self.tts_prefetcher.prefetch(texts)
+
+    @contextmanager
+    def voiceover(self, text=None, ssml=None, **kwargs):
+        self.voiceover_index += 1
+        spoken = self._spoken_text(text)
+        if self.segment is None:
+            with super().voiceover(text=spoken, ssml=ssml, **kwargs) as tracker:
+                yield tracker
+            self._sample_budget(text if text is not None else (ssml or ""))
+            return
+
+        block_text = text if text is not None else (ssml or "")
+        start, end = self.segment
+        if self.segment_state == "before" and (start is None or bound_matches(start, self.voiceover_index, block_text)):
+            self._begin_segment()
+
+        if self.segment_state == "before":
+            self.current_tracker = FastForwardTracker(self, self._fast_forward_duration(spoken or block_text))
+            try:
+                yield self.current_tracker
+            finally:
+                self.wait_for_voiceover()
+            self._sample_budget(block_text)
+            return
+
+        with super().voiceover(text=spoken, ssml=ssml, **kwargs) as tracker:
+            yield tracker
+        self._sample_budget(block_text)
+
+        self.segment_blocks[1] = self.voiceover_index
+        if end is not None and bound_matches(end, self.voiceover_index, block_text):
+            self.segment_state = "after"
+            raise EndSceneEarlyException()
+
+    def _add_voiceover_text(self, text, service_kwargs, subcaption=None, max_subcaption_len=70, subcaption_buff=0.1):
+        # Same as VoiceoverScene._add_voiceover_text, with a header-probing tracker.
+        if not hasattr(self, "speech_service"):
+            raise Exception("You need to call init_voiceover() before adding a voiceover.")
+
+        dict_ = self.speech_service._wrap_generate_from_text(text, **service_kwargs)
+        tracker = ProbedVoiceoverTracker(self, dict_, Path(self.speech_service.cache_dir))
+        self.renderer.skip_animations = self.renderer._original_skipping_status
+        self.add_sound(str(Path(self.speech_service.cache_dir) / dict_["final_audio"]))
+        self.current_tracker = tracker
+
+        if self.create_subcaption:
+            if subcaption is None:
+                subcaption = remove_bookmarks(text)
+            self.add_wrapped_subcaption(
+                subcaption,
+                tracker.duration,
+                subcaption_buff=subcaption_buff,
+                max_subcaption_len=max_subcaption_len,
+            )
+        return tracker
+
+    def recycle(self, *mobjects) -> None:
+        """Remove ``mobjects`` from the scene and return their pooled parts to the pool."""
+        self.remove(*mobjects)
+        self.mobject_pool.release(*mobjects)
+
+    def _sample_budget(self, text: str) -> None:
+        if self.budget_monitor is not None:
+            self.budget_monitor.sample(self, f"#{self.voiceover_index} {' '.join(text.split())}")
+
+    def _begin_segment(self) -> None:
+        self.segment_state = "inside"
+        self.segment_blocks[0] = self.voiceover_index
+        self.segment_offset = self.renderer.time
+        # The clip starts at t=0 so its audio and subcaptions line up with it.
+        self.renderer.time = 0
+        self.renderer._original_skipping_status = self._saved_skipping_status
+        self.renderer.skip_animations = self._saved_skipping_status
+
+    def _fast_forward_duration(self, text: str) -> float:
+        """Length of a skipped block, read from the audio cache when possible."""
+        cache_dir = str(self.speech_service.cache_dir)
+        if self._cache_entries is None:
+            self._cache_entries = load_cache_index(cache_dir)
+        audio_path = find_cached_audio(cache_dir, text, self._cache_entries)
+        if audio_path is not None:
+            return cached_duration(audio_path)
+        self.segment_estimated = True
+        return estimate_speech_duration(text)
+
+    def tear_down(self):
+        super().tear_down()
+        if self.tts_prefetcher is not None:
+            self.tts_prefetcher.shutdown()
+        if self.segment is not None:
+            self._report_segment()
+        if self.untranslated_blocks and self.narration_script.texts:
+            logger.warning(
+                f"{LANG_ENV_VAR}={self.narration_script.lang}: no translation for voiceover blocks "
+                f"{', '.join(map(str, self.untranslated_blocks))} of {type(self).__name__}, used the source text"
+            )
+        if self.budget_monitor is not None:
+            self.budget_monitor.sample(self, "end of scene")
+            logger.info(self.budget_monitor.report(type(self).__name__))
+        if self.mobject_pool.created:
+            logger.info(self.mobject_pool.summary())
+
+    def _report_segment(self) -> None:
+        first, last = self.segment_blocks
+        scene_name = type(self).__name__
+        if first is None:
+            logger.warning(f"{SEGMENT_ENV_VAR} did not match any voiceover block of {scene_name}")
+            return
+
+        report = {
+            "scene": scene_name,
+            "first_block": first,
+            "last_block": last,
+            "offset_seconds": round(self.segment_offset, 3),
+            "duration_seconds": round(self.renderer.time, 3),
+            "offset_estimated": self.segment_estimated,
+        }
+        approximate = " (estimated, some skipped blocks were never synthesized)" if self.segment_estimated else ""
+        logger.info(
+            f"Segment of {scene_name}: blocks {first}-{last} start at "
+            f"{report['offset_seconds']:.2f}s{approximate} and last {report['duration_seconds']:.2f}s"
+        )
+
+        file_writer = self.renderer.file_writer
+        if not hasattr(file_writer, "movie_file_path"):
+            return
+        movie_path = file_writer.movie_file_path
+        file_writer.movie_file_path = movie_path.with_name(f"{movie_path.stem}_segment{movie_path.suffix}")
+        report["movie_file"] = str(file_writer.movie_file_path)
+        with open(file_writer.movie_file_path.with_suffix(".json"), 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,113 @@
+"""
+OpenAI speech service on top of the project's TTS client.
+
+``ClientOpenAIService`` is a drop-in replacement for manim_voiceover's
+``OpenAIService``: it takes the same ``voice``/``model`` arguments and writes
+the same cache entries, so clips synthesized by either service are reused by
+the other. Requests go through a process-wide ``utils.tts_client.TTSClient``,
+which limits concurrency and request rate, retries transient failures,
+coalesces duplicates and records per-request metrics.
+
+The client is configured from the environment:
+
+- ``ANIM_TTS_CONCURRENCY``: requests in flight at once (default 4)
+- ``ANIM_TTS_RATE``: requests started per second (default unlimited)
+- ``ANIM_TTS_METRICS``: metrics file (default ``tts_metrics.jsonl`` in the
+  voiceover cache directory)
+- ``OPENAI_BASE_URL`` / ``OPENAI_API_KEY``: endpoint and key
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from manim_voiceover.helper import remove_bookmarks
+from manim_voiceover.services.base import SpeechService, initialize_speech_service, path_to_string
+
+from utils.tts_client import DEFAULT_BASE_URL, TTSClient
+
+METRICS_FILENAME = "tts_metrics.jsonl"
+
+_shared_client: Optional[TTSClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def shared_client(cache_dir) -> TTSClient:
+    """The process-wide client, created on first use from the environment."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            rate = os.environ.get("ANIM_TTS_RATE")
+            _shared_client = TTSClient(
+                max_concurrency=int(os.environ.get("ANIM_TTS_CONCURRENCY", "4")),
+                rate_limit=float(rate) if rate else None,
+                metrics_path=os.environ.get("ANIM_TTS_METRICS") or str(Path(cache_dir) / METRICS_FILENAME),
+            )
+        return _shared_client
+
+
+class ClientOpenAIService(SpeechService):
+    """OpenAI text-to-speech through the rate-limited, retrying TTS client."""
+
+    def __init__(
+        self,
+        voice: str = "alloy",
+        model: str = "tts-1-hd",
+        transcription_model: str = "base",
+        client: Optional[TTSClient] = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            voice: The OpenAI voice to use
+            model: The OpenAI TTS model to use
+            transcription_model: Whisper model for word boundaries, as in ``OpenAIService``
+            client: Client to send requests with; defaults to the shared client
+        """
+        self.voice = voice
+        self.model = model
+        initialize_speech_service(self, kwargs, transcription_model=transcription_model)
+        self.client = client or shared_client(self.cache_dir)
+
+    def generate_from_text(self, text: str, cache_dir=None, path=None, **kwargs):
+        if cache_dir is None:
+            cache_dir = self.cache_dir
+
+        speed = kwargs.get("speed", 1.0)
+        if not (0.25 <= speed <= 4.0):
+            raise ValueError("The speed must be between 0.25 and 4.0.")
+
+        input_text = remove_bookmarks(text)
+        # Same input data as OpenAIService, so both services share cache entries.
+        input_data = {
+            "input_text": input_text,
+            "service": "openai",
+            "config": {
+                "voice": self.voice,
+                "model": self.model,
+                "speed": speed,
+            },
+        }
+
+        cached_result = self.get_cached_result(input_data, cache_dir)
+        if cached_result is not None:
+            return cached_result
+
+        if self.client.base_url == DEFAULT_BASE_URL and not self.client.api_key:
+            raise ValueError("The environment variable OPENAI_API_KEY is not set.")
+
+        if path is None:
+            audio_path = self.get_audio_basename(input_data) + ".mp3"
+        else:
+            audio_path = path_to_string(path)
+
+        audio = self.client.synthesize(input_text, voice=self.voice, model=self.model, speed=speed)
+        with open(Path(cache_dir) / audio_path, 'wb') as file:
+            file.write(audio)
+
+        return {
+            "input_text": text,
+            "input_data": input_data,
+            "original_audio": audio_path,
+        }
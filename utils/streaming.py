@@ -0,0 +1,145 @@
+"""
+Live HLS output while a scene renders.
+
+With ``ANIM_STREAM=hls`` every finished animation's partial movie is remuxed
+(no re-encoding) into an MPEG-TS segment and appended to a live ``EVENT``
+playlist next to the movie::
+
+    media/videos/des/480p15/DESRoundScene_stream/index.m3u8
+
+Open the playlist in any HLS-capable player (mpv, ffplay, VLC, Safari) as
+soon as the first segment exists and keep watching while later animations
+are still rendering. The playlist is closed with ``#EXT-X-ENDLIST`` when the
+scene finishes. Segments carry video only; the narration is mixed into the
+final movie as usual.
+"""
+
+import os
+import math
+from pathlib import Path
+from typing import List, Tuple
+
+import av
+from manim import logger
+from manim.scene.scene_file_writer import write_to_movie
+
+from utils.narration import NarrationFileWriter
+
+STREAM_ENV_VAR = "ANIM_STREAM"
+PLAYLIST_NAME = "index.m3u8"
+
+# Codecs that MPEG-TS can carry as they are.
+STREAMABLE_CODECS = {"h264", "hevc"}
+
+
+def streaming_enabled() -> bool:
+    return os.environ.get(STREAM_ENV_VAR, "").strip().lower() == "hls"
+
+
+class HLSPlaylist:
+    """An HLS event playlist that grows by one segment per partial movie."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in self.directory.glob("segment_*.ts"):
+            stale.unlink()
+        self.segments: List[Tuple[str, float]] = []
+        self.elapsed = 0.0
+        self.closed = False
+        self._write_playlist()
+
+    @property
+    def path(self) -> Path:
+        return self.directory / PLAYLIST_NAME
+
+    def append(self, partial_movie_file: str) -> bool:
+        """Remux ``partial_movie_file`` into the next segment; False if it can't be streamed."""
+        name = f"segment_{len(self.segments):05d}.ts"
+        segment_path = self.directory / name
+        partial_path = segment_path.with_suffix(".part")
+
+        with av.open(partial_movie_file) as source:
+            stream = source.streams.video[0]
+            if stream.codec_context.name not in STREAMABLE_CODECS:
+                logger.warning(f"Cannot stream {stream.codec_context.name} video as HLS, streaming disabled")
+                return False
+
+            time_base = stream.time_base
+            offset = int(round(self.elapsed / time_base))
+            start = end = None
+            with av.open(str(partial_path), mode="w", format="mpegts") as target:
+                output_stream = target.add_stream(template=stream)
+                for packet in source.demux(stream):
+                    if packet.dts is None:
+                        continue
+                    start = packet.pts if start is None else min(start, packet.pts)
+                    end = max(end or 0, packet.pts + (packet.duration or 0))
+                    # Segments continue one timeline, so players need no discontinuities.
+                    packet.pts += offset
+                    packet.dts += offset
+                    packet.stream = output_stream
+                    target.mux(packet)
+
+        if start is None:
+            partial_path.unlink()
+            return True
+        duration = float((end - start) * time_base)
+        os.replace(partial_path, segment_path)
+        self.segments.append((name, duration))
+        self.elapsed += duration
+        self._write_playlist()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        self._write_playlist()
+
+    def _write_playlist(self) -> None:
+        target_duration = max((math.ceil(duration) for _, duration in self.segments), default=1)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            f"#EXT-X-TARGETDURATION:{target_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for name, duration in self.segments:
+            lines.append(f"#EXTINF:{duration:.3f},")
+            lines.append(name)
+        if self.closed:
+            lines.append("#EXT-X-ENDLIST")
+
+        # Players poll the playlist; never let them read a half-written one.
+        partial_path = self.path.with_suffix(".m3u8.part")
+        partial_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(partial_path, self.path)
+
+
+class StreamingFileWriter(NarrationFileWriter):
+    """Scene file writer that also publishes each animation as an HLS segment."""
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.playlist = None
+        self._streaming = write_to_movie() and hasattr(self, "movie_file_path")
+
+    def end_animation(self, allow_write: bool = False) -> None:
+        super().end_animation(allow_write)
+        if not self._streaming or not self.partial_movie_files:
+            return
+        if self.playlist is None:
+            # Created on first use, once the scene has settled its output name.
+            movie_path = Path(self.movie_file_path)
+            self.playlist = HLSPlaylist(movie_path.with_name(f"{movie_path.stem}_stream"))
+            logger.info(f"Streaming to {self.playlist.path}")
+
+        # Cached animations are streamed too: their partial movie already exists.
+        partial_movie_file = self.partial_movie_files[-1]
+        if partial_movie_file is not None and os.path.exists(partial_movie_file):
+            self._streaming = self.playlist.append(partial_movie_file)
+
+    def finish(self) -> None:
+        if self.playlist is not None:
+            self.playlist.close()
+        super().finish()
@@ -0,0 +1,194 @@
+"""
+HTTP transport for text-to-speech requests.
+
+``TTSClient`` talks to an OpenAI-compatible ``/audio/speech`` endpoint with
+the standard library only, so it can be pointed at a local stand-in server
+(``base_url="http://127.0.0.1:8000/v1"``) in tests. It:
+
+- runs at most ``max_concurrency`` requests at once and starts at most
+  ``rate_limit`` requests per second,
+- retries connection errors, timeouts, truncated bodies, 429 and 5xx
+  responses with exponential backoff (honouring ``Retry-After``),
+- coalesces identical requests that are in flight at the same time, and
+- appends one JSON line per request to ``metrics_path`` with its latency,
+  attempts, status, characters sent and bytes received.
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import http.client
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TTSRequestError(Exception):
+    """A speech request failed for good (non-retryable, or out of retries)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class TTSClient:
+    """Concurrency- and rate-limited client for an OpenAI-compatible speech API."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 4,
+        rate_limit: Optional[float] = None,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        timeout: float = 60.0,
+        metrics_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            base_url: API root, defaults to ``$OPENAI_BASE_URL`` or the OpenAI API
+            api_key: Bearer token, defaults to ``$OPENAI_API_KEY``
+            max_concurrency: Maximum number of requests in flight
+            rate_limit: Maximum number of requests started per second (None = unlimited)
+            max_retries: Retries per request after the first attempt
+            backoff: Delay before the first retry; doubles on every further retry
+            timeout: Socket timeout per attempt, in seconds
+            metrics_path: JSON-lines file to append per-request metrics to
+        """
+        self.base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.api_key = api_key if api_key is not None else os.environ.get("OPENAI_API_KEY")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.metrics_path = metrics_path
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="tts-client")
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+
+    def synthesize(self, text: str, voice: str, model: str, speed: float = 1.0,
+                   response_format: str = "mp3") -> bytes:
+        """Return the audio for ``text``; blocks until it is available."""
+        return self.submit(text, voice, model, speed, response_format).result()
+
+    def submit(self, text: str, voice: str, model: str, speed: float = 1.0,
+               response_format: str = "mp3") -> Future:
+        """Queue a request; identical requests already in flight share one future."""
+        payload = {
+            "model": model,
+            "input": text,
+            "voice": voice,
+            "speed": speed,
+            "response_format": response_format,
+        }
+        key = json.dumps(payload, sort_keys=True)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._record({"event": "coalesced", "chars": len(text)})
+                return future
+            future = self._executor.submit(self._request, payload)
+            self._in_flight[key] = future
+
+        def forget(_):
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+        future.add_done_callback(forget)
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _request(self, payload: dict) -> bytes:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            status = None
+            retry_after = None
+            try:
+                with self._slots:
+                    self._rate_limiter.wait()
+                    request = urllib.request.Request(f"{self.base_url}/audio/speech", data=body,
+                                                     headers=headers, method="POST")
+                    with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                        audio = response.read()
+                        status = response.status
+                self._record({
+                    "event": "request",
+                    "status": status,
+                    "attempts": attempt,
+                    "latency": round(time.perf_counter() - started, 4),
+                    "chars": len(payload["input"]),
+                    "bytes": len(audio),
+                })
+                return audio
+            except urllib.error.HTTPError as e:
+                status = e.code
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                error = f"HTTP {e.code}: {e.read()[:200].decode('utf-8', 'replace')}"
+                retryable = e.code in RETRY_STATUS_CODES
+            except (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError) as e:
+                # IncompleteRead: the connection closed before the whole body arrived
+                error = str(getattr(e, "reason", e)) or type(e).__name__
+                retryable = True
+
+            if not retryable or attempt > self.max_retries:
+                self._record({
+                    "event": "failed",
+                    "status": status,
+                    "attempts": attempt,
+                    "latency": round(time.perf_counter() - started, 4),
+                    "chars": len(payload["input"]),
+                    "error": error,
+                })
+                raise TTSRequestError(f"Speech request failed after {attempt} attempt(s): {error}", status)
+
+            delay = self.backoff * 2 ** (attempt - 1) * (1 + random.random() / 2)
+            if retry_after and retry_after.replace(".", "", 1).isdigit():
+                delay = max(delay, float(retry_after))
+            self._record({"event": "retry", "status": status, "attempt": attempt, "delay": round(delay, 3), "error": error})
+            time.sleep(delay)
+
+    def _record(self, entry: dict) -> None:
+        if not self.metrics_path:
+            return
+        entry = {"time": round(time.time(), 3), **entry}
+        with self._metrics_lock:
+            with open(self.metrics_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry) + "\n")
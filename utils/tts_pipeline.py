@@ -0,0 +1,176 @@
+"""
+Background synthesis of upcoming voiceover blocks.
+
+A cold render alternates between waiting on the speech service (network) and
+rasterizing frames (CPU). ``TTSPrefetcher`` takes the voiceover texts that a
+scene passes as string literals, from ``construct()`` and from the scene's
+own methods it calls, synthesizes them on a few background threads in call
+order, and hands each result over when its block is entered; a block only
+waits if its audio is not ready yet.
+
+Only the speech service's ``generate_from_text`` runs in the background. The
+cache index is still written from the render thread by manim_voiceover, so
+the cache stays consistent, and any text that was not prefetched (computed
+texts, repeated texts, extra service arguments) is synthesized as usual.
+"""
+
+import ast
+import time
+import inspect
+import textwrap
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from manim import logger
+
+from utils.voiceover_cache import normalize_text
+
+PREFETCH_ENV_VAR = "ANIM_TTS_PREFETCH"
+DEFAULT_PREFETCH_WORKERS = 4
+
+
+def prefetch_workers(value: str) -> int:
+    """Number of worker threads for an ``ANIM_TTS_PREFETCH`` value (0 = disabled)."""
+    value = value.strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return 0
+    return int(value) if value.isdigit() else DEFAULT_PREFETCH_WORKERS
+
+
+def _scene_methods(scene_class) -> Dict[str, ast.FunctionDef]:
+    """Methods of ``scene_class`` and its scene bases, up to the class that defines ``voiceover``."""
+    methods = {}
+    for cls in scene_class.__mro__:
+        if cls is object or "voiceover" in vars(cls):
+            break
+        try:
+            source = textwrap.dedent(inspect.getsource(cls))
+        except (OSError, TypeError):
+            continue
+        definition = ast.parse(source).body[0]
+        for node in getattr(definition, "body", []):
+            if isinstance(node, ast.FunctionDef):
+                # A subclass's override wins over the base's method.
+                methods.setdefault(node.name, node)
+    return methods
+
+
+def _self_call(node: ast.AST) -> Optional[ast.Call]:
+    """``node`` if it is a call ``self.<method>(...)``."""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "self"
+    ):
+        return node
+    return None
+
+
+def _literal_texts(call: ast.Call, function: ast.FunctionDef) -> List[str]:
+    """
+    The literal texts ``call`` can narrate: its string argument, or the
+    strings assigned in ``function`` to the variable it passes.
+    """
+    argument = call.args[0] if call.args else next(
+        (keyword.value for keyword in call.keywords if keyword.arg == "text"), None
+    )
+    if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+        return [argument.value]
+    if not isinstance(argument, ast.Name):
+        return []
+    assigned = [
+        node.value
+        for node in ast.walk(function)
+        if isinstance(node, ast.Assign)
+        and any(isinstance(target, ast.Name) and target.id == argument.id for target in node.targets)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    ]
+    return [value.value for value in sorted(assigned, key=lambda value: (value.lineno, value.col_offset))]
+
+
+def scan_voiceover_texts(scene_class) -> List[str]:
+    """
+    Return the literal texts of the ``self.voiceover(...)`` calls of a scene.
+
+    Starting from ``construct()``, a call to another method of the scene is
+    followed where it is made, so texts narrated from helpers come in call
+    order, which is the order the blocks are entered for straight-line
+    scenes (a helper called in a loop counts once). A block narrating a
+    variable contributes the string literals assigned to it in that method.
+    Texts of methods that ``construct()`` never calls come last.
+    """
+    methods = _scene_methods(scene_class)
+    texts: List[str] = []
+    visited = set()
+
+    def visit(name: str) -> None:
+        if name in visited or name not in methods:
+            return
+        visited.add(name)
+        calls = [call for call in map(_self_call, ast.walk(methods[name])) if call is not None]
+        for call in sorted(calls, key=lambda call: (call.lineno, call.col_offset)):
+            if call.func.attr == "voiceover":
+                texts.extend(_literal_texts(call, methods[name]))
+            else:
+                visit(call.func.attr)
+
+    visit("construct")
+    for name in methods:
+        visit(name)
+    return texts
+
+
+class TTSPrefetcher:
+    """Runs a speech service's synthesis ahead of the render thread."""
+
+    def __init__(self, speech_service, workers: int = DEFAULT_PREFETCH_WORKERS):
+        self.speech_service = speech_service
+        self._generate = speech_service.generate_from_text
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-prefetch")
+        self._pending: Dict[str, Future] = {}
+        self.clips_ready = 0
+        self.clips_waited = 0
+        self.seconds_waited = 0.0
+        # Route the render thread's synthesis requests through the prefetcher.
+        speech_service.generate_from_text = self.generate_from_text
+
+    def prefetch(self, texts: List[str]) -> None:
+        for text in texts:
+            text = normalize_text(text)
+            if text not in self._pending:
+                self._pending[text] = self._executor.submit(self._generate, text)
+
+    def generate_from_text(self, text: str, cache_dir=None, path=None, **kwargs):
+        future = None
+        if cache_dir is None and path is None and not kwargs:
+            future = self._pending.pop(text, None)
+        if future is None:
+            return self._generate(text, cache_dir=cache_dir, path=path, **kwargs)
+
+        if future.done():
+            self.clips_ready += 1
+        else:
+            self.clips_waited += 1
+        started = time.perf_counter()
+        try:
+            result = future.result()
+        except Exception as e:
+            # Retry on the render thread, where a real error surfaces normally.
+            logger.warning(f"Background synthesis failed ({e}), retrying: {text[:60]}")
+            return self._generate(text)
+        finally:
+            self.seconds_waited += time.perf_counter() - started
+        return result
+
+    def shutdown(self) -> None:
+        """Drop blocks that were never entered and wait for running requests."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        vars(self.speech_service).pop("generate_from_text", None)
+        used = self.clips_ready + self.clips_waited
+        if used:
+            logger.info(
+                f"TTS prefetch: {self.clips_ready} of {used} clips were ready in time, "
+                f"waited {self.seconds_waited:.1f}s for the rest"
+            )
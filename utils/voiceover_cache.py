@@ -0,0 +1,65 @@
+"""
+Read-only helpers for the manim_voiceover audio cache.
+
+manim_voiceover keeps every synthesized clip next to a ``cache.json`` index in
+the speech service's cache directory. These helpers look clips up by their
+input text without going through a speech service, so nothing is synthesized.
+"""
+
+import os
+import json
+from typing import List, Optional
+
+CACHE_INDEX_FILENAME = "cache.json"
+
+# Typical narration pace of the OpenAI/GTTS voices used in this project.
+WORDS_PER_SECOND = 2.6
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace the same way manim_voiceover does before hashing."""
+    return " ".join(text.split())
+
+
+def load_cache_index(cache_dir: str) -> List[dict]:
+    """Return the cache entries stored in ``cache_dir``, or [] if there are none."""
+    index_path = os.path.join(cache_dir, CACHE_INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        return []
+    try:
+        with open(index_path, 'r', encoding='utf-8') as file:
+            entries = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not read voiceover cache index {index_path}: {e}")
+        return []
+    return entries if isinstance(entries, list) else []
+
+
+def find_cached_audio(cache_dir: str, text: str, entries: Optional[List[dict]] = None) -> Optional[str]:
+    """
+    Find the audio file previously synthesized for ``text``.
+
+    Args:
+        cache_dir: The speech service cache directory
+        text: The voiceover text as passed to ``self.voiceover``
+        entries: Already loaded cache entries, to avoid re-reading the index
+
+    Returns:
+        The absolute path of the cached audio, or None if ``text`` was never synthesized.
+    """
+    if entries is None:
+        entries = load_cache_index(cache_dir)
+    text = normalize_text(text)
+    for entry in reversed(entries):
+        input_data = entry.get("input_data") or {}
+        if text not in (entry.get("input_text"), input_data.get("input_text")):
+            continue
+        audio = entry.get("final_audio") or entry.get("original_audio")
+        if audio and os.path.exists(os.path.join(cache_dir, audio)):
+            return os.path.join(cache_dir, audio)
+    return None
+
+
+def estimate_speech_duration(text: str) -> float:
+    """Rough narration length in seconds, for text that has not been synthesized yet."""
+    return max(len(text.split()) / WORDS_PER_SECOND, 1.0)